@@ -29,25 +29,152 @@ class Config:
     # GoldAPI.io settings
     GOLDAPI_BASE_URL: str = "https://www.goldapi.io/api/XAU/USD"
     GOLDAPI_RATE_LIMIT: int = 10  # requests per hour (free tier)
+    GOLDAPI_URL_TEMPLATE: str = "https://www.goldapi.io/api/{metal}/{currency}"
+    
+    # Multi-asset settings: "METAL/CURRENCY" symbols run side by side in one process
+    DEFAULT_SYMBOL: str = "XAU/USD"  # keeps the top-level models/ and journal/ directories
+    SYMBOLS: list = os.getenv("SYMBOLS", "XAU/USD,XAG/USD,XPT/USD,XPD/USD").split(",")
+    SYMBOL_HISTORY_PATHS: dict = {}  # symbol -> history CSV; defaults to DATA_DIR/local/<METAL>_<CURRENCY>.csv
+    QUOTE_FETCH_WORKERS: int = 8  # concurrent GoldAPI requests per quote round
+    
+    # Data source backends: live services or offline stand-ins (app.data.local_sources)
+    KAGGLE_SOURCE: str = os.getenv("KAGGLE_SOURCE", "kaggle")  # 'kaggle' or 'local'
+    GOLDAPI_SOURCE: str = os.getenv("GOLDAPI_SOURCE", "goldapi")  # 'goldapi' or 'replay'
+    NEWS_SOURCE: str = os.getenv("NEWS_SOURCE", "google")  # 'google' or 'local'
+    LOCAL_SOURCES_AUTOSTART: bool = True  # start replay/RSS servers in-process when selected
+    LOCAL_KAGGLE_PATH: Path = DATA_DIR / "local" / "gold_prices.csv"
+    REPLAY_TICKS_PATH: Path = DATA_DIR / "local" / "goldapi_ticks.csv"  # synthetic ticks if missing
+    REPLAY_TICK_RATE: float = 0.0  # ticks per second; 0 advances one tick per request
+    REPLAY_GOLDAPI_PORT: int = 8601
+    REPLAY_GOLDAPI_URL: str = f"http://127.0.0.1:{REPLAY_GOLDAPI_PORT}/api"
+    LOCAL_RSS_PORT: int = 8602
+    LOCAL_RSS_URL: str = f"http://127.0.0.1:{LOCAL_RSS_PORT}/rss"
+    LOCAL_RSS_FEEDS_DIR: Path = DATA_DIR / "local" / "rss"  # recorded feeds, synthetic if missing
+    LOCAL_RSS_ITEMS_PER_FEED: int = 50
     
     # Model settings
     MODEL_RANDOM_STATE: int = 42
     TEST_SIZE: float = 0.2
     
+    # Model backend (app.models.price_predictor): "random_forest" or "hist_gradient_boosting"
+    MODEL_BACKEND: str = os.getenv("MODEL_BACKEND", "random_forest")
+    
     # Random Forest settings
     RF_CLASSIFIER_N_ESTIMATORS: int = 100
     RF_CLASSIFIER_MAX_DEPTH: int = 10
     RF_REGRESSOR_N_ESTIMATORS: int = 100
     RF_REGRESSOR_MAX_DEPTH: int = 10
+    RF_N_JOBS: int = -1  # cores per forest when a model is trained on its own
+    TRAINING_CORES: int = int(os.getenv("TRAINING_CORES", "0"))  # core budget shared by concurrent fits (0 = all cores)
+    
+    # Compact model export (app.models.compact)
+    COMPACT_TOLERANCE: float = 0.005  # accuracy drop (direction) / relative MAE rise (range) allowed when cutting trees; < 0 keeps all
+    COMPACT_MIN_TREES: int = 10
+    
+    # Histogram gradient boosting settings
+    HGB_MAX_ITER: int = 200  # boosting rounds (early stopping ends sooner on more than 10k rows)
+    HGB_LEARNING_RATE: float = 0.1
+    HGB_MAX_LEAF_NODES: int = 31
+    HGB_MAX_DEPTH: Optional[int] = None
+    
+    # Model versioning (app.models.model_registry)
+    MODEL_VERSIONS_KEEP: int = 5  # published versions kept on disk
+    MODEL_HOT_SWAP_ENABLED: bool = True  # long-running apps pick up newly promoted versions
+    MODEL_RELOAD_INTERVAL: float = 30.0  # seconds between CURRENT pointer checks
+    MODEL_CACHE_SIZE: int = 8  # loaded versions kept in memory per process (production and shadows)
+    
+    # Prediction memo (app.models.prediction_memo)
+    PREDICTION_MEMO_SIZE: int = 256  # memoized feature vectors per app (0 = off)
+    PREDICTION_MEMO_DECIMALS: int = 6  # features are rounded to this many decimals before keying
+    
+    # Feature selection (app.models.feature_selection), persisted with the models
+    FEATURE_SELECTION_ENABLED: bool = True
+    FEATURE_SELECTION_MIN_SCORE: float = 0.01  # mean share of the normalized importances
+    FEATURE_SELECTION_MIN_FEATURES: int = 4
+    FEATURE_SELECTION_REPEATS: int = 5  # shuffles per feature for permutation importance
+    FEATURE_SELECTION_MAX_ROWS: int = 2000  # held-out rows scored per shuffle
+    
+    # Technical indicators (app.features.indicators): kind -> parameter sets
+    TECHNICAL_INDICATORS: dict = {
+        'ema': [12, 26],
+        'rsi': [14],
+        'macd': [(12, 26, 9)],  # (fast, slow, signal)
+        'bollinger': [(20, 2.0)],  # (window, number of standard deviations)
+        'atr': [14],
+        'returns': [1, 5, 20],
+    }
+    
+    # Price calendar (app.features.resampling): opt-in resampling of prices to regular bars before features.
+    # Changes every feature, so models trained without it must be retrained after setting it.
+    PRICE_CALENDAR: str = os.getenv("PRICE_CALENDAR", "")  # "" keeps rows as given; "B" (business days) or a bar length dividing a day ("4h", "15min")
+    PRICE_CALENDAR_WEEKMASK: str = "Mon Tue Wed Thu Fri"
+    PRICE_CALENDAR_HOLIDAYS: list = []  # dates without a bar, e.g. "2024-12-25"; their points join the previous bar
+    HISTORY_TICKS_PATH: Optional[Path] = None  # recorded GoldAPI ticks (timestamp, price) merged into the history bars
+    RESAMPLE_CHUNK_ROWS: int = 1_000_000  # points per chunk when resampling and computing time windows
     
     # News settings
     NEWS_MAX_RESULTS_PER_QUERY: int = 50
     NEWS_MIN_RELEVANCE_SCORE: float = 0.5
     NEWS_QUERY_LANGUAGES: list = ["en"]
+    NEWS_KEYWORD_LEXICON_PATH: Optional[Path] = None  # JSON term -> weight (or language -> terms); built-in if unset
+    NEWS_SCORING_ENABLED: bool = False  # score articles with app.features.news_scoring's lexicon instead of NewsFetcher's rules
+    NEWS_SCORING_WORKERS: int = 0  # scoring processes (0 = one per core)
+    NEWS_SCORING_CHUNK_SIZE: int = 2000  # articles per worker task
+    NEWS_SCORING_PARALLEL_MIN: int = 1000  # smaller batches are scored in-process
     
     # Dashboard settings
     DASHBOARD_REFRESH_INTERVAL: int = 60  # seconds
     DASHBOARD_PRICE_HISTORY_SIZE: int = 100
+    DASHBOARD_CHART_POINTS: int = 1500  # points per chart after downsampling
+    DASHBOARD_DOWNSAMPLE_METHOD: str = "lttb"  # "lttb" (shape-preserving) or "minmax" (exact peaks per bucket)
+    DASHBOARD_DOWNSAMPLE_CACHE_SIZE: int = 32  # downsampled windows kept per session
+    
+    # Prediction journal settings
+    PREDICTION_JOURNAL_ENABLED: bool = True
+    JOURNAL_DIR: Path = DATA_DIR / "journal"
+    JOURNAL_FSYNC_BATCH_SIZE: int = 32  # records per fsync
+    JOURNAL_FSYNC_INTERVAL: float = 1.0  # seconds
+    JOURNAL_SEGMENT_SIZE: int = 10000  # records per segment before compaction
+    
+    # Realized accuracy tracking
+    ACCURACY_HORIZON_HOURS: float = 24.0  # models predict the next day's change
+    ACCURACY_ROLLING_WINDOW: int = 100  # predictions
+    ACCURACY_CALIBRATION_BINS: int = 10  # confidence bins over 50-100%
+    
+    # Shadow models (app.core.shadow): registry versions scored on live traffic next to production
+    SHADOW_MODEL_VERSIONS: list = [v.strip() for v in os.getenv("SHADOW_MODEL_VERSIONS", "").split(",") if v.strip()]
+    SHADOW_QUEUE_SIZE: int = 64  # pending requests; shadow work beyond this is dropped
+    SHADOW_WORKER_NICE: int = 19  # scheduling niceness of the shadow worker thread (Linux; 0 = unchanged)
+    
+    # Streaming predictions (app.core.streaming): one prediction per price tick
+    STREAM_BATCH_SIZE: int = 512  # most ticks predicted in one model call
+    STREAM_QUEUE_SIZE: int = 10_000  # ticks waiting for prediction; the source blocks beyond this
+    STREAM_BAR_SECONDS: int = 86_400  # ticks in a later period close the live bar, without a PRICE_CALENDAR
+    STREAM_TICK_RATE: float = 0.0  # replay ticks per second; 0 replays as fast as they are predicted
+    STREAM_POLL_INTERVAL: float = 3600 / GOLDAPI_RATE_LIMIT  # seconds between GoldAPI polls
+    
+    # Dataset mirror settings (app.data.dataset_mirror)
+    DATASET_MIRROR_ENABLED: bool = True  # serve history from a local binary copy between refreshes
+    DATASET_MIRROR_DIR: Path = DATA_DIR / "mirror"
+    DATASET_REFRESH_INTERVAL: float = float(os.getenv("DATASET_REFRESH_INTERVAL", "24"))  # hours between upstream checks
+    DATASET_MIRROR_KEEP: int = 3  # dataset versions kept on disk
+    
+    # Async facade settings (app.core.async_app)
+    ASYNC_IO_WORKERS: int = 16  # threads for blocking GoldAPI/news requests
+    ASYNC_CPU_WORKERS: int = 0  # threads for features and inference (0 = one per core)
+    
+    # Scenario analysis settings
+    SCENARIO_CHUNK_SIZE: int = 50_000  # scenarios scored per batch
+    
+    # Profiling (python main.py --profile, app.utils.profiling)
+    PROFILE_DIR: Path = DATA_DIR / "profiles"
+    PROFILE_SAMPLE_INTERVAL: float = 0.005  # seconds between stack samples
+    PROFILE_TOP: int = 25  # functions / allocation sites listed per report section
+    
+    # Instrumentation settings
+    INSTRUMENTATION_ENABLED: bool = os.getenv("INSTRUMENTATION_ENABLED", "1") == "1"
+    METRICS_PORT: int = 9108  # Prometheus /metrics endpoint
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")  # 0.0.0.0 to let other hosts scrape it
     
     @classmethod
     def setup_directories(cls):
@@ -1,6 +1,14 @@
 """Core application logic"""
 
 from .gold_price_app import GoldPriceApp
+from .prediction_journal import PredictionJournal
+from .accuracy_tracker import AccuracyTracker
+from .scenarios import ScenarioAnalyzer, ScenarioResult
+from .multi_asset import MultiAssetApp
+from .async_app import AsyncGoldPriceApp
+from .shadow import ShadowEvaluator
+from .streaming import StreamingPredictor
 
-__all__ = ['GoldPriceApp']
+__all__ = ['GoldPriceApp', 'PredictionJournal', 'AccuracyTracker', 'ScenarioAnalyzer', 'ScenarioResult', 'MultiAssetApp',
+           'AsyncGoldPriceApp', 'ShadowEvaluator', 'StreamingPredictor']
 
@@ -0,0 +1,340 @@
+"""
+Realized accuracy of journaled predictions
+"""
+
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Dict
+
+from app.config import Config
+from app.core.prediction_journal import PredictionJournal
+
+
+class _Buffer:
+    """Growable 1-D array with amortized O(1) appends"""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values: np.ndarray):
+        needed = self.size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+        self._data[self.size:needed] = values
+        self.size = needed
+
+    def truncate(self, size: int):
+        self.size = size
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self.size]
+
+
+class AccuracyTracker:
+    """
+    Score predictions against the realized price at their horizon
+
+    Predictions and price observations are kept as sorted timestamp arrays.
+    On each update only predictions whose horizon has passed since the last
+    update are matched, with one ``searchsorted`` as-of join over the price
+    series, and their hits/errors are folded into running sums. Rolling
+    metrics come from prefix sums, so an update never rescans resolved rows.
+    Predictions arriving older than the newest scored one (e.g. from another
+    process's journal) would break that order; they are dropped and counted
+    as ``late``.
+    """
+
+    _instances: Dict[Path, "AccuracyTracker"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        horizon_hours: Optional[float] = None,
+        rolling_window: Optional[int] = None,
+        calibration_bins: Optional[int] = None
+    ):
+        hours = horizon_hours if horizon_hours is not None else Config.ACCURACY_HORIZON_HOURS
+        self.horizon = np.int64(round(hours * 3600 * 1e6))  # microseconds
+        self.rolling_window = rolling_window or Config.ACCURACY_ROLLING_WINDOW
+        self.calibration_bins = calibration_bins or Config.ACCURACY_CALIBRATION_BINS
+
+        self._lock = threading.Lock()
+
+        # Price observations, sorted by time (epoch microseconds)
+        self._price_ts = _Buffer(np.int64)
+        self._price = _Buffer(np.float64)
+
+        # Predictions, sorted by time; rows before _resolved are already scored
+        self._pred_ts = _Buffer(np.int64)
+        self._pred_price = _Buffer(np.float64)
+        self._pred_direction = _Buffer(np.int8)
+        self._pred_confidence = _Buffer(np.float64)
+        self._pred_change = _Buffer(np.float64)
+        self._resolved = 0
+
+        # Prefix sums over scored predictions for O(1) rolling windows
+        self._hits_cumsum = _Buffer(np.float64)
+        self._abs_error_cumsum = _Buffer(np.float64)
+        self._hits_cumsum.extend(np.zeros(1))
+        self._abs_error_cumsum.extend(np.zeros(1))
+        self._unmatched = 0
+        self._late = 0
+
+        # Calibration: counts, hits and summed confidence per confidence bin
+        self._bin_count = np.zeros(self.calibration_bins, dtype=np.int64)
+        self._bin_hits = np.zeros(self.calibration_bins, dtype=np.int64)
+        self._bin_confidence = np.zeros(self.calibration_bins)
+
+        # Rows added since the last update, merged lazily (deque appends are thread-safe)
+        self._pending_predictions: deque = deque()
+        self._pending_prices: deque = deque()
+
+    @classmethod
+    def for_journal(cls, journal: PredictionJournal) -> "AccuracyTracker":
+        """Get the shared tracker for a journal, loading its history on first use"""
+        key = journal.journal_dir.resolve()
+        with cls._instances_lock:
+            tracker = cls._instances.get(key)
+            if tracker is None:
+                tracker = cls()
+                journal.subscribe(tracker.add_prediction)
+                tracker.add_predictions(journal.load_columns(
+                    ['timestamp', 'current_price', 'direction', 'confidence', 'price_change']
+                ))
+                cls._instances[key] = tracker
+            return tracker
+
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+
+    def add_prediction(self, record: Dict):
+        """Queue one journal record; it also counts as a price observation"""
+        self._pending_predictions.append(record)
+
+    def add_predictions(self, columns: Dict[str, np.ndarray]):
+        """Add journal columns (as returned by ``PredictionJournal.load_columns``)"""
+        ts = self._to_micros(columns['timestamp'])
+        price = np.asarray(columns['current_price'], dtype=np.float64)
+        with self._lock:
+            self._merge_predictions(
+                ts, price,
+                np.asarray(columns['direction'], dtype=np.int8),
+                np.asarray(columns['confidence'], dtype=np.float64),
+                np.asarray(columns['price_change'], dtype=np.float64)
+            )
+            self._merge_prices(ts, price)
+
+    def add_price(self, timestamp, price: float):
+        """Queue one realized price observation (e.g. a GoldAPI tick)"""
+        self._pending_prices.append((timestamp, price))
+
+    def add_prices(self, timestamps, prices):
+        """Add a realized price series (e.g. the historical ``Date``/``price`` columns)"""
+        with self._lock:
+            self._merge_prices(self._to_micros(timestamps), np.asarray(prices, dtype=np.float64))
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def update(self) -> int:
+        """Score every prediction whose horizon has been reached; returns how many"""
+        with self._lock:
+            self._drain_pending()
+            if self._price_ts.size == 0 or self._pred_ts.size == self._resolved:
+                return 0
+
+            # Predictions are sorted, so the newly resolvable ones form a slice
+            latest_price = self._price_ts.values[-1]
+            pred_ts = self._pred_ts.values
+            end = int(np.searchsorted(pred_ts, latest_price - self.horizon, side='right'))
+            start = self._resolved
+            if end <= start:
+                return 0
+
+            ts = pred_ts[start:end]
+            base_price = self._pred_price.values[start:end]
+            direction = self._pred_direction.values[start:end]
+            confidence = self._pred_confidence.values[start:end]
+            change = self._pred_change.values[start:end]
+
+            # As-of join: last observed price at or before t + horizon, strictly after t
+            price_ts = self._price_ts.values
+            idx = np.searchsorted(price_ts, ts + self.horizon, side='right') - 1
+            matched = (idx >= 0) & (price_ts[np.maximum(idx, 0)] > ts) & ~np.isnan(base_price)
+            realized = self._price.values[idx[matched]]
+
+            actual_change = realized - base_price[matched]
+            hits = (direction[matched] == (actual_change > 0)).astype(np.float64)
+            abs_error = np.abs(change[matched] - actual_change)
+            abs_error = np.where(np.isnan(abs_error), 0.0, abs_error)
+
+            self._hits_cumsum.extend(self._hits_cumsum.values[-1] + np.cumsum(hits))
+            self._abs_error_cumsum.extend(self._abs_error_cumsum.values[-1] + np.cumsum(abs_error))
+            self._unmatched += int(len(ts) - matched.sum())
+
+            conf = confidence[matched]
+            bins = self._confidence_bins(conf)
+            self._bin_count += np.bincount(bins, minlength=self.calibration_bins)
+            self._bin_hits += np.bincount(bins, weights=hits, minlength=self.calibration_bins).astype(np.int64)
+            self._bin_confidence += np.bincount(bins, weights=conf, minlength=self.calibration_bins)
+
+            self._resolved = end
+            return end - start
+
+    def get_metrics(self) -> Dict:
+        """Update, then report cumulative, rolling and calibration metrics"""
+        self.update()
+        with self._lock:
+            scored = self._hits_cumsum.size - 1
+            hits = self._hits_cumsum.values
+            errors = self._abs_error_cumsum.values
+            window = min(self.rolling_window, scored)
+
+            def ratio(total, n):
+                return float(total / n) if n else None
+
+            calibration = []
+            edges = np.linspace(50, 100, self.calibration_bins + 1)
+            for i in range(self.calibration_bins):
+                count = int(self._bin_count[i])
+                calibration.append({
+                    'bin_low': float(edges[i]),
+                    'bin_high': float(edges[i + 1]),
+                    'count': count,
+                    'mean_confidence': ratio(self._bin_confidence[i], count),
+                    'hit_rate': ratio(self._bin_hits[i] * 100.0, count)
+                })
+
+            calibration_error = None
+            if scored:
+                gaps = np.abs(self._bin_hits * 100.0 - self._bin_confidence)
+                calibration_error = float(gaps.sum() / scored)
+
+            return {
+                'total_predictions': self._pred_ts.size,
+                'resolved': self._resolved,
+                'scored': scored,
+                'unmatched': self._unmatched,
+                'late': self._late,
+                'pending': self._pred_ts.size - self._resolved,
+                'horizon_hours': float(self.horizon) / 3600e6,
+                'hit_rate': ratio(hits[-1], scored),
+                'mae': ratio(errors[-1], scored),
+                'rolling_window': window,
+                'rolling_hit_rate': ratio(hits[-1] - hits[-1 - window], window),
+                'rolling_mae': ratio(errors[-1] - errors[-1 - window], window),
+                'calibration': calibration,
+                'calibration_error': calibration_error
+            }
+
+    def rolling_series(self, max_points: int = 500) -> pd.DataFrame:
+        """Rolling hit rate and MAE after each scored prediction, thinned to max_points"""
+        with self._lock:
+            hits = self._hits_cumsum.values.copy()
+            errors = self._abs_error_cumsum.values.copy()
+        scored = len(hits) - 1
+        if scored == 0:
+            return pd.DataFrame(columns=['scored', 'rolling_hit_rate', 'rolling_mae'])
+
+        n = np.arange(1, scored + 1)
+        window = np.minimum(n, self.rolling_window)
+        rolling_hits = (hits[n] - hits[n - window]) / window
+        rolling_mae = (errors[n] - errors[n - window]) / window
+        step = max(1, scored // max_points)
+        return pd.DataFrame({
+            'scored': n[::step],
+            'rolling_hit_rate': rolling_hits[::step],
+            'rolling_mae': rolling_mae[::step]
+        })
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _drain_pending(self):
+        """Merge queued records and ticks (lock held)"""
+        records = [self._pending_predictions.popleft() for _ in range(len(self._pending_predictions))]
+        prices = [self._pending_prices.popleft() for _ in range(len(self._pending_prices))]
+
+        if records:
+            ts = self._to_micros(np.array([r.get('timestamp') or 'NaT' for r in records], dtype='datetime64[us]'))
+            price = np.array([np.nan if r.get('current_price') is None else r['current_price'] for r in records], dtype=np.float64)
+            self._merge_predictions(
+                ts, price,
+                np.array([1 if r.get('direction') == 'UP' else 0 for r in records], dtype=np.int8),
+                np.array([np.nan if r.get('confidence') is None else r['confidence'] for r in records], dtype=np.float64),
+                np.array([np.nan if r.get('price_change') is None else r['price_change'] for r in records], dtype=np.float64)
+            )
+            self._merge_prices(ts, price)
+
+        if prices:
+            self._merge_prices(
+                self._to_micros([ts for ts, _ in prices]),
+                np.array([p for _, p in prices], dtype=np.float64)
+            )
+
+    def _merge_predictions(self, ts, price, direction, confidence, change):
+        """Insert predictions keeping time order; only the unscored tail is re-sorted"""
+        valid = ts != np.iinfo(np.int64).min
+        if self._resolved:
+            # Scored rows stay put, so anything older than the newest of them is late
+            late = valid & (ts < self._pred_ts.values[self._resolved - 1])
+            self._late += int(late.sum())
+            valid &= ~late
+        columns = [ts[valid], price[valid], direction[valid], confidence[valid], change[valid]]
+        buffers = [self._pred_ts, self._pred_price, self._pred_direction, self._pred_confidence, self._pred_change]
+        if len(columns[0]) == 0:
+            return
+
+        if self._pred_ts.size and columns[0].min() < self._pred_ts.values[-1]:
+            # Out-of-order arrival: merge with the unscored tail (already scored rows stay put)
+            tail = [np.concatenate([buf.values[self._resolved:], col]) for buf, col in zip(buffers, columns)]
+            for buf in buffers:
+                buf.truncate(self._resolved)
+            columns = tail
+
+        order = np.argsort(columns[0], kind='stable')
+        for buf, col in zip(buffers, columns):
+            buf.extend(col[order])
+
+    def _merge_prices(self, ts, price):
+        """Insert price observations keeping time order"""
+        valid = (ts != np.iinfo(np.int64).min) & ~np.isnan(price)
+        ts, price = ts[valid], price[valid]
+        if len(ts) == 0:
+            return
+
+        order = np.argsort(ts, kind='stable')
+        ts, price = ts[order], price[order]
+        if self._price_ts.size and ts[0] < self._price_ts.values[-1]:
+            # Out-of-order observations: find where the new block starts and re-sort from there
+            split = int(np.searchsorted(self._price_ts.values, ts[0], side='right'))
+            merged_ts = np.concatenate([self._price_ts.values[split:], ts])
+            merged_price = np.concatenate([self._price.values[split:], price])
+            order = np.argsort(merged_ts, kind='stable')
+            self._price_ts.truncate(split)
+            self._price.truncate(split)
+            ts, price = merged_ts[order], merged_price[order]
+
+        self._price_ts.extend(ts)
+        self._price.extend(price)
+
+    def _confidence_bins(self, confidence: np.ndarray) -> np.ndarray:
+        """Map confidence (50-100%) to calibration bin indices"""
+        scaled = (np.nan_to_num(confidence, nan=50.0) - 50.0) / 50.0 * self.calibration_bins
+        return np.clip(scaled.astype(np.int64), 0, self.calibration_bins - 1)
+
+    @staticmethod
+    def _to_micros(timestamps) -> np.ndarray:
+        """Convert timestamps to int64 epoch microseconds (NaT maps to int64 min)"""
+        values = pd.to_datetime(np.asarray(timestamps)).values.astype('datetime64[us]')
+        return values.astype(np.int64)
@@ -0,0 +1,148 @@
+"""
+Asynchronous facade over GoldPriceApp for asyncio services
+"""
+
+import os
+import asyncio
+import functools
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict
+
+from app.config import Config
+from app.core.gold_price_app import GoldPriceApp
+from app.utils.instrumentation import timed
+
+
+class AsyncGoldPriceApp:
+    """
+    Non-blocking wrapper around a ``GoldPriceApp``
+
+    The data sources are blocking clients, so GoldAPI and news requests run
+    on an I/O thread pool (``ASYNC_IO_WORKERS``) and independent requests
+    are awaited together: ``predict`` fetches the price while the news is
+    scored, and ``run_full_cycle`` fetches news and price at the same time.
+    Feature building and forest inference run on a separate pool sized to
+    the cores (``ASYNC_CPU_WORKERS``), so slow upstreams never queue behind
+    inference and the event loop itself never blocks.
+
+    Data loading and model loading happen once, on first use, behind a lock.
+    """
+
+    def __init__(self, app: Optional[GoldPriceApp] = None, symbol: Optional[str] = None):
+        self.app = app or GoldPriceApp(symbol)
+        self._io = ThreadPoolExecutor(max_workers=Config.ASYNC_IO_WORKERS, thread_name_prefix='async-io')
+        self._cpu = ThreadPoolExecutor(
+            max_workers=Config.ASYNC_CPU_WORKERS or os.cpu_count() or 1,
+            thread_name_prefix='async-cpu'
+        )
+        self._ready_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncGoldPriceApp":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut the thread pools down (in-flight calls finish first)"""
+        self._io.shutdown(wait=True)
+        self._cpu.shutdown(wait=True)
+
+    async def _run(self, executor: ThreadPoolExecutor, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    async def ensure_ready(self):
+        """Process history and load models once, off the event loop"""
+        await self._prepare(train_if_missing=False)
+
+    async def _prepare(self, train_if_missing: bool):
+        """
+        Process history and load models (training them if missing and allowed)
+
+        Runs under one lock, so concurrent callers on a fresh models directory
+        train and publish a single version.
+        """
+        app = self.app
+        if app.models_trained and app.processed_data is not None:
+            return
+        if self._ready_lock is None:
+            self._ready_lock = asyncio.Lock()
+        async with self._ready_lock:
+            if app.processed_data is None:
+                await self._run(self._cpu, app.process_data)
+            if app.models_trained:
+                return
+            try:
+                await self._run(self._cpu, app.load_trained_models)
+                if train_if_missing:
+                    print("Loaded existing trained models")
+            except FileNotFoundError:
+                if not train_if_missing:
+                    raise ValueError("Models not trained. Call train_models() first.")
+                print("Training new models...")
+                metrics = await self.train_models()
+                print(f"Models trained. Accuracy: {metrics['direction']['accuracy']:.2%}")
+
+    async def train_models(self) -> Dict:
+        """Train and publish new models"""
+        return await self._run(self._cpu, self.app.train_models)
+
+    async def get_current_price(self) -> Dict:
+        """Get current gold price from API"""
+        with timed('core.async.goldapi'):
+            return await self._run(self._io, self.app.get_current_price)
+
+    async def get_latest_news(self, max_results: int = 20) -> pd.DataFrame:
+        """Fetch latest impactful news"""
+        with timed('core.async.news_fetch'):
+            return await self._run(self._io, self.app.get_latest_news, max_results)
+
+    async def analyze_news(self, news_data: Optional[pd.DataFrame]) -> Optional[Dict]:
+        """News impact of already fetched articles (sentiment scoring is CPU-bound)"""
+        if news_data is None or news_data.empty:
+            return None
+        return await self._run(self._cpu, self.app.analyze_news, news_data)
+
+    async def predict(
+        self,
+        news_data: Optional[pd.DataFrame] = None,
+        current_price: Optional[Dict] = None,
+        news_sentiment: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Make a prediction without blocking the event loop
+
+        Arguments as ``GoldPriceApp.predict``; a missing price is fetched while
+        the news is scored.
+        """
+        with timed('core.async.predict'):
+            await self.ensure_ready()
+
+            price_task = None if current_price is not None else asyncio.ensure_future(self.get_current_price())
+            try:
+                if news_sentiment is None:
+                    news_sentiment = await self.analyze_news(news_data)
+                if price_task is not None:
+                    current_price = await price_task
+            except BaseException:
+                if price_task is not None:
+                    price_task.cancel()
+                raise
+
+            return await self._run(
+                self._cpu, self.app.predict,
+                current_price=current_price,
+                news_sentiment=news_sentiment
+            )
+
+    async def run_full_cycle(self) -> Dict:
+        """Prepare models, fetch news and price concurrently, then predict"""
+        await self._prepare(train_if_missing=True)
+
+        news, current_price = await asyncio.gather(
+            self.get_latest_news(max_results=20),
+            self.get_current_price()
+        )
+        return await self.predict(news_data=news, current_price=current_price)
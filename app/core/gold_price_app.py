@@ -5,45 +5,82 @@ Main application class for Gold Price Prediction
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Sequence, Iterable
 from datetime import datetime
 
 from app.config import Config
-from app.data import KaggleDataFetcher, GoldAPIClient, NewsFetcher
-from app.features import FeatureEngineer
-from app.models import PricePredictor
+from app.data.local_sources import create_data_sources
+from app.data.quotes import symbol_slug
+from app.features import FeatureEngineer, NewsScorer
+from app.models import PricePredictor, ModelRegistry, PredictionMemo, fingerprint_training_data, compact_predictor
+from app.core.prediction_journal import PredictionJournal
+from app.core.accuracy_tracker import AccuracyTracker
+from app.core.scenarios import ScenarioAnalyzer, ScenarioResult
+from app.core.shadow import ShadowEvaluator
+from app.core.streaming import StreamingPredictor
+from app.utils.instrumentation import timed
 
 
 class GoldPriceApp:
-    """Main application class"""
+    """Main application class for one symbol (XAU/USD by default)"""
     
-    def __init__(self):
+    def __init__(self, symbol: Optional[str] = None):
         self.config = Config
-        self.data_fetcher = KaggleDataFetcher()
-        self.gold_api = GoldAPIClient()
-        self.news_fetcher = NewsFetcher()
+        self.symbol = symbol or Config.DEFAULT_SYMBOL
+        self.data_fetcher, self.gold_api, self.news_fetcher = create_data_sources(self.symbol)
         self.feature_engineer = FeatureEngineer()
+        self.news_scorer = NewsScorer()
         self.predictor = PricePredictor()
+        self.prediction_memo = PredictionMemo()
+        self.journal = PredictionJournal.open(self.journal_dir) if Config.PREDICTION_JOURNAL_ENABLED else None
         
         self.historical_data: Optional[pd.DataFrame] = None
         self.processed_data: Optional[pd.DataFrame] = None
         self.models_trained: bool = False
+        self.shadow: Optional[ShadowEvaluator] = None
+        self._model_watcher = None
     
+    @property
+    def models_dir(self) -> Path:
+        """Model directory of this symbol (the top-level one for the default symbol)"""
+        if self.symbol == Config.DEFAULT_SYMBOL:
+            return Config.MODELS_DIR
+        return Config.MODELS_DIR / symbol_slug(self.symbol)
+    
+    @property
+    def journal_dir(self) -> Path:
+        """Prediction journal directory of this symbol"""
+        if self.symbol == Config.DEFAULT_SYMBOL:
+            return Config.JOURNAL_DIR
+        return Config.JOURNAL_DIR / symbol_slug(self.symbol)
+    
+    @property
+    def registry(self) -> ModelRegistry:
+        """Versioned model store of this symbol"""
+        return ModelRegistry(self.models_dir)
+    
+    @timed('core.load_historical_data')
     def load_historical_data(self) -> pd.DataFrame:
         """Load and process historical data from Kaggle"""
-        print("Loading historical data from Kaggle...")
+        print(f"Loading historical data for {self.symbol}...")
         self.historical_data = self.data_fetcher.get_data()
         return self.historical_data
     
+    @timed('core.process_data')
     def process_data(self) -> pd.DataFrame:
         """Process historical data and create features"""
         if self.historical_data is None:
             self.load_historical_data()
         
         print("Processing data and creating features...")
-        self.processed_data = self.feature_engineer.create_price_features(self.historical_data)
+        data = self.historical_data
+        if Config.HISTORY_TICKS_PATH is not None and Path(Config.HISTORY_TICKS_PATH).exists():
+            # Intraday ticks resampled onto the history's calendar extend it past the last daily row
+            data = self.feature_engineer.align_prices(data, pd.read_csv(Config.HISTORY_TICKS_PATH))
+        self.processed_data = self.feature_engineer.create_price_features(data)
         return self.processed_data
     
+    @timed('core.train_models')
     def train_models(self) -> Dict:
         """Train the prediction models"""
         if self.processed_data is None:
@@ -53,69 +90,149 @@ class GoldPriceApp:
         feature_names = self.feature_engineer.get_feature_names()
         
         # Create feature matrix for all historical data
-        X_list = []
-        y_direction_list = []
-        y_range_list = []
+        X, y_direction, y_range = self.feature_engineer.create_training_matrix(self.processed_data)
         
-        for idx in range(len(self.processed_data)):
-            row = self.processed_data.iloc[idx]
-            if pd.isna(row.get('next_direction')):
-                continue
-            
-            # Create feature matrix for this row (without news/API for historical training)
-            features = []
-            
-            # Historical price features
-            price_features = [
-                'price_change', 'price_change_pct', 'price_ma_7', 'price_ma_30',
-                'price_std_7', 'volatility', 'momentum_7', 'momentum_30'
-            ]
-            
-            for feature in price_features:
-                if feature in self.processed_data.columns:
-                    val = row[feature]
-                    features.append(float(val) if not pd.isna(val) else 0.0)
-                else:
-                    features.append(0.0)
-            
-            # News features (0 for historical training)
-            features.extend([0.0, 0.0, 0.0, 0.0])
-            
-            # API features (0 for historical training)
-            features.extend([0.0, 0.0, 0.0, 0.0])
-            
-            X_list.append(features)
-            y_direction_list.append(int(row['next_direction']))
-            y_range_list.append(float(row.get('next_price_change', 0.0)))
+        # Train a fresh predictor: published versions may be in use elsewhere and are never modified
+        predictor = PricePredictor()
+        metrics = predictor.train(X, y_direction, y_range, feature_names)
         
-        X = np.array(X_list)
-        y_direction = np.array(y_direction_list)
-        y_range = np.array(y_range_list)
+        # Publish as a new model version and make it current
+        with timed('core.train_models.save'):
+            version = self.registry.publish(
+                predictor, metrics, fingerprint_training_data(X, y_direction, y_range)
+            )
+        print(f"Published model version {version}")
         
-        # Train models
-        metrics = self.predictor.train(X, y_direction, y_range, feature_names)
+        self.predictor = predictor
         self.models_trained = True
         
-        # Save models
-        self.predictor.save_models(Config.MODELS_DIR)
-        
         return metrics
     
-    def load_trained_models(self):
-        """Load pre-trained models"""
-        direction_model_path = Config.MODELS_DIR / "direction_model.pkl"
-        range_model_path = Config.MODELS_DIR / "range_model.pkl"
+    @timed('core.export_compact_models')
+    def export_compact_models(self, tolerance: Optional[float] = None, promote: bool = True) -> Dict:
+        """
+        Publish a compact copy of the current models for deployment
+        
+        Forests are pruned, stored as float32 ``.npz`` arrays and cut to the
+        fewest trees within ``tolerance`` of their held-out accuracy (see
+        app.models.compact). The copy is published as a new version and, with
+        ``promote``, made current so running apps hot-swap to it.
         
-        if not direction_model_path.exists() or not range_model_path.exists():
+        Returns:
+            Per-model report (trees, nodes, bytes, accuracy/MAE) plus the version
+        """
+        registry = self.registry
+        if not registry.has_models():
             raise FileNotFoundError("Models not found. Train models first.")
+        predictor = registry.load()
+        if predictor.is_compact:
+            raise ValueError(f"Model version {predictor.version} is already compact")
+        
+        if self.processed_data is None:
+            self.process_data()
+        X, y_direction, y_range = self.feature_engineer.create_training_matrix(self.processed_data)
+        
+        compact, report = compact_predictor(predictor, X, y_direction, y_range, tolerance)
+        
+        # Unscored models (negative tolerance) keep every tree, so the source version's metrics still hold
+        source = registry.manifest(predictor.version).get('metrics', {}) if predictor.version else {}
+        metrics = {'direction': {}, 'range': {}}
+        for name, metric, summary_key in (('direction', 'accuracy', 'direction_accuracy'), ('range', 'mae', 'range_mae')):
+            if metric in report[name]:
+                metrics[name][metric] = report[name][metric]
+            elif summary_key in source:
+                metrics[name][metric] = source[summary_key]
+        if 'mae' not in report['range'] and 'range_rmse' in source:
+            metrics['range']['rmse'] = source['range_rmse']
+        with timed('core.export_compact_models.save'):
+            version = registry.publish(
+                compact, metrics, fingerprint_training_data(X, y_direction, y_range), promote=promote
+            )
+        print(f"Published compact model version {version}")
         
-        self.predictor.load_models(Config.MODELS_DIR)
+        if promote:
+            self.predictor = compact
+            self.models_trained = True
+        
+        return {**report, 'version': version, 'source_version': predictor.version}
+    
+    @timed('core.load_trained_models')
+    def load_trained_models(self):
+        """Load the current model version and keep watching for newly promoted ones"""
+        registry = self.registry
+        if not registry.has_models():
+            raise FileNotFoundError("Models not found. Train models first.")
+        
+        predictor = registry.load()
+        
+        # Models saved before the feature set changed (e.g. new indicators) must be retrained
+        if not self._compatible(predictor):
+            raise FileNotFoundError("Saved models were trained on a different feature set. Train models again.")
+        
+        self.predictor = predictor
         self.models_trained = True
+        
+        if Config.MODEL_HOT_SWAP_ENABLED and self._model_watcher is None:
+            self._model_watcher = registry.watch(self._swap_predictor, current=predictor.version)
+        
+        if Config.SHADOW_MODEL_VERSIONS and self.shadow is None:
+            self.load_shadow_models()
+    
+    def load_shadow_models(self, versions: Optional[Sequence[str]] = None):
+        """Shadow production with registry versions (Config.SHADOW_MODEL_VERSIONS by default)"""
+        for version in versions or Config.SHADOW_MODEL_VERSIONS:
+            predictor = self.registry.load(version)
+            if not self._compatible(predictor):
+                print(f"Skipping shadow model version {version}: different feature set")
+                continue
+            self.add_shadow_model(version, predictor)
+            print(f"Shadowing with model version {version}")
+    
+    def add_shadow_model(self, name: str, predictor: PricePredictor):
+        """Score every prediction with ``predictor`` in the background, without serving its output"""
+        if self.shadow is None:
+            self.shadow = ShadowEvaluator(
+                self.feature_engineer.create_feature_matrix,
+                journal_dir=self.journal_dir / "shadow" if self.journal is not None else None
+            )
+        self.shadow.add(name, predictor)
+    
+    def get_shadow_report(self) -> Dict[str, Dict]:
+        """Agreement with production and realized accuracy of each shadow model"""
+        if self.shadow is None:
+            raise ValueError("No shadow models loaded. Set SHADOW_MODEL_VERSIONS or call load_shadow_models().")
+        return self.shadow.report()
+    
+    def close(self):
+        """Stop watching for new model versions and stop the shadow worker"""
+        if self._model_watcher is not None:
+            self._model_watcher.set()
+            self._model_watcher = None
+        if self.shadow is not None:
+            self.shadow.close()
+            self.shadow = None
+    
+    def _compatible(self, predictor: PricePredictor) -> bool:
+        """Whether a predictor was trained on the features this app computes"""
+        return predictor.feature_names is None or list(predictor.feature_names) == self.feature_engineer.get_feature_names()
     
+    def _swap_predictor(self, predictor: PricePredictor):
+        """Hot-swap to a newly promoted version (called from the registry watcher thread)"""
+        if predictor is self.predictor:
+            return
+        if not self._compatible(predictor):
+            print(f"Skipping model version {predictor.version}: different feature set")
+            return
+        # A single reference assignment: in-flight predictions keep the predictor they started with
+        self.predictor = predictor
+        print(f"Switched to model version {predictor.version}")
+    
+    @timed('core.predict')
     def predict(
         self,
         news_data: Optional[pd.DataFrame] = None,
-        current_price: Optional[Dict] = None
+        current_price: Optional[Dict] = None,
+        news_sentiment: Optional[Dict] = None
     ) -> Dict:
         """
         Make a prediction using current data
@@ -123,6 +240,7 @@ class GoldPriceApp:
         Args:
             news_data: DataFrame with news articles
             current_price: Current gold price data from API
+            news_sentiment: Already computed news impact (skips analyzing news_data)
             
         Returns:
             Dictionary with prediction results
@@ -138,43 +256,176 @@ class GoldPriceApp:
             self.process_data()
         
         # Get news sentiment if provided
-        news_sentiment = None
-        if news_data is not None and not news_data.empty:
-            news_sentiment = self.news_fetcher.analyze_news_impact(news_data)
+        if news_sentiment is None and news_data is not None and not news_data.empty:
+            with timed('core.predict.news_sentiment'):
+                news_sentiment = self.analyze_news(news_data)
         
         # Get current price if not provided
         if current_price is None:
-            current_price = self.gold_api.get_current_price()
+            with timed('core.predict.goldapi'):
+                current_price = self.gold_api.get_current_price()
+        
+        # One predictor for the whole call, even if a new version is swapped in meanwhile
+        predictor = self.predictor
         
-        # Create feature matrix
+        # Create feature matrix (only the features the models were pruned to)
         X = self.feature_engineer.create_feature_matrix(
             self.processed_data,
             news_sentiment=news_sentiment,
-            current_api_price=current_price
+            current_api_price=current_price,
+            feature_names=predictor.selected_features
         )
         
-        # Make prediction
-        prediction = self.predictor.predict(X)
+        # Make prediction (repeat inputs to the same model come from the memo)
+        prediction = self.prediction_memo.predict(predictor, X)
         
         # Add additional context
         result = {
             **prediction,
+            'symbol': self.symbol,
             'timestamp': datetime.now().isoformat(),
             'current_price': current_price.get('current_price') if current_price else None,
             'news_impact': news_sentiment,
-            'model_version': '1.0.0'
+            'model_version': predictor.version or 'unversioned'
         }
         
+        # Record prediction for later scoring against realized prices
+        if self.journal is not None:
+            with timed('core.predict.journal'):
+                self.journal.append(result, X, predictor.selected_features)
+        
+        # Candidate models score the same request in the background (dropped under load)
+        if self.shadow is not None:
+            self.shadow.submit(result, X, predictor.selected_features, self.processed_data,
+                               news_sentiment, current_price)
+        
         return result
     
+    def stream_predictions(
+        self,
+        source: Optional[Iterable[Dict]] = None,
+        news_data: Optional[pd.DataFrame] = None,
+        output_path: Optional[Path] = None,
+        max_ticks: Optional[int] = None,
+        duration: Optional[float] = None
+    ) -> Dict:
+        """
+        Predict on every tick of a price stream until it ends (see StreamingPredictor)
+        
+        Args:
+            source: Iterable of price dicts; by default the replay tape with
+                GOLDAPI_SOURCE='replay', else polling this app's GoldAPI client
+            news_data: News whose impact applies to every tick
+            output_path: JSON lines file the predictions are appended to
+            
+        Returns:
+            Throughput and end-to-end lag statistics
+        """
+        from app.data.quotes import parse_symbol
+        from app.data.ticks import ReplayTickSource, PollingTickSource
+        
+        if not self.models_trained:
+            try:
+                self.load_trained_models()
+            except FileNotFoundError:
+                raise ValueError("Models not trained. Call train_models() first.")
+        
+        if self.processed_data is None:
+            self.process_data()
+        
+        if source is None:
+            if Config.GOLDAPI_SOURCE == 'replay':
+                metal, currency = parse_symbol(self.symbol)
+                source = ReplayTickSource(metal=metal, currency=currency)
+            else:
+                source = PollingTickSource(self.gold_api)
+        
+        stream = StreamingPredictor(
+            lambda: self.predictor,
+            self.processed_data,
+            source,
+            feature_engineer=self.feature_engineer,
+            news_sentiment=self.analyze_news(news_data),
+            output_path=output_path,
+            symbol=self.symbol
+        )
+        return stream.run(max_ticks=max_ticks, duration=duration)
+    
+    @timed('core.run_scenarios')
+    def run_scenarios(
+        self,
+        grid: Dict[str, Sequence[float]],
+        news_data: Optional[pd.DataFrame] = None,
+        current_price: Optional[Dict] = None,
+        chunk_size: Optional[int] = None
+    ) -> ScenarioResult:
+        """
+        Stress-test the models over a grid of feature values
+        
+        Args:
+            grid: Feature name -> values to sweep, e.g.
+                {'rsi_14': np.linspace(20, 80, 100), 'return_1': np.linspace(-2, 2, 50)};
+                features dropped by feature selection leave the outputs flat (see ScenarioResult.used_axes)
+            news_data: News the non-swept news features come from
+            current_price: API price the non-swept API features come from
+            chunk_size: Scenarios scored per batch (defaults to Config.SCENARIO_CHUNK_SIZE)
+            
+        Returns:
+            ScenarioResult with direction, confidence and price change per grid point
+        """
+        if not self.models_trained:
+            try:
+                self.load_trained_models()
+            except FileNotFoundError:
+                raise ValueError("Models not trained. Call train_models() first.")
+        
+        if self.processed_data is None:
+            self.process_data()
+        
+        news_sentiment = self.analyze_news(news_data)
+        
+        base_row = self.feature_engineer.create_feature_matrix(
+            self.processed_data,
+            news_sentiment=news_sentiment,
+            current_api_price=current_price
+        )
+        
+        analyzer = ScenarioAnalyzer(self.predictor, self.feature_engineer.get_feature_names(), chunk_size)
+        return analyzer.run(base_row, grid)
+    
+    def analyze_news(self, news_data: Optional[pd.DataFrame]) -> Optional[Dict]:
+        """News impact of fetched articles (large batches are scored in worker processes)"""
+        if news_data is None or news_data.empty:
+            return None
+        if Config.NEWS_SCORING_ENABLED:
+            return self.news_scorer.analyze_news_impact(news_data)
+        return self.news_fetcher.analyze_news_impact(news_data)
+    
+    @timed('core.news_fetch')
     def get_latest_news(self, max_results: int = 20) -> pd.DataFrame:
         """Fetch latest impactful news"""
         return self.news_fetcher.get_all_relevant_gold_news(max_results_per_query=max_results)
     
+    @timed('core.goldapi')
     def get_current_price(self) -> Dict:
         """Get current gold price from API"""
-        return self.gold_api.get_current_price()
+        price_data = self.gold_api.get_current_price()
+        
+        # Every observed price helps resolve earlier predictions
+        if self.journal is not None and price_data and price_data.get('current_price'):
+            AccuracyTracker.for_journal(self.journal).add_price(datetime.now(), price_data['current_price'])
+            if self.shadow is not None:
+                self.shadow.add_price(datetime.now(), price_data['current_price'])
+        
+        return price_data
+    
+    def get_accuracy_metrics(self) -> Dict:
+        """Get realized accuracy of journaled predictions (hit rate, MAE, calibration)"""
+        if self.journal is None:
+            raise ValueError("Prediction journal is disabled. Set PREDICTION_JOURNAL_ENABLED.")
+        return AccuracyTracker.for_journal(self.journal).get_metrics()
     
+    @timed('core.run_full_cycle')
     def run_full_cycle(self) -> Dict:
         """Run full prediction cycle: fetch data, train models, predict"""
         print("=" * 70)
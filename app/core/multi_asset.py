@@ -0,0 +1,192 @@
+"""
+Run the prediction pipeline for several metals and currencies in one process
+"""
+
+import os
+import multiprocessing
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional, Dict, List
+
+from app.config import Config
+from app.data.quotes import fetch_quotes, parse_symbol
+from app.core.gold_price_app import GoldPriceApp
+from app.utils.instrumentation import timed
+
+
+def _train_symbol(
+    X: np.ndarray,
+    y_direction: np.ndarray,
+    y_range: np.ndarray,
+    feature_names: List[str],
+    models_dir: Path,
+    n_jobs: int
+) -> Dict:
+    """Train one symbol's models and publish them as its current version (runs in a worker process)"""
+    from app.models import PricePredictor, ModelRegistry, fingerprint_training_data
+
+    predictor = PricePredictor()
+    metrics = predictor.train(X, y_direction, y_range, feature_names, n_jobs=n_jobs)
+    ModelRegistry(models_dir).publish(predictor, metrics, fingerprint_training_data(X, y_direction, y_range))
+    return metrics
+
+
+def _apply_config(settings: Dict):
+    """Worker initializer: spawned workers re-read Config from defaults, so apply the parent's"""
+    for name, value in settings.items():
+        setattr(Config, name, value)
+
+
+class MultiAssetApp:
+    """
+    One ``GoldPriceApp`` per symbol (XAU, XAG, XPT, XPD against any currency)
+
+    Each symbol keeps its own history, features, models (``models/<METAL>_<CURRENCY>``)
+    and prediction journal. Quotes for all symbols are fetched in one
+    concurrent round, and per-symbol models train in parallel worker
+    processes that split the available cores between them.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None):
+        self.symbols = [f"{metal}/{currency}" for metal, currency in map(parse_symbol, symbols or Config.SYMBOLS)]
+        if not self.symbols:
+            raise ValueError("No symbols configured. Set Config.SYMBOLS.")
+        self.apps: Dict[str, GoldPriceApp] = {symbol: GoldPriceApp(symbol) for symbol in self.symbols}
+
+    def __getitem__(self, symbol: str) -> GoldPriceApp:
+        return self.apps[symbol]
+
+    @timed('core.multi.process_data')
+    def process_data(self) -> Dict[str, pd.DataFrame]:
+        """Load and process history for every symbol (loads overlap on I/O)"""
+        def process(app: GoldPriceApp) -> pd.DataFrame:
+            return app.processed_data if app.processed_data is not None else app.process_data()
+
+        with ThreadPoolExecutor(max_workers=len(self.apps), thread_name_prefix='history') as pool:
+            futures = {symbol: pool.submit(process, app) for symbol, app in self.apps.items()}
+            return {symbol: future.result() for symbol, future in futures.items()}
+
+    @timed('core.multi.train_models')
+    def train_models(self, max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Train every symbol's models in parallel worker processes
+
+        Args:
+            max_workers: Worker processes (defaults to one per symbol, at most one per core)
+
+        Returns:
+            Symbol -> training metrics
+        """
+        self.process_data()
+
+        cpus = Config.TRAINING_CORES or os.cpu_count() or 1
+        workers = max(1, min(len(self.apps), max_workers or cpus))
+        n_jobs = max(1, cpus // workers)  # symbols split the core budget instead of oversubscribing it
+
+        jobs = {}
+        for symbol, app in self.apps.items():
+            X, y_direction, y_range = app.feature_engineer.create_training_matrix(app.processed_data)
+            jobs[symbol] = (X, y_direction, y_range, app.feature_engineer.get_feature_names(), app.models_dir, n_jobs)
+
+        print(f"Training {len(jobs)} symbols on {workers} worker(s), {n_jobs} core(s) each...")
+        if workers == 1:
+            metrics = {symbol: _train_symbol(*job) for symbol, job in jobs.items()}
+        else:
+            # Spawned, not forked: the parent already runs journal, watcher and server threads
+            settings = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_apply_config,
+                initargs=(settings,)
+            ) as pool:
+                futures = {symbol: pool.submit(_train_symbol, *job) for symbol, job in jobs.items()}
+                metrics = {symbol: future.result() for symbol, future in futures.items()}
+
+        for app in self.apps.values():
+            app.load_trained_models()
+        return metrics
+
+    def load_trained_models(self):
+        """Load pre-trained models for every symbol"""
+        for app in self.apps.values():
+            app.load_trained_models()
+
+    @timed('core.multi.quotes')
+    def get_current_prices(self) -> Dict[str, Dict]:
+        """Fetch current quotes for all symbols in one concurrent round"""
+        # Going through each app feeds the quotes to its accuracy tracker
+        return fetch_quotes(self.apps)
+
+    @timed('core.multi.predict')
+    def predict(
+        self,
+        news_data: Optional[pd.DataFrame] = None,
+        current_prices: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Predict every symbol
+
+        Args:
+            news_data: DataFrame with news articles (shared by all symbols)
+            current_prices: Symbol -> price dict; fetched in one round if not given
+
+        Returns:
+            Symbol -> prediction result
+        """
+        if current_prices is None:
+            current_prices = self.get_current_prices()
+
+        news_sentiment = None
+        if news_data is not None and not news_data.empty:
+            # Score the news once instead of once per symbol
+            news_sentiment = next(iter(self.apps.values())).analyze_news(news_data)
+
+        return {
+            symbol: app.predict(news_sentiment=news_sentiment, current_price=current_prices.get(symbol))
+            for symbol, app in self.apps.items()
+        }
+
+    def get_latest_news(self, max_results: int = 20) -> pd.DataFrame:
+        """Fetch latest impactful news (shared by all symbols)"""
+        return next(iter(self.apps.values())).get_latest_news(max_results=max_results)
+
+    @timed('core.multi.run_full_cycle')
+    def run_full_cycle(self) -> Dict[str, Dict]:
+        """Run the full prediction cycle for every symbol"""
+        print("=" * 70)
+        print(f"Multi-Asset Prediction - {', '.join(self.symbols)}")
+        print("=" * 70)
+
+        self.process_data()
+
+        try:
+            self.load_trained_models()
+            print("Loaded existing trained models")
+        except FileNotFoundError:
+            print("Training new models...")
+            metrics = self.train_models()
+            for symbol, symbol_metrics in metrics.items():
+                print(f"  {symbol}: accuracy {symbol_metrics['direction']['accuracy']:.2%}")
+
+        print("\nFetching latest news...")
+        news = self.get_latest_news(max_results=20)
+
+        print("Fetching current prices...")
+        current_prices = self.get_current_prices()
+
+        print("\nMaking predictions...")
+        predictions = self.predict(news_data=news, current_prices=current_prices)
+
+        print("\n" + "=" * 70)
+        print("PREDICTION RESULTS")
+        print("=" * 70)
+        for symbol, prediction in predictions.items():
+            price = prediction.get('current_price')
+            print(f"{symbol:<8} {prediction['direction']:<5} {prediction['confidence']:5.1f}%  "
+                  f"change ${prediction['price_change']:8.2f}  price {f'${price:,.2f}' if price else 'N/A'}")
+
+        return predictions
+
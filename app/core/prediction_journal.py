@@ -0,0 +1,438 @@
+"""
+Durable, append-only journal of prediction results
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import threading
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Dict, List, Callable
+
+from app.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: a segment open in another process cannot be unlinked anyway
+    fcntl = None
+
+
+class PredictionJournal:
+    """
+    Append-only journal of predictions stored under ``Config.JOURNAL_DIR``
+
+    Records are appended as JSON lines to numbered segment files with a single
+    ``os.write`` each. Syncing to disk (fsync) happens in a background thread
+    once ``fsync_batch_size`` records are pending or ``fsync_interval`` seconds
+    have passed, so the predict path only pays for serialization and one write.
+    Full segments are compacted in the background into columnar ``.npz`` parts.
+
+    Several processes can share a directory: segment numbers are claimed with
+    an exclusive create, and each writer holds a ``flock`` on its active
+    segment, which compaction skips. Feature names are written once per
+    feature set to ``features-<id>.json``; records refer to them by id.
+    """
+
+    SEGMENT_PREFIX = "segment-"
+    PART_PREFIX = "part-"
+    FEATURES_PREFIX = "features-"
+    COLUMNS = [
+        'timestamp', 'current_price', 'direction', 'confidence', 'price_change',
+        'model_version', 'feature_set', 'features'
+    ]
+
+    # One journal per directory per process so dashboard sessions share a writer
+    _instances: Dict[Path, "PredictionJournal"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        journal_dir: Optional[Path] = None,
+        fsync_batch_size: Optional[int] = None,
+        fsync_interval: Optional[float] = None,
+        segment_size: Optional[int] = None
+    ):
+        self.journal_dir = Path(journal_dir or Config.JOURNAL_DIR)
+        self.fsync_batch_size = fsync_batch_size or Config.JOURNAL_FSYNC_BATCH_SIZE
+        self.fsync_interval = fsync_interval or Config.JOURNAL_FSYNC_INTERVAL
+        self.segment_size = segment_size or Config.JOURNAL_SEGMENT_SIZE
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._compaction_needed = False
+        self._sealed_fds: List[int] = []
+        self._sealed_seqs: List[int] = []
+        self._feature_sets: Dict[tuple, str] = {}
+        self._subscribers: List[Callable[[Dict], None]] = []
+
+        # Never append to segments left by other processes: they are sealed or theirs
+        self._seq, self._fd = self._allocate_segment()
+        self._segment_count = 0
+        self._compaction_needed = any(seq < self._seq for seq in self._segment_seqs())
+
+        self._worker = threading.Thread(target=self._run, name="prediction-journal", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def open(cls, journal_dir: Optional[Path] = None) -> "PredictionJournal":
+        """Get the shared journal for a directory, creating it on first use"""
+        key = Path(journal_dir or Config.JOURNAL_DIR).resolve()
+        with cls._instances_lock:
+            journal = cls._instances.get(key)
+            if journal is None or journal._closed:
+                journal = cls(key)
+                cls._instances[key] = journal
+            return journal
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        result: Dict,
+        features: Optional[np.ndarray] = None,
+        feature_names: Optional[List[str]] = None
+    ):
+        """Append one prediction result and the feature vector (named ``feature_names``) it was made from"""
+        record = {
+            'timestamp': result.get('timestamp'),
+            'current_price': result.get('current_price'),
+            'direction': result.get('direction'),
+            'confidence': result.get('confidence'),
+            'price_change': result.get('price_change'),
+            'model_version': result.get('model_version'),
+            'features': np.asarray(features, dtype=float).ravel().tolist() if features is not None else [],
+            'feature_set': self._feature_set(feature_names) if feature_names else ''
+        }
+        line = (json.dumps(record, separators=(',', ':')) + "\n").encode('utf-8')
+
+        with self._lock:
+            if self._closed:
+                raise ValueError("Journal is closed")
+            os.write(self._fd, line)
+            self._pending += 1
+            self._segment_count += 1
+            if self._segment_count >= self.segment_size:
+                self._rotate()
+            if self._pending >= self.fsync_batch_size or self._compaction_needed:
+                self._wakeup.set()
+
+        for callback in self._subscribers:
+            callback(record)
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Call ``callback`` with every record appended from now on"""
+        self._subscribers.append(callback)
+
+    def flush(self):
+        """Force pending records to disk"""
+        with self._lock:
+            if self._closed or self._pending == 0:
+                return
+            # Sync a duplicate so a concurrent rotation cannot close it under us
+            fd = os.dup(self._fd)
+            self._pending = 0
+            self._last_sync = time.monotonic()
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def compact(self):
+        """
+        Compact sealed segments into columnar part files
+
+        Segments still held by a writer (this process's active segment, or
+        any segment another live process writes to) are skipped; every run of
+        consecutive claimable segments becomes one part.
+        """
+        with self._lock:
+            self._compaction_needed = False
+            current_seq = self._seq
+            own = set(self._sealed_seqs)
+
+        claimed: Dict[int, int] = {}
+        runs, run = [], []
+        try:
+            for seq in self._segment_seqs():
+                if seq >= current_seq:
+                    break
+                fd = self._claim_segment(seq, own)
+                if fd is None:
+                    if run:
+                        runs.append(run)
+                    run = []
+                    continue
+                claimed[seq] = fd
+                run.append(seq)
+            if run:
+                runs.append(run)
+
+            # Claimed segments already in a part are left over from an interrupted compaction
+            covered = self._covered_seqs()
+            for run in runs:
+                seqs = [seq for seq in run if seq not in covered]
+                if seqs:
+                    self._write_part(seqs)
+                for seq in run:
+                    self._segment_path(seq).unlink(missing_ok=True)
+        finally:
+            for fd in claimed.values():
+                os.close(fd)
+
+        with self._lock:
+            self._sealed_seqs = [seq for seq in self._sealed_seqs if seq not in claimed]
+
+    def close(self):
+        """Sync outstanding records and stop the background worker"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        self._worker.join(timeout=5)
+        self._sync_sealed()
+        os.fsync(self._fd)
+        os.close(self._fd)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def load_columns(self, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Load every journaled prediction as a dict of column arrays, oldest first
+
+        Args:
+            columns: Subset of columns to load; compacted parts only read these
+        """
+        parts = []
+        covered = set()
+        for first, last in self._part_ranges():
+            with np.load(self._part_path(first, last), allow_pickle=False) as data:
+                # Parts written before feature sets were journaled have no feature_set column
+                parts.append({
+                    name: data[name] if name in data.files else np.full(len(data['timestamp']), '')
+                    for name in (columns or self.COLUMNS)
+                })
+            covered.update(range(first, last + 1))
+
+        segment_paths = [self._segment_path(seq) for seq in self._segment_seqs() if seq not in covered]
+        if segment_paths or not parts:
+            parsed = self._parse_segments(segment_paths)
+            parts.append({name: parsed[name] for name in (columns or parsed)})
+
+        result = {}
+        for name in parts[0]:
+            if name == 'features':
+                # Rows narrower than the widest feature set are padded with NaN
+                width = max(part[name].shape[1] for part in parts)
+                result[name] = np.vstack([
+                    np.pad(part[name], ((0, 0), (0, width - part[name].shape[1])), constant_values=np.nan)
+                    for part in parts
+                ])
+            else:
+                result[name] = np.concatenate([part[name] for part in parts])
+        return result
+
+    def load(self) -> pd.DataFrame:
+        """
+        Load the journal as a DataFrame with one column per journaled feature
+
+        Features are named after the model inputs they were journaled with
+        (NaN for records whose model did not use a feature); records without
+        names get ``feature_<i>`` columns.
+        """
+        columns = self.load_columns()
+        features = columns.pop('features')
+        df = pd.DataFrame(columns)
+        named: Dict[str, np.ndarray] = {}
+        for set_id in np.unique(columns['feature_set']):
+            rows = columns['feature_set'] == set_id
+            names = self.feature_names(set_id) or [f'feature_{i}' for i in range(features.shape[1])]
+            for i, name in enumerate(names[:features.shape[1]]):
+                named.setdefault(name, np.full(len(df), np.nan))[rows] = features[rows, i]
+        return pd.concat([df, pd.DataFrame(named, index=df.index)], axis=1)
+
+    def feature_names(self, feature_set: str) -> Optional[List[str]]:
+        """Feature names of a record's ``feature_set`` id (None if unknown)"""
+        path = self.journal_dir / f"{self.FEATURES_PREFIX}{feature_set}.json"
+        if not feature_set or not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """Background worker: batched fsync and compaction"""
+        while True:
+            self._wakeup.wait(timeout=self.fsync_interval)
+            self._wakeup.clear()
+            if self._closed:
+                return
+            try:
+                self._sync_sealed()
+                if self._pending and (
+                    self._pending >= self.fsync_batch_size
+                    or time.monotonic() - self._last_sync >= self.fsync_interval
+                ):
+                    self.flush()
+                if self._compaction_needed:
+                    self.compact()
+            except OSError as e:
+                print(f"Prediction journal error: {e}")
+
+    def _rotate(self):
+        """Seal the active segment and start the next one (lock held)"""
+        # The worker syncs and closes the sealed segment off the predict path
+        self._sealed_fds.append(self._fd)
+        self._sealed_seqs.append(self._seq)
+        self._pending = 0
+        self._seq, self._fd = self._allocate_segment(self._seq)
+        self._segment_count = 0
+        self._compaction_needed = True
+
+    def _sync_sealed(self):
+        """Sync and close segments sealed by rotation"""
+        with self._lock:
+            sealed, self._sealed_fds = self._sealed_fds, []
+        for fd in sealed:
+            os.fsync(fd)
+            os.close(fd)
+
+    def _allocate_segment(self, after: int = -1) -> tuple:
+        """
+        Create and lock a segment numbered past every existing segment and part
+
+        The exclusive create means two processes never get the same number;
+        the file stays empty until the writer holds its lock, and compaction
+        never takes empty segments.
+        """
+        existing = self._segment_seqs() + [last for _, last in self._part_ranges()]
+        seq = max(existing + [after]) + 1
+        while True:
+            try:
+                fd = os.open(self._segment_path(seq), os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o644)
+            except FileExistsError:
+                seq += 1
+                continue
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            return seq, fd
+
+    def _claim_segment(self, seq: int, own: set) -> Optional[int]:
+        """Open and lock a segment for compaction, or None while a writer may still hold it"""
+        path = self._segment_path(seq)
+        if fcntl is None:
+            # No cross-process locks: only segments this process sealed
+            return os.open(path, os.O_RDONLY) if seq in own else None
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # Skip segments not yet written, or unlinked by another compaction meanwhile
+            if os.fstat(fd).st_size and os.stat(path).st_ino == os.fstat(fd).st_ino:
+                return fd
+        except OSError:
+            pass
+        os.close(fd)
+        return None
+
+    def _write_part(self, seqs: List[int]):
+        """Write segments ``seqs`` (consecutive among the remaining segments) to one part file"""
+        columns = self._parse_segments([self._segment_path(seq) for seq in seqs])
+        part_path = self._part_path(seqs[0], seqs[-1])
+        tmp_path = part_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **columns)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, part_path)
+
+    def _feature_set(self, feature_names: List[str]) -> str:
+        """Id of a feature name list, written to ``features-<id>.json`` on first use"""
+        key = tuple(feature_names)
+        set_id = self._feature_sets.get(key)
+        if set_id is None:
+            body = json.dumps(list(key))
+            set_id = hashlib.sha1(body.encode('utf-8')).hexdigest()[:12]
+            path = self.journal_dir / f"{self.FEATURES_PREFIX}{set_id}.json"
+            if not path.exists():
+                tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+                tmp_path.write_text(body)
+                os.replace(tmp_path, path)
+            self._feature_sets[key] = set_id
+        return set_id
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.journal_dir / f"{self.SEGMENT_PREFIX}{seq:08d}.jsonl"
+
+    def _part_path(self, first: int, last: int) -> Path:
+        return self.journal_dir / f"{self.PART_PREFIX}{first:08d}-{last:08d}.npz"
+
+    def _segment_seqs(self) -> List[int]:
+        return sorted(
+            int(path.stem[len(self.SEGMENT_PREFIX):])
+            for path in self.journal_dir.glob(f"{self.SEGMENT_PREFIX}*.jsonl")
+        )
+
+    def _part_ranges(self) -> List[tuple]:
+        ranges = []
+        for path in self.journal_dir.glob(f"{self.PART_PREFIX}*.npz"):
+            first, last = path.stem[len(self.PART_PREFIX):].split('-')
+            ranges.append((int(first), int(last)))
+        return sorted(ranges)
+
+    def _covered_seqs(self) -> set:
+        return {seq for first, last in self._part_ranges() for seq in range(first, last + 1)}
+
+    @staticmethod
+    def _parse_segments(paths: List[Path]) -> Dict[str, np.ndarray]:
+        """Parse JSONL segments into column arrays, skipping a torn final line"""
+        records = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+
+        width = max((len(r.get('features') or []) for r in records), default=0)
+        features = np.full((len(records), width), np.nan)
+        for i, record in enumerate(records):
+            values = record.get('features') or []
+            features[i, :len(values)] = values
+
+        def floats(key):
+            return np.array(
+                [np.nan if r.get(key) is None else r[key] for r in records],
+                dtype=np.float64
+            )
+
+        return {
+            'timestamp': np.array(
+                [r.get('timestamp') or 'NaT' for r in records], dtype='datetime64[us]'
+            ),
+            'current_price': floats('current_price'),
+            'direction': np.array([1 if r.get('direction') == 'UP' else 0 for r in records], dtype=np.int8),
+            'confidence': floats('confidence'),
+            'price_change': floats('price_change'),
+            'model_version': np.array([str(r.get('model_version') or '') for r in records], dtype=str),
+            'feature_set': np.array([str(r.get('feature_set') or '') for r in records], dtype=str),
+            'features': features
+        }
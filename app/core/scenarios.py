@@ -0,0 +1,156 @@
+"""
+Scenario-grid stress testing of the prediction models
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Dict, List, Sequence
+
+from app.config import Config
+from app.models import PricePredictor
+from app.utils.instrumentation import timed
+
+
+OUTPUTS = ('direction', 'up_probability', 'confidence', 'price_change')
+
+
+class ScenarioResult:
+    """
+    Model outputs over a parameter grid, one array per output shaped like the grid
+
+    ``used_axes`` lists the swept features the models actually take as input;
+    outputs are constant along every other axis.
+    """
+
+    def __init__(
+        self,
+        axes: Dict[str, np.ndarray],
+        outputs: Dict[str, np.ndarray],
+        base_row: np.ndarray,
+        used_axes: Optional[List[str]] = None
+    ):
+        self.axes = axes
+        self.outputs = outputs
+        self.base_row = base_row
+        self.used_axes = list(axes) if used_axes is None else used_axes
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(values) for values in self.axes.values())
+
+    def __getitem__(self, output: str) -> np.ndarray:
+        return self.outputs[output]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Tidy DataFrame with one row per scenario: grid values followed by the outputs"""
+        index = np.indices(self.shape).reshape(len(self.shape), -1)
+        columns = {name: values[index[i]] for i, (name, values) in enumerate(self.axes.items())}
+        for output, values in self.outputs.items():
+            # Outputs named like a swept feature (price_change) get a prefix
+            columns[f"predicted_{output}" if output in columns else output] = values.ravel()
+        return pd.DataFrame(columns)
+
+    def heatmap(self, x: str, y: str, value: str = 'up_probability', reduce: str = 'mean') -> pd.DataFrame:
+        """
+        2-D view of one output over two grid axes
+
+        Remaining axes are collapsed with ``reduce`` (mean, min, max or std).
+        Rows are the ``y`` values, columns the ``x`` values.
+        """
+        names = list(self.axes)
+        if x not in names or y not in names or x == y:
+            raise ValueError(f"x and y must be two different grid axes: {names}")
+        if value not in self.outputs:
+            raise ValueError(f"Unknown output '{value}'. Choose from {list(self.outputs)}")
+
+        data = self.outputs[value].astype(np.float64)
+        other = tuple(i for i, name in enumerate(names) if name not in (x, y))
+        if other:
+            data = getattr(np, reduce)(data, axis=other)
+
+        # Remaining axes are in grid order; put y on rows
+        if names.index(x) < names.index(y):
+            data = data.T
+
+        return pd.DataFrame(
+            data,
+            index=pd.Index(self.axes[y], name=y),
+            columns=pd.Index(self.axes[x], name=x)
+        )
+
+
+class ScenarioAnalyzer:
+    """
+    Score a grid of feature overrides against one base feature row
+
+    The base row (latest history plus news and API features) is broadcast
+    into a reusable chunk buffer, grid columns are filled by fancy indexing
+    from ``np.unravel_index`` of the flat scenario range, and each chunk goes
+    through the batch predictor. Memory stays at one chunk of features plus
+    the output arrays, whatever the grid size.
+    """
+
+    def __init__(self, predictor: PricePredictor, feature_names: List[str], chunk_size: Optional[int] = None):
+        self.predictor = predictor
+        self.feature_names = list(feature_names)
+        self.chunk_size = chunk_size or Config.SCENARIO_CHUNK_SIZE
+
+    @timed('core.scenarios.run')
+    def run(self, base_row: np.ndarray, grid: Dict[str, Sequence[float]]) -> ScenarioResult:
+        """
+        Score every combination of grid values
+
+        Args:
+            base_row: Feature row (1 x n_features) the grid is applied to
+            grid: Feature name -> values to sweep, e.g. {'rsi_14': np.linspace(20, 80, 100)};
+                at least one must be among the models' selected features
+        """
+        if not grid:
+            raise ValueError("Scenario grid is empty")
+
+        unknown = [name for name in grid if name not in self.feature_names]
+        if unknown:
+            raise ValueError(f"Unknown grid features {unknown}. Choose from {self.feature_names}")
+
+        # Features dropped by feature selection do not reach the models
+        selected = self.predictor.selected_features or self.feature_names
+        used_axes = [name for name in grid if name in selected]
+        unused = [name for name in grid if name not in selected]
+        if not used_axes:
+            raise ValueError(f"None of the grid features {unused} are used by the models. Choose from {selected}")
+        if unused:
+            print(f"Grid features {unused} are not used by the models; outputs are flat along them")
+
+        base_row = np.asarray(base_row, dtype=np.float64).reshape(-1)
+        axes = {name: np.asarray(values, dtype=np.float64).reshape(-1) for name, values in grid.items()}
+        columns = [self.feature_names.index(name) for name in axes]
+        shape = tuple(len(values) for values in axes.values())
+        total = int(np.prod(shape))
+
+        outputs = {
+            'direction': np.empty(total, dtype=np.int8),
+            'up_probability': np.empty(total, dtype=np.float64),
+            'confidence': np.empty(total, dtype=np.float64),
+            'price_change': np.empty(total, dtype=np.float64)
+        }
+
+        buffer = np.empty((min(self.chunk_size, total), len(base_row)), dtype=np.float64)
+        for start in range(0, total, self.chunk_size):
+            stop = min(start + self.chunk_size, total)
+            block = buffer[:stop - start]
+            block[:] = base_row
+
+            index = np.unravel_index(np.arange(start, stop), shape)
+            for column, values, axis_index in zip(columns, axes.values(), index):
+                block[:, column] = values[axis_index]
+
+            scores = self.predictor.predict_batch(block)
+            for output in OUTPUTS:
+                outputs[output][start:stop] = scores[output]
+
+        return ScenarioResult(
+            axes,
+            {output: values.reshape(shape) for output, values in outputs.items()},
+            base_row,
+            used_axes
+        )
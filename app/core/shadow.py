@@ -0,0 +1,201 @@
+"""
+Shadow evaluation of candidate models on live prediction traffic
+"""
+
+import os
+import sys
+import queue
+import atexit
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Dict, Callable
+
+from app.config import Config
+from app.models import PricePredictor
+from app.core.prediction_journal import PredictionJournal
+from app.core.accuracy_tracker import AccuracyTracker
+
+
+class ShadowEvaluator:
+    """
+    Scores every production request with candidate models, off the request path
+
+    ``submit`` only enqueues the production result and its inputs; a daemon
+    worker runs each shadow model on them, journals the shadow's output under
+    ``<journal_dir>/<name>/`` with the production timestamp (so both
+    journals join on it) and counts how often the shadow agrees with
+    production. Realized accuracy comes from an ``AccuracyTracker`` per
+    shadow journal. The queue holds ``SHADOW_QUEUE_SIZE`` requests; when the
+    worker falls behind, new shadow work is dropped and counted rather than
+    slowing production down. On Linux the worker thread also runs at
+    ``SHADOW_WORKER_NICE``, so it only gets CPU time production leaves idle.
+    """
+
+    def __init__(
+        self,
+        feature_builder: Callable[..., np.ndarray],
+        journal_dir: Optional[Path] = None,
+        queue_size: Optional[int] = None
+    ):
+        self.feature_builder = feature_builder
+        self.journal_dir = Path(journal_dir) if journal_dir else None
+        self.shadows: Dict[str, PricePredictor] = {}
+        self._journals: Dict[str, PredictionJournal] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or Config.SHADOW_QUEUE_SIZE)
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._worker = threading.Thread(target=self._run, name='shadow-models', daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def add(self, name: str, predictor: PricePredictor):
+        """Start shadowing production with ``predictor``"""
+        journal = PredictionJournal.open(self.journal_dir / name) if self.journal_dir else None
+        if journal is not None:
+            AccuracyTracker.for_journal(journal)  # subscribe before the first record
+        with self._lock:
+            self.shadows[name] = predictor
+            self._journals[name] = journal
+            self._stats.setdefault(name, {'scored': 0, 'agreed': 0, 'abs_change_diff': 0.0})
+
+    def remove(self, name: str):
+        with self._lock:
+            self.shadows.pop(name, None)
+            self._journals.pop(name, None)
+
+    def submit(
+        self,
+        result: Dict,
+        X: np.ndarray,
+        feature_names: Optional[list],
+        processed_data: pd.DataFrame,
+        news_sentiment: Optional[Dict],
+        current_price: Optional[Dict]
+    ) -> bool:
+        """
+        Queue a production prediction for the shadows (never blocks)
+
+        Returns:
+            False if the queue was full and the request was dropped
+        """
+        if not self.shadows:
+            return True
+        try:
+            self._queue.put_nowait((result, X, feature_names, processed_data, news_sentiment, current_price))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def drain(self):
+        """Wait until every queued request has been scored"""
+        self._queue.join()
+
+    def close(self):
+        """Stop the worker; queued requests are scored first"""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=5)
+
+    def add_price(self, timestamp, price: float):
+        """Pass a realized price observation to every shadow's accuracy tracker"""
+        for journal in list(self._journals.values()):
+            if journal is not None:
+                AccuracyTracker.for_journal(journal).add_price(timestamp, price)
+
+    def report(self) -> Dict[str, Dict]:
+        """
+        Per shadow: agreement with production and realized accuracy
+
+        Returns:
+            name -> dict with version, scored, agreement (share of requests
+            with the same direction), mean_abs_change_diff, and the hit_rate
+            and mae of its resolved predictions (None without a journal)
+        """
+        with self._lock:
+            shadows = dict(self.shadows)
+            stats = {name: dict(self._stats[name]) for name in shadows}
+            journals = dict(self._journals)
+
+        report = {}
+        for name, predictor in shadows.items():
+            scored = stats[name]['scored']
+            accuracy = AccuracyTracker.for_journal(journals[name]).get_metrics() if journals[name] else {}
+            report[name] = {
+                'version': predictor.version or 'unversioned',
+                'scored': scored,
+                'agreement': stats[name]['agreed'] / scored if scored else None,
+                'mean_abs_change_diff': stats[name]['abs_change_diff'] / scored if scored else None,
+                'hit_rate': accuracy.get('hit_rate'),
+                'mae': accuracy.get('mae'),
+                'resolved': accuracy.get('scored', 0)
+            }
+        return report
+
+    def stats(self) -> Dict:
+        """Queue counters"""
+        return {
+            'shadows': len(self.shadows),
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'queued': self._queue.qsize()
+        }
+
+    def _run(self):
+        """Background worker: score queued requests with every shadow"""
+        if Config.SHADOW_WORKER_NICE and sys.platform.startswith('linux'):
+            # Linux schedules threads individually: production threads win the core under load
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), Config.SHADOW_WORKER_NICE)
+            except OSError:
+                pass
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._score(*item)
+            except Exception as e:
+                self.failed += 1
+                print(f"Shadow evaluation failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _score(self, result, X, feature_names, processed_data, news_sentiment, current_price):
+        with self._lock:
+            shadows = list(self.shadows.items())
+        for name, predictor in shadows:
+            # Reuse the production vector when the shadow uses the same features
+            if predictor.selected_features == feature_names:
+                X_shadow = X
+            else:
+                X_shadow = self.feature_builder(
+                    processed_data,
+                    news_sentiment=news_sentiment,
+                    current_api_price=current_price,
+                    feature_names=predictor.selected_features
+                )
+            prediction = predictor.predict(X_shadow)
+
+            journal = self._journals.get(name)
+            if journal is not None:
+                journal.append({
+                    **prediction,
+                    'timestamp': result.get('timestamp'),
+                    'current_price': result.get('current_price'),
+                    'model_version': predictor.version or 'unversioned'
+                }, X_shadow, predictor.selected_features)
+
+            with self._lock:
+                stats = self._stats[name]
+                stats['scored'] += 1
+                stats['agreed'] += int(prediction['direction'] == result.get('direction'))
+                stats['abs_change_diff'] += abs(prediction['price_change'] - result.get('price_change', 0.0))
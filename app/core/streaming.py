@@ -0,0 +1,247 @@
+"""
+Streaming predictions: one prediction per price tick
+"""
+
+import json
+import time
+import queue
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Optional, Dict, Iterable
+
+from app.config import Config
+from app.features import FeatureEngineer
+from app.features.feature_engineering import NEWS_FEATURES, API_FEATURES
+from app.features.incremental import IncrementalPriceFeatures
+from app.features.resampling import to_nanoseconds
+from app.utils.instrumentation import StageHistogram, timed
+
+
+class StreamingPredictor:
+    """
+    Predicts on every tick of a price stream
+
+    A reader thread pulls ticks from ``source`` (any iterable of GoldAPI
+    price dicts, e.g. ``ReplayTickSource`` or ``PollingTickSource``) into a
+    bounded queue. The prediction loop takes whatever has arrived, up to
+    ``STREAM_BATCH_SIZE`` ticks: each tick updates the live bar's price
+    features incrementally (``IncrementalPriceFeatures``; a tick in a later
+    bar of the feature engineer's calendar, or a later ``STREAM_BAR_SECONDS``
+    period without one, closes the bar first), and the whole batch
+    goes through the models in one ``predict_batch`` call. A slow stream is
+    predicted tick by tick; a fast one in larger batches, so throughput
+    grows with load instead of lag.
+
+    Results are put on ``output`` (a queue; dropped and counted when full)
+    and/or appended to ``output_path`` as JSON lines, one write per batch.
+    Each result carries ``lag_ms``: time from the tick leaving the source
+    to its prediction being emitted.
+    """
+
+    def __init__(
+        self,
+        predictor_provider,
+        processed_data,
+        source: Iterable[Dict],
+        feature_engineer: Optional[FeatureEngineer] = None,
+        news_sentiment: Optional[Dict] = None,
+        output: Optional[queue.Queue] = None,
+        output_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        symbol: Optional[str] = None
+    ):
+        """
+        Args:
+            predictor_provider: Callable returning the predictor to use for
+                the next batch (so hot-swapped model versions are picked up)
+            processed_data: Processed history the live bar extends
+        """
+        self.predictor_provider = predictor_provider
+        self.source = source
+        self.feature_engineer = feature_engineer or FeatureEngineer()
+        self.output = output
+        self.output_path = Path(output_path) if output_path else None
+        self.batch_size = batch_size or Config.STREAM_BATCH_SIZE
+        self.symbol = symbol or Config.DEFAULT_SYMBOL
+        self.bar_seconds = Config.STREAM_BAR_SECONDS
+        self.calendar = self.feature_engineer.calendar
+        self.set_news(news_sentiment)
+
+        # Ticks in the period of the last history row update that row's bar instead of adding one
+        self._bar: Optional[int] = self._history_bar(processed_data)
+        self.features = IncrementalPriceFeatures(
+            processed_data, self.feature_engineer.indicators, open_last=self._bar is not None
+        )
+
+        self._ticks: queue.Queue = queue.Queue(maxsize=queue_size or Config.STREAM_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self.lag = StageHistogram()
+        self.ticks = 0
+        self.batches = 0
+        self.dropped = 0
+        self.elapsed = 0.0
+
+    def set_news(self, news_sentiment: Optional[Dict]):
+        """News impact applied to every following tick"""
+        self._news = {
+            feature: float(news_sentiment.get(key, 0.0)) if news_sentiment else 0.0
+            for feature, key in NEWS_FEATURES.items()
+        }
+
+    def stop(self):
+        """Stop after the current batch"""
+        self._stop.set()
+
+    def run(self, max_ticks: Optional[int] = None, duration: Optional[float] = None) -> Dict:
+        """
+        Predict until the source ends, ``max_ticks`` ticks or ``duration`` seconds
+
+        Returns:
+            ``stats()`` of the run
+        """
+        reader = threading.Thread(target=self._read, name='stream-ticks', daemon=True)
+        reader.start()
+        out = self.output_path.open('a', encoding='utf-8') if self.output_path else None
+        deadline = time.perf_counter() + duration if duration else None
+        start = time.perf_counter()
+        try:
+            done = False
+            while not done and not self._stop.is_set():
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                try:
+                    tick = self._ticks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                batch = []
+                limit = self.batch_size if max_ticks is None else min(self.batch_size, max_ticks - self.ticks)
+                while tick is not None:
+                    batch.append(tick)
+                    if len(batch) >= limit:
+                        break
+                    try:
+                        tick = self._ticks.get_nowait()
+                    except queue.Empty:
+                        break
+                done = tick is None or (max_ticks is not None and self.ticks + len(batch) >= max_ticks)
+                if batch:
+                    self._emit(self._predict(batch), out)
+        finally:
+            self.elapsed += time.perf_counter() - start
+            self._stop.set()
+            if out is not None:
+                out.close()
+        return self.stats()
+
+    def _read(self):
+        """Reader thread: move ticks from the source into the queue (None at the end)"""
+        try:
+            for tick in self.source:
+                while not self._stop.is_set():
+                    try:
+                        self._ticks.put(tick, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    return
+        finally:
+            try:
+                self._ticks.put(None, timeout=1)
+            except queue.Full:
+                pass
+
+    def _bars(self, times_ns: np.ndarray) -> list:
+        """Bar index of each timestamp: the calendar's, or ``STREAM_BAR_SECONDS`` periods"""
+        if self.calendar is not None:
+            return self.calendar.bars(times_ns).tolist()
+        return (times_ns // (self.bar_seconds * 10**9)).tolist()
+
+    def _history_bar(self, processed_data) -> Optional[int]:
+        """Bar of the last history row (None without timestamps)"""
+        date_col = self.feature_engineer.get_date_column(processed_data)
+        if date_col is None or len(processed_data) < 2:
+            return None
+        times_ns = to_nanoseconds(processed_data[date_col].iloc[-1:])
+        if times_ns[0] == np.iinfo(np.int64).min:
+            return None
+        return int(self._bars(times_ns)[0])
+
+    @timed('stream.predict')
+    def _predict(self, batch) -> list:
+        predictor = self.predictor_provider()
+        names = predictor.selected_features or self.feature_engineer.get_feature_names()
+
+        X = np.empty((len(batch), len(names)))
+        news = self._news
+        now = time.time()
+        stamps = [tick.get('price_timestamp_unix') or now for tick in batch]
+        bars = self._bars(np.round(np.array(stamps, dtype=np.float64) * 1e9).astype(np.int64))
+        for i, (tick, bar) in enumerate(zip(batch, bars)):
+            if self._bar is not None and bar > self._bar:
+                self.features.commit()
+            if self._bar is None or bar > self._bar:
+                self._bar = bar
+            values = self.features.update(tick['current_price'])
+            values.update(news)
+            for feature, key in API_FEATURES.items():
+                values[feature] = tick.get(key, 0.0)
+            X[i] = [values.get(name, 0.0) for name in names]
+        np.nan_to_num(X, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+        predictions = predictor.predict_batch(X)
+        version = predictor.version or 'unversioned'
+        direction = predictions['direction'].tolist()
+        confidence = predictions['confidence'].tolist()
+        up_probability = predictions['up_probability'].tolist()
+        price_change = predictions['price_change'].tolist()
+        return [
+            {
+                'symbol': self.symbol,
+                'price_timestamp_unix': tick.get('price_timestamp_unix'),
+                'current_price': tick['current_price'],
+                'direction': 'UP' if direction[i] == 1 else 'DOWN',
+                'confidence': confidence[i],
+                'up_probability': up_probability[i],
+                'price_change': price_change[i],
+                'model_version': version,
+                'tick_time': tick.get('tick_time')
+            }
+            for i, tick in enumerate(batch)
+        ]
+
+    def _emit(self, results: list, out):
+        now = time.perf_counter()
+        for result in results:
+            tick_time = result.pop('tick_time')
+            if tick_time is not None:
+                lag = now - tick_time
+                result['lag_ms'] = lag * 1000
+                self.lag.observe(lag)
+        if out is not None:
+            out.write(''.join(json.dumps(result) + '\n' for result in results))
+            out.flush()
+        if self.output is not None:
+            for result in results:
+                try:
+                    self.output.put_nowait(result)
+                except queue.Full:
+                    self.dropped += 1
+        self.ticks += len(results)
+        self.batches += 1
+
+    def stats(self) -> Dict:
+        """Ticks, throughput, batch sizes and end-to-end lag percentiles (ms)"""
+        return {
+            'ticks': self.ticks,
+            'batches': self.batches,
+            'mean_batch': self.ticks / self.batches if self.batches else 0.0,
+            'ticks_per_second': self.ticks / self.elapsed if self.elapsed else 0.0,
+            'lag_p50_ms': self.lag.quantile(0.5) * 1000,
+            'lag_p99_ms': self.lag.quantile(0.99) * 1000,
+            'lag_max_ms': self.lag.max * 1000,
+            'dropped': self.dropped,
+            'queued': self._ticks.qsize()
+        }
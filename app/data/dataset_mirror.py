@@ -0,0 +1,228 @@
+"""
+Local, versioned mirror of the historical price dataset
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, List
+
+from app.config import Config
+
+
+def _is_text(values) -> bool:
+    return pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+
+def _encode(df: pd.DataFrame):
+    """
+    Columns as plain numpy arrays (strings as fixed-width unicode) plus the metadata to restore them
+
+    Numpy numeric/datetime columns, string columns (``str`` dtype or object
+    columns holding only strings), categoricals with numeric or string
+    categories and timezone-aware datetimes are supported; any other column
+    raises ``ValueError`` rather than being stored in a lossy form.
+    """
+    arrays = {}
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+            arrays[f'c{i}'] = series.to_numpy()
+            columns.append({'name': name, 'kind': 'numpy'})
+        elif isinstance(dtype, pd.StringDtype) or (dtype == object and _is_text(series)):
+            missing = series.isna().to_numpy()
+            arrays[f'c{i}'] = series.where(~missing, '').to_numpy(dtype=str)
+            if missing.any():
+                arrays[f'm{i}'] = missing
+            columns.append({'name': name, 'kind': 'string'})
+        elif isinstance(dtype, pd.CategoricalDtype):
+            categories = dtype.categories
+            if isinstance(categories.dtype, np.dtype) and categories.dtype.kind in 'biufcmM':
+                arrays[f'k{i}'] = categories.to_numpy()
+            elif _is_text(categories):
+                arrays[f'k{i}'] = categories.to_numpy(dtype=str)
+            else:
+                raise ValueError(f"column {name!r} has unsupported categories of dtype {categories.dtype}")
+            arrays[f'c{i}'] = series.cat.codes.to_numpy()
+            columns.append({'name': name, 'kind': 'category', 'ordered': bool(dtype.ordered)})
+        elif isinstance(dtype, pd.DatetimeTZDtype):
+            tz = str(dtype.tz)
+            try:
+                pd.Timestamp(0, tz=tz)
+            except Exception:
+                raise ValueError(f"column {name!r} has a timezone that cannot be restored by name: {tz}")
+            arrays[f'c{i}'] = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+            columns.append({'name': name, 'kind': 'datetimetz', 'tz': tz})
+        else:
+            raise ValueError(f"column {name!r} has unsupported dtype {dtype}")
+    return arrays, columns
+
+
+def _decode(arrays, columns: List[Dict], index: List[str]) -> pd.DataFrame:
+    data = {}
+    for i, column in enumerate(columns):
+        values = arrays[f'c{i}']
+        if column['kind'] == 'string':
+            series = pd.Series(values)
+            if f'm{i}' in arrays:
+                series[arrays[f'm{i}']] = np.nan
+            data[column['name']] = series
+        elif column['kind'] == 'category':
+            data[column['name']] = pd.Categorical.from_codes(values, arrays[f'k{i}'], ordered=column['ordered'])
+        elif column['kind'] == 'datetimetz':
+            data[column['name']] = pd.Series(values).dt.tz_localize('UTC').dt.tz_convert(column['tz'])
+        else:
+            data[column['name']] = values
+    df = pd.DataFrame(data)
+    return df.set_index(index) if index else df
+
+
+def _content_hash(arrays: Dict[str, np.ndarray], columns: List[Dict]) -> str:
+    digest = hashlib.sha256(json.dumps(columns, sort_keys=True).encode())
+    for key in sorted(arrays):
+        array = np.ascontiguousarray(arrays[key])
+        digest.update(str((key, array.dtype.str, array.shape)).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class DatasetMirror:
+    """
+    Wraps a history fetcher (anything with ``get_data()``) with a local mirror
+
+    The parsed dataset is stored column by column in an uncompressed ``.npz``
+    file under ``<DATASET_MIRROR_DIR>/<name>/<version>.npz``, where the
+    version is ``YYYYmmdd-HHMMSS-<content hash>``. A ``CURRENT.json`` pointer
+    (replaced atomically) names the current version and when upstream was
+    last checked. Upstream is only contacted once ``DATASET_REFRESH_INTERVAL``
+    hours have passed since that check, when ``source`` (an identity of the
+    upstream, e.g. file path and mtime) differs from the mirrored one, or on
+    ``refresh()``; otherwise ``get_data()`` is a single file read. A refresh
+    that returns the same content keeps the version and only moves the check
+    time. If upstream fails, the mirrored version is served as is.
+    """
+
+    def __init__(
+        self,
+        upstream,
+        name: str,
+        mirror_dir: Optional[Path] = None,
+        refresh_interval: Optional[float] = None,
+        source: Optional[str] = None
+    ):
+        self.upstream = upstream
+        self.name = name
+        self.source = source
+        self.directory = Path(mirror_dir or Config.DATASET_MIRROR_DIR) / name
+        self.pointer_path = self.directory / "CURRENT.json"
+        self.refresh_interval = Config.DATASET_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+
+    def get_data(self) -> pd.DataFrame:
+        """The mirrored dataset, refreshed from upstream first when it is due"""
+        pointer = self._read_pointer()
+        if pointer and not self._refresh_due(pointer):
+            try:
+                return self._load(pointer['version'])
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Dataset mirror {self.name} unreadable ({e}), fetching upstream...")
+        return self.refresh()
+
+    def refresh(self) -> pd.DataFrame:
+        """Fetch upstream now and store it as a new version if its content changed"""
+        pointer = self._read_pointer()
+        try:
+            df = self.upstream.get_data()
+        except Exception as e:
+            if not pointer:
+                raise
+            print(f"Dataset refresh for {self.name} failed ({e}), using mirrored version {pointer['version']}")
+            return self._load(pointer['version'])
+
+        index = [name for name in df.index.names if name is not None]
+        stored = df.reset_index() if index else df.reset_index(drop=True)
+        try:
+            arrays, columns = _encode(stored)
+        except ValueError as e:
+            print(f"Dataset {self.name} cannot be mirrored ({e}), serving it from upstream")
+            return df
+        content_hash = _content_hash(arrays, columns)
+
+        if pointer.get('content_hash') == content_hash and (self.directory / f"{pointer['version']}.npz").exists():
+            self._write_pointer({**pointer, 'source': self.source, 'checked_at': time.time()})
+            return df
+
+        now = datetime.now()
+        version = f"{now:%Y%m%d-%H%M%S}-{content_hash[:8]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f".{version}-{uuid.uuid4().hex}.npz"
+        try:
+            meta = json.dumps({'columns': columns, 'index': index})
+            np.savez(tmp, __meta__=np.array(meta), **arrays)
+            with open(tmp, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp, self.directory / f"{version}.npz")
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        self._write_pointer({
+            'version': version,
+            'source': self.source,
+            'content_hash': content_hash,
+            'rows': len(stored),
+            'columns': [column['name'] for column in columns],
+            'fetched_at': now.isoformat(),
+            'checked_at': time.time(),
+            'previous': pointer.get('version')
+        })
+        self.prune()
+        print(f"Mirrored {len(stored):,} rows of {self.name} as version {version}")
+        return df
+
+    def current_version(self) -> Optional[str]:
+        return self._read_pointer().get('version')
+
+    def list_versions(self) -> List[str]:
+        """Mirrored versions, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(path.stem for path in self.directory.glob("*.npz") if not path.name.startswith('.'))
+
+    def prune(self, keep: Optional[int] = None):
+        """Delete the oldest versions beyond ``keep``, never the current one"""
+        keep = keep or Config.DATASET_MIRROR_KEEP
+        current = self.current_version()
+        versions = self.list_versions()
+        for version in versions[:max(0, len(versions) - keep)]:
+            if version != current:
+                (self.directory / f"{version}.npz").unlink(missing_ok=True)
+
+    def _load(self, version: str) -> pd.DataFrame:
+        with np.load(self.directory / f"{version}.npz", allow_pickle=False) as arrays:
+            meta = json.loads(arrays['__meta__'].item())
+            return _decode(arrays, meta['columns'], meta['index'])
+
+    def _refresh_due(self, pointer: Dict) -> bool:
+        if pointer.get('source') != self.source:
+            return True
+        return time.time() - pointer.get('checked_at', 0.0) >= self.refresh_interval * 3600
+
+    def _read_pointer(self) -> Dict:
+        try:
+            return json.loads(self.pointer_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_pointer(self, pointer: Dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.pointer_path.with_name(f".CURRENT-{uuid.uuid4().hex}.json")
+        tmp.write_text(json.dumps(pointer, indent=2))
+        os.replace(tmp, self.pointer_path)
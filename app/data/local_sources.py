@@ -0,0 +1,579 @@
+"""
+Offline stand-ins for Kaggle, GoldAPI.io and Google News RSS
+
+Backends are selected in ``Config`` (``KAGGLE_SOURCE``, ``GOLDAPI_SOURCE``,
+``NEWS_SOURCE``) and built by ``create_data_sources``:
+
+- ``LocalKaggleDataFetcher`` reads the dataset from a local CSV file (also
+  the history source for symbols other than ``Config.DEFAULT_SYMBOL``)
+- ``ReplayGoldAPIServer`` serves recorded (or synthetic) ticks in the
+  GoldAPI.io response format at a configurable rate; ``ReplayGoldAPIClient``
+  queries it without the free-tier rate limit
+- ``LocalRSSServer`` serves Google News style RSS search results;
+  ``LocalNewsFetcher`` reads and scores them without the live
+  ``NewsFetcher`` (``redirect_google_news`` points feedparser requests at
+  the server instead, for the live fetcher)
+
+Run ``python -m app.data.local_sources --init`` once to write synthetic data
+files, then ``python -m app.data.local_sources`` to serve them standalone.
+"""
+
+import json
+import time
+import zlib
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+import requests
+from pathlib import Path
+from datetime import datetime
+from email.utils import formatdate
+from urllib.parse import urlparse, parse_qs, quote
+from xml.sax.saxutils import escape
+from xml.etree import ElementTree
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Tuple
+
+from app.config import Config
+
+
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss"
+TROY_OUNCE_GRAMS = 31.1034768
+
+# Synthetic price level of each metal relative to the gold tape
+METAL_PRICE_SCALE = {'XAU': 1.0, 'XAG': 0.0125, 'XPT': 0.5, 'XPD': 0.5}
+
+# Search queries LocalNewsFetcher sends to the local RSS server
+LOCAL_NEWS_QUERIES = ["gold price", "gold market", "federal reserve gold", "inflation gold", "central bank gold"]
+
+SYNTHETIC_HEADLINES = [
+    ("Gold prices surge as inflation fears rise", "Investors seek a hedge as consumer prices climb."),
+    ("Gold falls as the dollar strengthens after rate hike", "A stronger dollar weighs on precious metals."),
+    ("Central bank buying lifts gold demand", "Official sector purchases hit a multi-year high."),
+    ("Gold slides as stock market rally reduces safe haven demand", "Risk-on sentiment pulls money out of bullion."),
+    ("Geopolitical conflict drives investors to gold", "Uncertainty over sanctions supports prices."),
+    ("Gold retreats from record high on profit taking", "Traders lock in gains after a strong week."),
+    ("Recession worries boost precious metals", "Economic downturn fears support safe haven assets."),
+    ("Gold steady ahead of Federal Reserve decision", "Markets await guidance on interest rates."),
+]
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    """Request handler with HTTP/1.1 keep-alive and no per-request logging"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ----------------------------------------------------------------------
+# Kaggle
+# ----------------------------------------------------------------------
+
+class LocalKaggleDataFetcher:
+    """Kaggle dataset read from a local CSV file instead of kagglehub"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Config.LOCAL_KAGGLE_PATH)
+
+    def get_data(self) -> pd.DataFrame:
+        """Load the dataset from the local file"""
+        if not self.path.exists():
+            raise FileNotFoundError(
+                f"Local dataset not found at {self.path}. "
+                "Run 'python -m app.data.local_sources --init' to create a synthetic one."
+            )
+        return pd.read_csv(self.path)
+
+    def source_id(self) -> str:
+        """Path and modification time, so a rewritten file invalidates any mirrored copy"""
+        try:
+            return f"{self.path.resolve()}@{self.path.stat().st_mtime_ns}"
+        except FileNotFoundError:
+            return str(self.path.resolve())
+
+
+def make_synthetic_prices(
+    n_rows: int = 5000,
+    seed: int = 42,
+    start: str = "2005-01-03",
+    start_price: float = 600.0
+) -> pd.DataFrame:
+    """Business-day OHLCV history shaped like the Kaggle gold dataset"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n_rows)))
+    open_ = close * (1 + rng.normal(0, 0.003, n_rows))
+    spread = np.abs(rng.normal(0, 0.005, n_rows)) * close
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=n_rows).strftime('%Y-%m-%d'),
+        'Open': open_.round(2),
+        'High': (np.maximum(open_, close) + spread).round(2),
+        'Low': (np.minimum(open_, close) - spread).round(2),
+        'Close': close.round(2),
+        'Adj Close': close.round(2),
+        'Volume': rng.integers(1_000, 100_000, n_rows)
+    })
+
+
+# ----------------------------------------------------------------------
+# GoldAPI replay
+# ----------------------------------------------------------------------
+
+def make_synthetic_ticks(n_ticks: int = 100_000, seed: int = 42, start_price: float = 2000.0) -> pd.DataFrame:
+    """Intraday tick stream (one tick per second) for the replay server"""
+    rng = np.random.default_rng(seed)
+    price = start_price + np.cumsum(rng.normal(0, 0.25, n_ticks))
+    start = int(datetime(2024, 1, 2).timestamp())
+    return pd.DataFrame({
+        'timestamp': start + np.arange(n_ticks),
+        'price': price.round(2)
+    })
+
+
+class _TickTape:
+    """GoldAPI.io response bodies for a tick stream, rendered on demand"""
+
+    def __init__(self, ticks: pd.DataFrame, metal: str, currency: str):
+        self.metal = metal
+        self.currency = currency
+        scale = METAL_PRICE_SCALE.get(metal, 1.0)
+        self.price = ticks['price'].to_numpy(dtype=float) * scale
+        self.timestamps = ticks['timestamp'].to_numpy(dtype=np.int64)
+        self.open_price = float(ticks['open_price'].iloc[0]) * scale if 'open_price' in ticks else float(self.price[0])
+        self.prev_close = float(ticks['prev_close_price'].iloc[0]) * scale if 'prev_close_price' in ticks else self.open_price
+        self.high = ticks['high_price'].to_numpy(dtype=float) * scale if 'high_price' in ticks else np.maximum.accumulate(self.price)
+        self.low = ticks['low_price'].to_numpy(dtype=float) * scale if 'low_price' in ticks else np.minimum.accumulate(self.price)
+        self.bid = ticks['bid'].to_numpy(dtype=float) * scale if 'bid' in ticks else self.price - 0.25 * scale
+        self.ask = ticks['ask'].to_numpy(dtype=float) * scale if 'ask' in ticks else self.price + 0.25 * scale
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def body(self, i: int) -> bytes:
+        price = float(self.price[i])
+        change = price - self.prev_close
+        return json.dumps({
+            'timestamp': int(self.timestamps[i]),
+            'metal': self.metal,
+            'currency': self.currency,
+            'exchange': 'REPLAY',
+            'symbol': f'REPLAY:{self.metal}{self.currency}',
+            'prev_close_price': round(self.prev_close, 2),
+            'open_price': round(self.open_price, 2),
+            'low_price': round(float(self.low[i]), 2),
+            'high_price': round(float(self.high[i]), 2),
+            'open_time': int(self.timestamps[0]),
+            'price': round(price, 2),
+            'ch': round(change, 2),
+            'chp': round(change / self.prev_close * 100, 4),
+            'ask': round(float(self.ask[i]), 2),
+            'bid': round(float(self.bid[i]), 2),
+            'price_gram_24k': round(price / TROY_OUNCE_GRAMS, 4),
+            'price_gram_18k': round(price / TROY_OUNCE_GRAMS * 0.75, 4)
+        }).encode('utf-8')
+
+
+class ReplayGoldAPIServer:
+    """
+    Local HTTP server answering ``/api/<METAL>/<CURRENCY>`` like GoldAPI.io
+
+    With ``tick_rate`` > 0 the tape advances with wall-clock time at that many
+    ticks per second; with ``tick_rate`` == 0 every request gets the next tick
+    of its symbol, so a load test sees the same sequence on every run.
+    """
+
+    def __init__(
+        self,
+        ticks: Optional[pd.DataFrame] = None,
+        port: Optional[int] = None,
+        tick_rate: Optional[float] = None,
+        host: str = '127.0.0.1'
+    ):
+        if ticks is None:
+            ticks = load_ticks(Config.REPLAY_TICKS_PATH)
+        self.ticks = ticks
+        self.tick_rate = Config.REPLAY_TICK_RATE if tick_rate is None else tick_rate
+        self._tapes: Dict[Tuple[str, str], _TickTape] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+        server = self
+
+        class Handler(_QuietHandler):
+            def do_GET(self):
+                parts = urlparse(self.path).path.strip('/').split('/')
+                if len(parts) != 3 or parts[0] != 'api':
+                    self.send_error(404)
+                    return
+                body = server.next_response(parts[1].upper(), parts[2].upper())
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('X-Ratelimit-Limit', '1000000')
+                self.send_header('X-Ratelimit-Remaining', '1000000')
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port if port is not None else Config.REPLAY_GOLDAPI_PORT), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def next_response(self, metal: str, currency: str) -> bytes:
+        """Body for the current tick of a symbol"""
+        tape = self._tapes.get((metal, currency))
+        if tape is None:
+            with self._lock:
+                tape = self._tapes.setdefault((metal, currency), _TickTape(self.ticks, metal, currency))
+
+        if self.tick_rate > 0:
+            index = int((time.monotonic() - self._started) * self.tick_rate)
+        else:
+            with self._lock:
+                index = self._counters.get((metal, currency), 0)
+                self._counters[(metal, currency)] = index + 1
+        return tape.body(index % len(tape))
+
+    def start(self) -> "ReplayGoldAPIServer":
+        """Serve in a background thread"""
+        threading.Thread(target=self.httpd.serve_forever, name='replay-goldapi', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class ReplayGoldAPIClient:
+    """GoldAPI client for the replay server: same result dict, no rate limiting"""
+
+    def __init__(self, base_url: Optional[str] = None, metal: str = 'XAU', currency: str = 'USD'):
+        self.url = f"{(base_url or Config.REPLAY_GOLDAPI_URL).rstrip('/')}/{metal}/{currency}"
+        self.session = requests.Session()
+
+    def get_current_price(self) -> Dict:
+        """Fetch the current replayed tick"""
+        try:
+            response = self.session.get(self.url, timeout=5)
+            response.raise_for_status()
+            return parse_goldapi_response(response.json(), source='replay')
+        except (requests.RequestException, ValueError) as e:
+            return {
+                'current_price': None,
+                'source': 'error',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+
+
+def parse_goldapi_response(data: Dict, source: str = 'goldapi.io') -> Dict:
+    """Map a GoldAPI.io JSON body to the price dict used throughout the app"""
+    timestamp_unix = int(data.get('timestamp', time.time()))
+    return {
+        'current_price': float(data.get('price', 0)) or None,
+        'source': source,
+        'timestamp': datetime.now().isoformat(),
+        'price_timestamp': datetime.fromtimestamp(timestamp_unix).isoformat(),
+        'price_timestamp_unix': timestamp_unix,
+        'bid': float(data.get('bid', 0)),
+        'ask': float(data.get('ask', 0)),
+        'high_price': float(data.get('high_price', 0)),
+        'low_price': float(data.get('low_price', 0)),
+        'open_price': float(data.get('open_price', 0)),
+        'prev_close_price': float(data.get('prev_close_price', 0)),
+        'price_change': float(data.get('ch', 0)),
+        'price_change_pct': float(data.get('chp', 0)),
+        'exchange': data.get('exchange', 'N/A'),
+        'symbol': data.get('symbol', 'N/A'),
+        'metal': data.get('metal', 'XAU'),
+        'currency': data.get('currency', 'USD'),
+        'price_gram_24k': float(data.get('price_gram_24k', 0)),
+        'price_gram_18k': float(data.get('price_gram_18k', 0))
+    }
+
+
+def load_ticks(path: Optional[Path]) -> pd.DataFrame:
+    """Recorded ticks from CSV (needs ``timestamp`` and ``price``), else a synthetic tape"""
+    if path is not None and Path(path).exists():
+        return pd.read_csv(path)
+    return make_synthetic_ticks()
+
+
+# ----------------------------------------------------------------------
+# Google News RSS
+# ----------------------------------------------------------------------
+
+class LocalRSSServer:
+    """
+    Local HTTP server answering ``/rss/search?q=...`` with RSS 2.0 feeds
+
+    A query is served from ``<feeds_dir>/<query>.xml`` when a recorded feed
+    exists, otherwise from deterministic synthetic articles seeded by the query.
+    Rendered feeds are cached, so repeated queries cost one dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        feeds_dir: Optional[Path] = None,
+        port: Optional[int] = None,
+        items_per_feed: Optional[int] = None,
+        host: str = '127.0.0.1'
+    ):
+        self.feeds_dir = Path(feeds_dir or Config.LOCAL_RSS_FEEDS_DIR)
+        self.items_per_feed = items_per_feed or Config.LOCAL_RSS_ITEMS_PER_FEED
+        self._cache: Dict[str, bytes] = {}
+
+        server = self
+
+        class Handler(_QuietHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.rstrip('/') != '/rss/search':
+                    self.send_error(404)
+                    return
+                query = parse_qs(url.query).get('q', [''])[0]
+                body = server.feed_for(query)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port if port is not None else Config.LOCAL_RSS_PORT), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/rss"
+
+    def feed_for(self, query: str) -> bytes:
+        """RSS document for a search query"""
+        body = self._cache.get(query)
+        if body is None:
+            recorded = self.feeds_dir / f"{quote(query, safe='')}.xml"
+            body = recorded.read_bytes() if recorded.exists() else render_rss(query, self.items_per_feed)
+            self._cache[query] = body
+        return body
+
+    def start(self) -> "LocalRSSServer":
+        """Serve in a background thread"""
+        threading.Thread(target=self.httpd.serve_forever, name='local-rss', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def render_rss(query: str, n_items: int) -> bytes:
+    """Deterministic synthetic RSS search results for a query"""
+    rng = np.random.default_rng(zlib.crc32(query.encode('utf-8')))
+    base_time = datetime(2024, 1, 1).timestamp()
+    items = []
+    for i in range(n_items):
+        title, summary = SYNTHETIC_HEADLINES[rng.integers(len(SYNTHETIC_HEADLINES))]
+        published = formatdate(base_time + float(rng.integers(0, 86400 * 30)), usegmt=True)
+        items.append(
+            f"<item><title>{escape(title)} - Source {i}</title>"
+            f"<link>https://news.example.com/{zlib.crc32(query.encode('utf-8'))}/{i}</link>"
+            f"<pubDate>{published}</pubDate>"
+            f"<description>{escape(summary)}</description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f'<title>"{escape(query)}" - Local News</title>'
+        + ''.join(items) +
+        '</channel></rss>'
+    ).encode('utf-8')
+
+
+class LocalNewsFetcher:
+    """
+    News backend reading the local RSS server, with no live NewsFetcher import
+
+    Articles come back in the frame shape of the live fetcher (title,
+    summary, published, link, full_text, sentiment, price_indicator), deduped
+    by link; scoring and ``analyze_news_impact`` use ``NewsScorer``.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, queries: Optional[List[str]] = None):
+        from app.features.news_scoring import NewsScorer
+
+        self.base_url = (base_url or Config.LOCAL_RSS_URL).rstrip('/')
+        self.queries = queries or LOCAL_NEWS_QUERIES
+        self.scorer = NewsScorer()
+        self.session = requests.Session()
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        """Feed entries for one search query"""
+        response = self.session.get(f"{self.base_url}/search", params={'q': query}, timeout=10)
+        response.raise_for_status()
+        entries = []
+        for item in ElementTree.fromstring(response.content).iter('item'):
+            entries.append({
+                'title': item.findtext('title', ''),
+                'summary': item.findtext('description', ''),
+                'published': item.findtext('pubDate', ''),
+                'link': item.findtext('link', '')
+            })
+            if len(entries) >= max_results:
+                break
+        return entries
+
+    def get_all_relevant_gold_news(self, max_results_per_query: int = 20) -> pd.DataFrame:
+        """Scored articles for every query"""
+        entries = [entry for query in self.queries for entry in self.search(query, max_results_per_query)]
+        if not entries:
+            return pd.DataFrame()
+        news = pd.DataFrame(entries).drop_duplicates('link', ignore_index=True)
+        news['full_text'] = news['title'] + ' ' + news['summary']
+        return self.scorer.score_frame(news)
+
+    def analyze_news_impact(self, news: pd.DataFrame) -> Dict:
+        return self.scorer.analyze_news_impact(news)
+
+
+_redirect_lock = threading.Lock()
+
+
+def redirect_google_news(base_url: str):
+    """Send feedparser requests for Google News RSS to a local server instead"""
+    import feedparser
+
+    with _redirect_lock:
+        parse = getattr(feedparser.parse, '_original', feedparser.parse)
+
+        def redirected_parse(url_file_stream_or_string, *args, **kwargs):
+            if isinstance(url_file_stream_or_string, str) and url_file_stream_or_string.startswith(GOOGLE_NEWS_RSS_URL):
+                url_file_stream_or_string = base_url.rstrip('/') + url_file_stream_or_string[len(GOOGLE_NEWS_RSS_URL):]
+            return parse(url_file_stream_or_string, *args, **kwargs)
+
+        redirected_parse._original = parse
+        feedparser.parse = redirected_parse
+
+
+# ----------------------------------------------------------------------
+# Backend selection
+# ----------------------------------------------------------------------
+
+_servers: Dict[str, object] = {}
+_servers_lock = threading.Lock()
+
+
+def start_local_servers(goldapi: bool = True, rss: bool = True) -> Dict[str, object]:
+    """Start the replay GoldAPI and local RSS servers in-process (once per process)"""
+    with _servers_lock:
+        if goldapi and 'goldapi' not in _servers:
+            _servers['goldapi'] = ReplayGoldAPIServer().start()
+        if rss and 'rss' not in _servers:
+            _servers['rss'] = LocalRSSServer().start()
+        return dict(_servers)
+
+
+def create_data_sources(symbol: Optional[str] = None) -> Tuple[object, object, object]:
+    """
+    Build the (kaggle, gold_api, news) backends selected in Config
+
+    Symbols other than ``Config.DEFAULT_SYMBOL`` read their history from
+    ``symbol_history_path`` (the Kaggle dataset is gold only) and get a
+    GoldAPI client for their own metal/currency pair. With
+    ``DATASET_MIRROR_ENABLED`` the history fetcher is wrapped in a
+    ``DatasetMirror``, so upstream is only read on its refresh schedule.
+    """
+    from app.data.quotes import GoldAPIQuoteClient, parse_symbol, symbol_history_path, symbol_slug
+    from app.data.dataset_mirror import DatasetMirror
+
+    symbol = symbol or Config.DEFAULT_SYMBOL
+    metal, currency = parse_symbol(symbol)
+
+    if Config.LOCAL_SOURCES_AUTOSTART:
+        start_local_servers(
+            goldapi=Config.GOLDAPI_SOURCE == 'replay',
+            rss=Config.NEWS_SOURCE == 'local'
+        )
+
+    if symbol != Config.DEFAULT_SYMBOL:
+        data_fetcher = LocalKaggleDataFetcher(symbol_history_path(symbol))
+    elif Config.KAGGLE_SOURCE == 'local':
+        data_fetcher = LocalKaggleDataFetcher()
+    else:
+        from app.data import KaggleDataFetcher
+        data_fetcher = KaggleDataFetcher()
+
+    if Config.DATASET_MIRROR_ENABLED:
+        source = data_fetcher.source_id() if isinstance(data_fetcher, LocalKaggleDataFetcher) else 'kaggle'
+        data_fetcher = DatasetMirror(data_fetcher, symbol_slug(symbol), source=source)
+
+    if Config.GOLDAPI_SOURCE == 'replay':
+        gold_api = ReplayGoldAPIClient(metal=metal, currency=currency)
+    elif symbol != Config.DEFAULT_SYMBOL:
+        gold_api = GoldAPIQuoteClient(metal, currency)
+    else:
+        from app.data import GoldAPIClient
+        gold_api = GoldAPIClient()
+
+    if Config.NEWS_SOURCE == 'local':
+        news_fetcher = LocalNewsFetcher()
+    else:
+        from app.data import NewsFetcher
+        news_fetcher = NewsFetcher()
+
+    return data_fetcher, gold_api, news_fetcher
+
+
+def write_synthetic_data(rows: int = 5000, ticks: int = 100_000, seed: int = 42):
+    """Write synthetic histories for every configured symbol and a tick tape to the local paths"""
+    from app.data.quotes import parse_symbol, symbol_history_path
+
+    Config.LOCAL_KAGGLE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    make_synthetic_prices(rows, seed).to_csv(Config.LOCAL_KAGGLE_PATH, index=False)
+    print(f"Wrote {rows:,} rows of price history to {Config.LOCAL_KAGGLE_PATH}")
+
+    for i, symbol in enumerate(s for s in Config.SYMBOLS if s != Config.DEFAULT_SYMBOL):
+        metal, _ = parse_symbol(symbol)
+        path = symbol_history_path(symbol)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        start_price = 600.0 * METAL_PRICE_SCALE.get(metal, 1.0)
+        make_synthetic_prices(rows, seed + i + 1, start_price=start_price).to_csv(path, index=False)
+        print(f"Wrote {rows:,} rows of {symbol} history to {path}")
+
+    Config.REPLAY_TICKS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    make_synthetic_ticks(ticks, seed).to_csv(Config.REPLAY_TICKS_PATH, index=False)
+    print(f"Wrote {ticks:,} replay ticks to {Config.REPLAY_TICKS_PATH}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve offline stand-ins for GoldAPI.io and Google News RSS')
+    parser.add_argument('--init', action='store_true', help='Write synthetic dataset and tick files, then exit')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows of synthetic price history (--init)')
+    parser.add_argument('--ticks', type=int, default=100_000, help='Synthetic replay ticks (--init)')
+    parser.add_argument('--tick-rate', type=float, default=None, help='Ticks per second (0 = one per request)')
+    args = parser.parse_args()
+
+    if args.init:
+        write_synthetic_data(args.rows, args.ticks)
+        return
+
+    goldapi = ReplayGoldAPIServer(tick_rate=args.tick_rate).start()
+    rss = LocalRSSServer().start()
+    print(f"Replay GoldAPI: {goldapi.base_url}/XAU/USD")
+    print(f"Local RSS:      {rss.base_url}/search?q=gold")
+    print("Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        goldapi.stop()
+        rss.stop()
+
+
+if __name__ == "__main__":
+    main()
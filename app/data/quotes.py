@@ -0,0 +1,96 @@
+"""
+Per-symbol GoldAPI.io quotes, fetched for many symbols in one concurrent round
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Tuple
+
+from app.config import Config
+from app.data.local_sources import parse_goldapi_response
+
+
+def parse_symbol(symbol: str) -> Tuple[str, str]:
+    """Split "XAG/USD" into ("XAG", "USD")"""
+    metal, sep, currency = symbol.strip().upper().partition('/')
+    if not sep or not metal or not currency:
+        raise ValueError(f"Invalid symbol '{symbol}'. Expected METAL/CURRENCY, e.g. XAG/USD")
+    return metal, currency
+
+
+def symbol_slug(symbol: str) -> str:
+    """Filesystem-safe name for a symbol ("XAG/USD" -> "XAG_USD")"""
+    return '_'.join(parse_symbol(symbol))
+
+
+def symbol_history_path(symbol: str) -> Path:
+    """Price history CSV of a symbol other than the Kaggle gold dataset"""
+    path = Config.SYMBOL_HISTORY_PATHS.get(symbol)
+    return Path(path) if path else Config.DATA_DIR / "local" / f"{symbol_slug(symbol)}.csv"
+
+
+class GoldAPIQuoteClient:
+    """GoldAPI.io client for any metal/currency pair, sharing one keep-alive session"""
+
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+
+    def __init__(self, metal: str = 'XAU', currency: str = 'USD', api_key: Optional[str] = None):
+        self.metal = metal
+        self.currency = currency
+        self.url = Config.GOLDAPI_URL_TEMPLATE.format(metal=metal, currency=currency)
+        self.headers = {
+            'x-access-token': api_key or Config.GOLDAPI_API_KEY,
+            'Content-Type': 'application/json'
+        }
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Connection pool shared by every symbol, sized for a full quote round"""
+        with cls._session_lock:
+            if cls._session is None:
+                cls._session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=Config.QUOTE_FETCH_WORKERS)
+                cls._session.mount('https://', adapter)
+                cls._session.mount('http://', adapter)
+            return cls._session
+
+    def get_current_price(self) -> Dict:
+        """Fetch the current quote for this symbol"""
+        try:
+            response = self.session().get(self.url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+            return parse_goldapi_response(response.json())
+        except (requests.RequestException, ValueError) as e:
+            return {
+                'current_price': None,
+                'source': 'error',
+                'error': str(e),
+                'metal': self.metal,
+                'currency': self.currency,
+                'timestamp': datetime.now().isoformat()
+            }
+
+
+def fetch_quotes(clients: Dict[str, object], max_workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Fetch quotes for several symbols concurrently
+
+    Args:
+        clients: Symbol -> object with ``get_current_price()``
+        max_workers: Concurrent requests (defaults to Config.QUOTE_FETCH_WORKERS)
+
+    Returns:
+        Symbol -> price dict, in the order of ``clients``
+    """
+    if not clients:
+        return {}
+
+    workers = min(len(clients), max_workers or Config.QUOTE_FETCH_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='quotes') as pool:
+        futures = {symbol: pool.submit(client.get_current_price) for symbol, client in clients.items()}
+        return {symbol: future.result() for symbol, future in futures.items()}
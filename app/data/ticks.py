@@ -0,0 +1,119 @@
+"""
+Price tick sources for streaming predictions
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, Iterator
+
+from app.config import Config
+from app.data.local_sources import load_ticks, METAL_PRICE_SCALE
+
+
+class ReplayTickSource:
+    """
+    Ticks read straight from a recorded (or synthetic) tick tape
+
+    Yields the same price dicts the GoldAPI clients return (price, day
+    change against the first tick, running high/low), plus ``tick_time``
+    (when the tick was released, ``time.perf_counter``). With ``rate`` > 0
+    ticks are released at that many per second, otherwise as fast as they
+    are consumed. No HTTP round trip, so replays can exceed what the replay
+    server or GoldAPI could serve.
+    """
+
+    def __init__(
+        self,
+        ticks: Optional[pd.DataFrame] = None,
+        rate: Optional[float] = None,
+        metal: str = 'XAU',
+        currency: str = 'USD',
+        limit: Optional[int] = None,
+        path: Optional[Path] = None
+    ):
+        if ticks is None:
+            ticks = load_ticks(path or Config.REPLAY_TICKS_PATH)
+        self.rate = Config.STREAM_TICK_RATE if rate is None else rate
+        self.metal = metal
+        self.currency = currency
+        self.limit = limit
+
+        scale = METAL_PRICE_SCALE.get(metal, 1.0)
+        self.price = ticks['price'].to_numpy(dtype=np.float64) * scale
+        self.timestamps = ticks['timestamp'].to_numpy(dtype=np.int64)
+        prev_close = float(ticks['prev_close_price'].iloc[0]) * scale if 'prev_close_price' in ticks else float(self.price[0])
+        self.change = self.price - prev_close
+        self.change_pct = self.change / prev_close * 100
+        self.high = ticks['high_price'].to_numpy(dtype=np.float64) * scale if 'high_price' in ticks else np.maximum.accumulate(self.price)
+        self.low = ticks['low_price'].to_numpy(dtype=np.float64) * scale if 'low_price' in ticks else np.minimum.accumulate(self.price)
+
+    def __len__(self) -> int:
+        return len(self.price) if self.limit is None else min(self.limit, len(self.price))
+
+    def __iter__(self) -> Iterator[Dict]:
+        columns = zip(self.price.tolist(), self.timestamps.tolist(), self.change.tolist(),
+                      self.change_pct.tolist(), self.high.tolist(), self.low.tolist())
+        start = time.perf_counter()
+        for i, (price, timestamp, change, change_pct, high, low) in enumerate(columns):
+            if i == len(self):
+                return
+            if self.rate > 0:
+                release = start + i / self.rate
+                delay = release - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield {
+                'current_price': price,
+                'source': 'replay',
+                'price_timestamp_unix': timestamp,
+                'price_change': change,
+                'price_change_pct': change_pct,
+                'high_price': high,
+                'low_price': low,
+                'metal': self.metal,
+                'currency': self.currency,
+                'tick_time': time.perf_counter()
+            }
+
+
+class PollingTickSource:
+    """
+    Ticks from polling a GoldAPI-style client every ``interval`` seconds
+
+    A quote is only yielded when its price timestamp (or price) changed
+    since the last one, so an unchanged quote is not predicted twice.
+    Failed requests are skipped until the next poll. Keep ``interval``
+    within the API's rate limit (GoldAPI's free tier allows 10 requests
+    per hour).
+    """
+
+    def __init__(self, client, interval: Optional[float] = None, limit: Optional[int] = None):
+        self.client = client
+        self.interval = Config.STREAM_POLL_INTERVAL if interval is None else interval
+        self.limit = limit
+
+    def __iter__(self) -> Iterator[Dict]:
+        last_key = None
+        emitted = 0
+        next_poll = time.perf_counter()
+        while self.limit is None or emitted < self.limit:
+            delay = next_poll - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_poll = max(next_poll + self.interval, time.perf_counter())
+
+            quote = self.client.get_current_price()
+            if not quote or not quote.get('current_price'):
+                continue
+            key = (quote.get('price_timestamp_unix') or quote.get('price_timestamp'), quote['current_price'])
+            if key == last_key:
+                continue
+            last_key = key
+            if 'price_timestamp_unix' not in quote:
+                quote['price_timestamp_unix'] = int(datetime.now().timestamp())
+            quote['tick_time'] = time.perf_counter()
+            emitted += 1
+            yield quote
@@ -1,6 +1,11 @@
 """Feature engineering modules"""
 
 from .feature_engineering import FeatureEngineer
+from .news_scoring import NewsScorer
+from .keyword_matcher import KeywordMatcher
+from .incremental import IncrementalPriceFeatures
+from .resampling import PriceCalendar, BarResampler
 
-__all__ = ['FeatureEngineer']
+__all__ = ['FeatureEngineer', 'NewsScorer', 'KeywordMatcher', 'IncrementalPriceFeatures',
+           'PriceCalendar', 'BarResampler']
 
@@ -2,51 +2,112 @@
 Feature engineering for gold price prediction
 """
 
+import weakref
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple, Union, Sequence
 from datetime import datetime
 
+from app.config import Config
+from app.features.indicators import IndicatorEngine, forward_fill
+from app.features.resampling import PriceCalendar, resample_points, to_nanoseconds
+from app.utils.instrumentation import timed
+
+
+DATE_COLUMNS = ['Date', 'date', 'DATE', 'Date/Time']
+TIMESTAMP_COLUMNS = ['timestamp', 'price_timestamp_unix']  # unix seconds (GoldAPI ticks)
+OHLCV_COLUMNS = {
+    'open': ['Open', 'open', 'OPEN'],
+    'high': ['High', 'high', 'HIGH'],
+    'low': ['Low', 'low', 'LOW'],
+    'volume': ['Volume', 'volume', 'VOLUME'],
+    'ticks': ['Ticks']  # ticks per bar of already resampled frames
+}
+
+# Serving feature -> key in the news impact dict / GoldAPI response (and column in per-date frames)
+NEWS_FEATURES = {
+    'news_sentiment': 'avg_sentiment',
+    'news_price_indicator': 'avg_price_indicator',
+    'news_net_signal': 'net_signal',
+    'news_count': 'total_news'
+}
+API_FEATURES = {
+    'api_price_change': 'price_change',
+    'api_price_change_pct': 'price_change_pct',
+    'api_high': 'high_price',
+    'api_low': 'low_price'
+}
+
+
+def fill_forward(values: np.ndarray, last: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Causal gap filling, in place: a NaN takes the last valid value above it in its column
+    
+    NaNs before a column's first valid value (the warm-up) stay NaN, or
+    take ``last`` (the last filled row of the block this one extends), so a
+    block appended later fills exactly as if it had been filled with the
+    rest. Nothing is ever filled from a later row.
+    
+    Args:
+        values: (rows, columns) float array, modified and returned
+        last: Filled row preceding ``values``
+    """
+    if values.size == 0:
+        return values
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    seen = np.logical_or.accumulate(~missing, axis=0)
+    
+    # Gaps after a valid value: index of the last valid row, per column
+    gaps = missing & seen
+    for column in np.flatnonzero(gaps.any(axis=0)):
+        index = np.where(missing[:, column], 0, np.arange(len(values)))
+        np.maximum.accumulate(index, out=index)
+        values[:, column] = values[index, column]
+    
+    # Leading gaps continue the preceding block
+    if last is not None:
+        leading = missing & ~seen
+        values[leading] = np.broadcast_to(last, values.shape)[leading]
+    return values
+
 
 class FeatureEngineer:
     """Engineer features from historical data, news, and API data"""
     
-    def __init__(self):
-        pass
+    def __init__(self, indicators: Optional[Dict[str, list]] = None, calendar: Optional[PriceCalendar] = None):
+        self.indicators = IndicatorEngine(indicators)
+        if calendar is None and Config.PRICE_CALENDAR:
+            calendar = PriceCalendar()
+        self.calendar = calendar
+        # (weak reference to the last frame append_price_features returned, its incremental state)
+        self._append_state = None
     
+    @timed('features.create_price_features')
     def create_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create features from historical price data"""
-        df = df.copy()
+        """
+        Create features from historical price data
+        
+        With a calendar the prices are first resampled to one row per bar
+        (``align_prices``), so the rolling windows span fixed calendar time.
+        """
+        if self.calendar is not None:
+            df = self.align_prices(df)
+        else:
+            df = df.copy()
         
         # Ensure date column is datetime
-        date_col = None
-        for col in ['Date', 'date', 'DATE', 'Date/Time']:
-            if col in df.columns:
-                date_col = col
-                break
+        date_col = self.get_date_column(df)
         
         if date_col:
             df[date_col] = pd.to_datetime(df[date_col])
             df = df.sort_values(date_col).reset_index(drop=True)
         
-        # Price columns (handle various naming conventions)
-        price_col = None
-        for col in ['Price', 'price', 'PRICE', 'Close', 'close', 'CLOSE', 'USD']:
-            if col in df.columns:
-                price_col = col
-                break
-        
-        if price_col is None:
-            # Try to find numeric columns that might be price
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) > 0:
-                price_col = numeric_cols[0]  # Use first numeric column
+        price_col = self.get_price_column(df)
         
-        if price_col is None:
-            raise ValueError("Could not identify price column in dataset")
-        
-        # Create features
-        df['price'] = pd.to_numeric(df[price_col], errors='coerce')
+        # Create features; a missing price carries the previous close (as in the indicators)
+        df['price'] = forward_fill(pd.to_numeric(df[price_col], errors='coerce').to_numpy(dtype=np.float64))
         df['price_change'] = df['price'].diff()
         df['price_change_pct'] = df['price'].pct_change() * 100
         df['price_ma_7'] = df['price'].rolling(window=7).mean()
@@ -58,8 +119,13 @@ class FeatureEngineer:
         df['momentum_7'] = df['price'] - df['price'].shift(7)
         df['momentum_30'] = df['price'] - df['price'].shift(30)
         
-        # Forward fill missing values
-        df = df.bfill().ffill()
+        # Technical indicators (EMA, RSI, MACD, Bollinger, ATR, returns)
+        df = self.indicators.add_to_frame(df)
+        
+        # Fill gaps causally: feature columns only, from earlier rows only (warm-up rows stay NaN)
+        columns = self.get_filled_columns()
+        values = df[columns].to_numpy(dtype=np.float64, copy=True)
+        df[columns] = fill_forward(values)
         
         # Create target variables
         df['next_price'] = df['price'].shift(-1)
@@ -68,65 +134,302 @@ class FeatureEngineer:
         
         return df
     
+    @timed('features.append_price_features')
+    def append_price_features(self, df_processed: pd.DataFrame, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Extend processed history with new raw rows, computing features for the new rows only
+        
+        Features only look back and gaps are only filled forward, so existing
+        rows keep their values and the new rows get the same values
+        ``create_price_features`` gives them on the whole history (rows with a
+        missing price carry the previous close). Only the targets of the
+        previous last row change, now that its next price is known.
+        
+        The incremental state is kept between calls: appending to the frame
+        the previous call returned continues from it, any other frame
+        rebuilds it from that frame's history.
+        """
+        from app.features.incremental import IncrementalPriceFeatures
+        
+        if new_rows.empty:
+            return df_processed
+        if df_processed.empty:
+            return self.create_price_features(new_rows)
+        
+        if self.calendar is not None:
+            new = self.align_prices(new_rows, after=df_processed)
+            if new.empty:
+                return df_processed
+        else:
+            new = new_rows.copy()
+        date_col = self.get_date_column(new)
+        if date_col:
+            new[date_col] = pd.to_datetime(new[date_col])
+            new = new.sort_values(date_col)
+        
+        price = pd.to_numeric(new[self.get_price_column(new)], errors='coerce').to_numpy(dtype=np.float64)
+        high_col = next((col for col in OHLCV_COLUMNS['high'] if col in new.columns), None)
+        low_col = next((col for col in OHLCV_COLUMNS['low'] if col in new.columns), None)
+        high = pd.to_numeric(new[high_col], errors='coerce').to_numpy(dtype=np.float64) if high_col and low_col else None
+        low = pd.to_numeric(new[low_col], errors='coerce').to_numpy(dtype=np.float64) if high_col and low_col else None
+        
+        state = None
+        if self._append_state is not None and self._append_state[0]() is df_processed:
+            state = self._append_state[1]
+        self._append_state = None
+        if state is None:
+            state = IncrementalPriceFeatures(df_processed, self.indicators)
+        names = self.get_price_feature_names()
+        features = np.empty((len(new), len(names)))
+        for i in range(len(new)):
+            row = state.append(price[i], high[i] if high is not None else None, low[i] if low is not None else None)
+            features[i] = [row[name] for name in names]
+        
+        columns = self.get_filled_columns()
+        values = fill_forward(np.column_stack([price, features]),
+                              last=df_processed[columns].to_numpy(dtype=np.float64)[-1])
+        
+        # Targets of the previous last row and the new rows
+        prices = np.concatenate([df_processed['price'].to_numpy(dtype=np.float64)[-1:], values[:, 0]])
+        next_price = np.append(prices[1:], np.nan)
+        targets = {
+            'next_price': next_price,
+            'next_price_change': next_price - prices,
+            'next_direction': (next_price - prices > 0).astype(int)
+        }
+        new = pd.concat([
+            new.drop(columns=[col for col in columns + list(targets) if col in new.columns]),
+            pd.DataFrame(values, columns=columns, index=new.index),
+            pd.DataFrame({name: target[1:] for name, target in targets.items()}, index=new.index)
+        ], axis=1)
+        
+        df = pd.concat([df_processed, new], ignore_index=True)
+        for name, target in targets.items():
+            df.iloc[len(df_processed) - 1, df.columns.get_loc(name)] = target[0]
+        
+        self._append_state = (weakref.ref(df), state)
+        return df
+    
+    @timed('features.align_prices')
+    def align_prices(self, *frames: pd.DataFrame, after: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Resample price frames of any frequency onto the calendar, one row per bar
+        
+        Frames can mix sources, e.g. the daily Kaggle history and intraday
+        GoldAPI ticks (``timestamp`` in unix seconds and ``price``); where they
+        overlap, the later point sets a bar's close. Bars without a point are
+        flat at the previous close. Returns Date, Open, High, Low, Close,
+        Volume and Ticks columns. A single frame without a time column is
+        returned as it is.
+        
+        Args:
+            after: Processed history the bars continue (they start after its last row)
+        """
+        calendar = self.calendar or PriceCalendar()
+        points = [self._price_points(frame) for frame in frames]
+        if len(frames) == 1 and points[0] is None:
+            return frames[0].copy()
+        
+        last = None
+        if after is not None and not after.empty:
+            date_col = self.get_date_column(after)
+            if date_col:
+                last = (int(to_nanoseconds(after[date_col].iloc[-1:])[0]), float(after['price'].iloc[-1]))
+        return resample_points([p for p in points if p is not None], calendar, after=last)
+    
+    def _price_points(self, frame: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        """Times (ns) and prices of a frame for resampling; None without a time column"""
+        time_col = self.get_date_column(frame) or next(
+            (col for col in TIMESTAMP_COLUMNS if col in frame.columns), None)
+        if time_col is None:
+            return None
+        price_col = self.get_price_column(frame.drop(columns=[time_col]))
+        points = {
+            'times': to_nanoseconds(frame[time_col]),
+            'close': pd.to_numeric(frame[price_col], errors='coerce').to_numpy(dtype=np.float64)
+        }
+        for field, names in OHLCV_COLUMNS.items():
+            col = next((col for col in names if col in frame.columns), None)
+            if col is not None:
+                points[field] = pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=np.float64)
+        return points
+    
+    @timed('features.create_feature_matrix')
     def create_feature_matrix(
         self,
         df_processed: pd.DataFrame,
-        news_sentiment: Optional[Dict] = None,
-        current_api_price: Optional[Dict] = None
+        news_sentiment: Optional[Union[Dict, pd.DataFrame]] = None,
+        current_api_price: Optional[Union[Dict, pd.DataFrame]] = None,
+        feature_names: Optional[list] = None,
+        rows: Optional[Union[slice, Sequence[int], np.ndarray]] = None,
+        start=None,
+        end=None
     ) -> np.ndarray:
         """
         Create feature matrix combining historical data, news sentiment, and API price
+        
+        By default this is the serving row: the latest history row, shape
+        (1, n_features). Pass ``rows`` (positions) or ``start``/``end`` (dates,
+        inclusive) to build the same features for past rows in one pass,
+        shape (N, n_features), for replays and backtests. Rows before
+        ``warmup_rows()`` are returned as is, with indicators computed over
+        incomplete windows (and missing ones as 0); callers should skip them,
+        as ``create_training_matrix`` does.
+        
+        Args:
+            news_sentiment: News impact dict applied to every row, or a frame
+                indexed by date with the dict's keys as columns (rows without
+                a matching date get 0)
+            current_api_price: GoldAPI response applied to every row, or a
+                frame indexed by date with its keys as columns
+            feature_names: Features to compute, in this order (e.g. a model's selected
+                features); defaults to get_feature_names()
         """
-        features = []
+        names = feature_names or self.get_feature_names()
+        positions = self._select_rows(df_processed, rows, start, end)
+        if positions is None:
+            # Latest values only (an empty history still yields one row of news/API features)
+            positions = np.arange(len(df_processed))[-1:]
+            n_rows = 1
+        else:
+            n_rows = len(positions)
         
-        # Historical price features
-        price_features = [
-            'price_change', 'price_change_pct', 'price_ma_7', 'price_ma_30',
-            'price_std_7', 'volatility', 'momentum_7', 'momentum_30'
-        ]
+        X = np.zeros((n_rows, len(names)))
+        columns = {name: i for i, name in enumerate(names)}
         
-        # Use latest values (last row)
-        if len(df_processed) > 0:
-            latest = df_processed.iloc[-1]
+        # Historical price features (only the requested columns are read); missing values are 0
+        price_features = [f for f in self.get_price_feature_names() if f in columns and f in df_processed.columns]
+        if len(positions) == 1 and price_features:
+            # A single row (serving): one row lookup is cheaper than one per column
+            latest = df_processed.iloc[int(positions[0])].to_dict()
+            values = np.array([latest[feature] for feature in price_features], dtype=np.float64)
+            X[:, [columns[feature] for feature in price_features]] = np.where(np.isnan(values), 0.0, values)
+        elif len(positions) > 0:
             for feature in price_features:
-                if feature in df_processed.columns:
-                    val = latest[feature]
-                    features.append(float(val) if not pd.isna(val) else 0.0)
-                else:
-                    features.append(0.0)
-        else:
-            # If no data, fill with zeros
-            features.extend([0.0] * len(price_features))
+                values = df_processed[feature].to_numpy(dtype=np.float64)[positions]
+                X[:, columns[feature]] = np.where(np.isnan(values), 0.0, values)
+        
+        dates = None
+        if isinstance(news_sentiment, pd.DataFrame) or isinstance(current_api_price, pd.DataFrame):
+            date_col = self.get_date_column(df_processed)
+            if date_col is None:
+                raise ValueError("Per-date news or API features need a date column in the processed data")
+            dates = pd.DatetimeIndex(pd.to_datetime(df_processed[date_col].to_numpy()[positions])).normalize()
         
         # News sentiment features
-        if news_sentiment:
-            features.append(float(news_sentiment.get('avg_sentiment', 0.0)))
-            features.append(float(news_sentiment.get('avg_price_indicator', 0.0)))
-            features.append(float(news_sentiment.get('net_signal', 0.0)))
-            features.append(float(news_sentiment.get('total_news', 0)))
-        else:
-            features.extend([0.0, 0.0, 0.0, 0.0])
-        
-        # API price features
-        if current_api_price and current_api_price.get('current_price'):
-            features.append(float(current_api_price.get('price_change', 0.0)))
-            features.append(float(current_api_price.get('price_change_pct', 0.0)))
-            features.append(float(current_api_price.get('high_price', 0.0)))
-            features.append(float(current_api_price.get('low_price', 0.0)))
+        if isinstance(news_sentiment, pd.DataFrame):
+            self._fill_aligned(X, columns, NEWS_FEATURES, news_sentiment, dates)
+        elif news_sentiment:
+            for feature, key in NEWS_FEATURES.items():
+                if feature in columns:
+                    X[:, columns[feature]] = float(news_sentiment.get(key, 0.0))
+        
+        # API price features (only when the API returned a price)
+        if isinstance(current_api_price, pd.DataFrame):
+            priced = current_api_price
+            if 'current_price' in priced.columns:
+                priced = priced[priced['current_price'].fillna(0) != 0]
+            self._fill_aligned(X, columns, API_FEATURES, priced, dates)
+        elif current_api_price and current_api_price.get('current_price'):
+            for feature, key in API_FEATURES.items():
+                if feature in columns:
+                    X[:, columns[feature]] = float(current_api_price.get(key, 0.0))
+        
+        return X
+    
+    def _select_rows(self, df: pd.DataFrame, rows, start, end) -> Optional[np.ndarray]:
+        """Positions of history rows by position or inclusive date range (None: the serving row)"""
+        if rows is None and start is None and end is None:
+            return None
+        if rows is not None:
+            return np.arange(len(df))[rows]
+        
+        date_col = self.get_date_column(df)
+        if date_col is None:
+            raise ValueError("Selecting rows by date needs a date column in the processed data")
+        dates = pd.to_datetime(df[date_col])
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= (dates >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (dates <= pd.Timestamp(end)).to_numpy()
+        return np.flatnonzero(mask)
+    
+    @staticmethod
+    def _fill_aligned(X: np.ndarray, columns: Dict[str, int], features: Dict[str, str],
+                      frame: pd.DataFrame, dates: pd.DatetimeIndex):
+        """Fill features from a date-indexed frame, matched to each row's calendar date"""
+        index = pd.DatetimeIndex(pd.to_datetime(frame.index)).normalize()
+        frame = frame.set_axis(index).groupby(level=0).last()
+        aligned = frame.reindex(dates)
+        for feature, key in features.items():
+            if feature in columns and key in aligned.columns:
+                X[:, columns[feature]] = pd.to_numeric(aligned[key], errors='coerce').fillna(0.0).to_numpy()
+    
+    @timed('features.create_training_matrix')
+    def create_training_matrix(self, df_processed: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Create training features and targets for every historical row
+        
+        Rows come from ``create_feature_matrix``, the serving code path.
+        
+        Returns:
+            (X, y_direction, y_range) for the rows after ``warmup_rows()``;
+            news and API features are 0 for history
+        """
+        if 'next_direction' not in df_processed.columns:
+            return np.array([]), np.array([]), np.array([])
+        
+        # Rows in the warm-up period have incomplete rolling windows
+        valid = np.flatnonzero(df_processed['next_direction'].notna().to_numpy())
+        valid = valid[valid >= self.warmup_rows()]
+        X = self.create_feature_matrix(df_processed, rows=valid)
+        y_direction = df_processed['next_direction'].to_numpy()[valid].astype(int)
+        if 'next_price_change' in df_processed.columns:
+            y_range = df_processed['next_price_change'].to_numpy(dtype=np.float64)[valid]
         else:
-            features.extend([0.0, 0.0, 0.0, 0.0])
+            y_range = np.zeros(len(valid))
         
-        # Return as numpy array with proper shape
-        feature_array = np.array(features).reshape(1, -1)
+        return X, y_direction, y_range
+    
+    def get_date_column(self, df: pd.DataFrame) -> Optional[str]:
+        """Name of the date column, if the frame has one"""
+        for col in DATE_COLUMNS:
+            if col in df.columns:
+                return col
+        return None
+    
+    def get_price_column(self, df: pd.DataFrame) -> str:
+        """Name of the price column (handles various naming conventions)"""
+        for col in ['Price', 'price', 'PRICE', 'Close', 'close', 'CLOSE', 'USD']:
+            if col in df.columns:
+                return col
         
-        return feature_array
+        # Try to find numeric columns that might be price
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) > 0:
+            return numeric_cols[0]  # Use first numeric column
+        
+        raise ValueError("Could not identify price column in dataset")
     
-    def get_feature_names(self) -> list:
-        """Get list of feature names"""
+    def get_filled_columns(self) -> list:
+        """Columns whose gaps ``create_price_features`` fills: the price and its features"""
+        return ['price'] + self.get_price_feature_names()
+    
+    def warmup_rows(self) -> int:
+        """Leading rows whose rolling windows are incomplete, left out of training"""
+        return max(30, self.indicators.warmup_rows())
+    
+    def get_price_feature_names(self) -> list:
+        """Get list of historical price features: the base 8 plus the configured indicators"""
         return [
-            # Historical features (8)
             'price_change', 'price_change_pct', 'price_ma_7', 'price_ma_30',
-            'price_std_7', 'volatility', 'momentum_7', 'momentum_30',
+            'price_std_7', 'volatility', 'momentum_7', 'momentum_30'
+        ] + self.indicators.feature_names()
+    
+    def get_feature_names(self) -> list:
+        """Get list of feature names"""
+        return self.get_price_feature_names() + [
             # News features (4)
             'news_sentiment', 'news_price_indicator', 'news_net_signal', 'news_count',
             # API features (4)
@@ -0,0 +1,266 @@
+"""
+Price features for a live bar, updated tick by tick in constant time
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from typing import Optional, Dict, List
+
+from app.features.indicators import IndicatorEngine, _ewm, forward_fill
+
+
+class _RollingWindow:
+    """
+    Mean and sample std of the last ``window - 1`` committed values plus one live value
+
+    Sums are kept relative to ``center`` (the last committed close for
+    prices), so the variance does not lose precision to large price levels.
+    """
+
+    __slots__ = ('window', 'count', 'total', 'total_sq', 'center')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.center = 0.0
+
+    def reset(self, values: List[float], center: float = 0.0):
+        tail = values[len(values) - (self.window - 1):] if self.window > 1 else []
+        self.count = len(tail)
+        self.center = center
+        self.total = math.fsum(v - center for v in tail)
+        self.total_sq = math.fsum((v - center) ** 2 for v in tail)
+
+    def with_value(self, value: float):
+        """(mean, std) of the window ending with ``value``; NaN during warm-up"""
+        if self.count < self.window - 1 or value != value:
+            return math.nan, math.nan
+        d = value - self.center
+        total = self.total + d
+        n = self.window
+        mean = self.center + total / n
+        if n < 2:
+            return mean, math.nan
+        variance = (self.total_sq + d * d - total * total / n) / (n - 1)
+        return mean, math.sqrt(variance) if variance > 0 else 0.0
+
+
+class IncrementalPriceFeatures:
+    """
+    The history price features of one more bar, whose close is the latest tick
+
+    Built from the processed history (``create_price_features`` output), it
+    keeps the state the rolling features and indicators need at the last
+    completed bar: recent closes, window sums, EMA/RSI/MACD/ATR smoothing
+    states. ``update(price)`` then returns the features
+    ``create_price_features`` would give a new bar closing at ``price``
+    (its high and low being the extremes of the bar's ticks so far) in a
+    few dozen float operations, without touching the history frame.
+    ``commit()`` closes the live bar and rolls the state forward a bar.
+    Values still in warm-up are NaN.
+
+    With ``open_last`` the last history row is the live bar instead (its
+    period has not ended): the state is built from the rows before it, and
+    ticks update that bar, starting from its close, high and low.
+    """
+
+    def __init__(
+        self,
+        df_processed: pd.DataFrame,
+        indicators: Optional[IndicatorEngine] = None,
+        open_last: bool = False
+    ):
+        if 'price' not in df_processed.columns or df_processed.empty:
+            raise ValueError("Incremental features need processed price history")
+        last = None
+        if open_last and len(df_processed) > 1:
+            last = df_processed.iloc[-1]
+            df_processed = df_processed.iloc[:-1]
+        self.indicators = indicators or IndicatorEngine()
+        self.spec = self.indicators.spec
+
+        close = forward_fill(df_processed['price'].to_numpy(dtype=np.float64))
+        high_col = next((col for col in ['High', 'high', 'HIGH'] if col in df_processed.columns), None)
+        low_col = next((col for col in ['Low', 'low', 'LOW'] if col in df_processed.columns), None)
+        self.has_range = high_col is not None and low_col is not None
+
+        self.ema_periods = sorted({p for p in self.spec.get('ema', [])} |
+                                  {p for fast, slow, _ in self.spec.get('macd', []) for p in (fast, slow)})
+        self.lookback = max([31] + [window for window, _ in self.spec.get('bollinger', [])]
+                            + [period + 1 for period in self.spec.get('returns', [])])
+
+        # Smoothing states at the last completed bar, seeded like IndicatorEngine.compute
+        delta = np.diff(close, prepend=np.nan)
+        self.ema = {period: _ewm(close, 2.0 / (period + 1))[-1] for period in self.ema_periods}
+        self.rsi = {
+            period: (_ewm(np.clip(delta, 0.0, None), 1.0 / period)[-1],
+                     _ewm(np.clip(-delta, 0.0, None), 1.0 / period)[-1])
+            for period in self.spec.get('rsi', [])
+        }
+        self.macd_signal = {}
+        for fast, slow, signal in self.spec.get('macd', []):
+            macd = _ewm(close, 2.0 / (fast + 1)) - _ewm(close, 2.0 / (slow + 1))
+            self.macd_signal[(fast, slow, signal)] = _ewm(macd, 2.0 / (signal + 1))[-1]
+        self.atr = {}
+        if self.spec.get('atr'):
+            if self.has_range:
+                high = pd.to_numeric(df_processed[high_col], errors='coerce').to_numpy(dtype=np.float64)
+                low = pd.to_numeric(df_processed[low_col], errors='coerce').to_numpy(dtype=np.float64)
+                true_range = high - low
+                np.fmax(true_range[1:], np.abs(high[1:] - close[:-1]), out=true_range[1:])
+                np.fmax(true_range[1:], np.abs(low[1:] - close[:-1]), out=true_range[1:])
+                true_range = np.where(np.isnan(true_range), np.abs(delta), true_range)
+            else:
+                true_range = np.abs(delta)
+            self.atr = {period: _ewm(true_range, 1.0 / period)[-1] for period in self.spec['atr']}
+
+        self.closes: List[float] = [float(v) for v in close[-self.lookback:]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.diff(close[-8:]) / close[-8:-1] * 100
+        self.pct_changes: List[float] = [float(v) for v in pct]
+
+        self._price_windows = {window: _RollingWindow(window) for window in
+                               {7, 30} | {window for window, _ in self.spec.get('bollinger', [])}}
+        self._volatility = _RollingWindow(7)
+        self._reset_windows()
+        self._bar_high = self._bar_low = self._bar_close = math.nan
+        if last is not None:
+            self._bar_close = float(last['price'])
+            if self.has_range:
+                high, low = float(last[high_col]), float(last[low_col])
+                self._bar_high = high if high == high else self._bar_close
+                self._bar_low = low if low == low else self._bar_close
+            else:
+                self._bar_high = self._bar_low = self._bar_close
+
+    def _reset_windows(self):
+        center = self.closes[-1]
+        for window in self._price_windows.values():
+            window.reset(self.closes, center)
+        self._volatility.reset(self.pct_changes)
+
+    def _close_back(self, bars: int) -> float:
+        """Committed close ``bars`` before the live bar (NaN without enough history)"""
+        return self.closes[-bars] if len(self.closes) >= bars else math.nan
+
+    def update(self, price: float) -> Dict[str, float]:
+        """Price features of the live bar after a tick at ``price``"""
+        price = float(price)
+        self._bar_close = price
+        if not price <= self._bar_high:
+            self._bar_high = price
+        if not price >= self._bar_low:
+            self._bar_low = price
+
+        prev = self.closes[-1]
+        change = price - prev
+        change_pct = change / prev * 100 if prev else math.nan
+        ma_7, std_7 = self._price_windows[7].with_value(price)
+        ma_30, _ = self._price_windows[30].with_value(price)
+        _, volatility = self._volatility.with_value(change_pct)
+        features = {
+            'price_change': change,
+            'price_change_pct': change_pct,
+            'price_ma_7': ma_7,
+            'price_ma_30': ma_30,
+            'price_std_7': std_7,
+            'volatility': volatility,
+            'momentum_7': price - self._close_back(7),
+            'momentum_30': price - self._close_back(30)
+        }
+
+        ema = {period: self._smooth(self.ema[period], price, 2.0 / (period + 1)) for period in self.ema_periods}
+        for kind, params in self.spec.items():
+            for param in params:
+                if kind == 'ema':
+                    features[f'ema_{param}'] = ema[param]
+
+                elif kind == 'rsi':
+                    gain_prev, loss_prev = self.rsi[param]
+                    gain = self._smooth(gain_prev, max(change, 0.0), 1.0 / param)
+                    loss = self._smooth(loss_prev, max(-change, 0.0), 1.0 / param)
+                    if loss == 0:
+                        features[f'rsi_{param}'] = 100.0 if gain > 0 else 50.0
+                    else:
+                        features[f'rsi_{param}'] = 100.0 - 100.0 / (1.0 + gain / loss)
+
+                elif kind == 'macd':
+                    fast, slow, signal = param
+                    macd = ema[fast] - ema[slow]
+                    macd_signal = self._smooth(self.macd_signal[param], macd, 2.0 / (signal + 1))
+                    features[f'macd_{fast}_{slow}'] = macd
+                    features[f'macd_signal_{fast}_{slow}_{signal}'] = macd_signal
+                    features[f'macd_hist_{fast}_{slow}_{signal}'] = macd - macd_signal
+
+                elif kind == 'bollinger':
+                    window, num_std = param
+                    mean, std = self._price_windows[window].with_value(price)
+                    band = 2.0 * num_std * std
+                    features[f'bb_width_{window}'] = band / mean if mean else math.nan
+                    if band == 0:
+                        features[f'bb_pctb_{window}'] = 0.5
+                    else:
+                        features[f'bb_pctb_{window}'] = (price - mean) / band + 0.5
+
+                elif kind == 'atr':
+                    features[f'atr_{param}'] = self._smooth(self.atr[param], self._true_range(prev), 1.0 / param)
+
+                elif kind == 'returns':
+                    base = self._close_back(param)
+                    features[f'return_{param}'] = (price / base - 1.0) * 100 if base else math.nan
+
+        return features
+
+    def append(self, price: float, high: Optional[float] = None, low: Optional[float] = None) -> Dict[str, float]:
+        """
+        Features of a whole new bar, which is committed right away
+
+        ``high``/``low`` are the bar's range (the ATR input) when the history
+        has one; a missing price carries the previous close.
+        """
+        if price != price:
+            price = self.closes[-1]
+        if high is not None and low is not None and high == high and low == low:
+            self._bar_high, self._bar_low = high, low
+        features = self.update(price)
+        self.commit()
+        return features
+
+    def commit(self):
+        """Close the live bar: its last tick becomes a committed close"""
+        price = self._bar_close
+        if price != price:
+            return
+        prev = self.closes[-1]
+        change = price - prev
+        for period in self.ema_periods:
+            self.ema[period] = self._smooth(self.ema[period], price, 2.0 / (period + 1))
+        for period, (gain, loss) in self.rsi.items():
+            self.rsi[period] = (self._smooth(gain, max(change, 0.0), 1.0 / period),
+                                self._smooth(loss, max(-change, 0.0), 1.0 / period))
+        for (fast, slow, signal), macd_signal in self.macd_signal.items():
+            self.macd_signal[(fast, slow, signal)] = self._smooth(
+                macd_signal, self.ema[fast] - self.ema[slow], 2.0 / (signal + 1))
+        true_range = self._true_range(prev)
+        for period, atr in self.atr.items():
+            self.atr[period] = self._smooth(atr, true_range, 1.0 / period)
+
+        self.pct_changes = (self.pct_changes + [change / prev * 100 if prev else math.nan])[-7:]
+        self.closes = (self.closes + [price])[-self.lookback:]
+        self._reset_windows()
+        self._bar_high = self._bar_low = self._bar_close = math.nan
+
+    def _true_range(self, prev: float) -> float:
+        if not self.has_range:
+            return abs(self._bar_close - prev)
+        return max(self._bar_high - self._bar_low, abs(self._bar_high - prev), abs(self._bar_low - prev))
+
+    @staticmethod
+    def _smooth(previous: float, value: float, alpha: float) -> float:
+        """One step of the recursive exponential mean (seeded with ``value``)"""
+        if previous != previous:
+            return value
+        return alpha * value + (1.0 - alpha) * previous
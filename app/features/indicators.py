@@ -0,0 +1,217 @@
+"""
+Technical indicators computed in one vectorized pass over a price series
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from typing import Optional, Dict, List
+
+from app.config import Config
+from app.utils.instrumentation import timed
+
+
+INDICATOR_KINDS = ('ema', 'rsi', 'macd', 'bollinger', 'atr', 'returns')
+
+
+def forward_fill(x: np.ndarray) -> np.ndarray:
+    """Carry the last valid value over NaN gaps (leading NaNs stay NaN)"""
+    mask = np.isnan(x)
+    if not mask.any():
+        return x
+    index = np.where(mask, 0, np.arange(len(x)))
+    np.maximum.accumulate(index, out=index)
+    return x[index]
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Recursive exponential mean y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded with
+    the first valid value (pandas ``ewm(adjust=False)``), as a single IIR filter call
+    """
+    out = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if len(valid) == 0:
+        return out
+    start = valid[0]
+    out[start:], _ = lfilter([alpha], [1.0, alpha - 1.0], x[start:], zi=[(1.0 - alpha) * x[start]])
+    return out
+
+
+class IndicatorEngine:
+    """
+    Declarative technical-indicator library
+
+    The spec maps an indicator kind to its parameter sets, e.g.
+    ``{'ema': [12, 26], 'macd': [(12, 26, 9)], 'bollinger': [(20, 2.0)]}``.
+    One ``compute`` call shares intermediate work between indicators: EMAs
+    are cached by smoothing factor (MACD reuses the EMA columns), every
+    rolling mean/std comes from one pair of cumulative sums, and returns and
+    true range are taken from shifted views of the same arrays. Feature names
+    follow from the spec, so models pick new indicators up automatically.
+    """
+
+    def __init__(self, spec: Optional[Dict[str, list]] = None):
+        self.spec = Config.TECHNICAL_INDICATORS if spec is None else spec
+        unknown = [kind for kind in self.spec if kind not in INDICATOR_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown indicators {unknown}. Choose from {list(INDICATOR_KINDS)}")
+
+    def feature_names(self) -> List[str]:
+        """Output column names, in the order ``compute`` returns them"""
+        names = []
+        for kind, params in self.spec.items():
+            for param in params:
+                if kind == 'ema':
+                    names.append(f'ema_{param}')
+                elif kind == 'rsi':
+                    names.append(f'rsi_{param}')
+                elif kind == 'macd':
+                    fast, slow, signal = param
+                    names += [f'macd_{fast}_{slow}', f'macd_signal_{fast}_{slow}_{signal}',
+                              f'macd_hist_{fast}_{slow}_{signal}']
+                elif kind == 'bollinger':
+                    window, _ = param
+                    names += [f'bb_width_{window}', f'bb_pctb_{window}']
+                elif kind == 'atr':
+                    names.append(f'atr_{param}')
+                elif kind == 'returns':
+                    names.append(f'return_{param}')
+        return names
+
+    def warmup_rows(self) -> int:
+        """Leading rows for which some configured indicator is still NaN"""
+        rows = [0]
+        for kind, params in self.spec.items():
+            for param in params:
+                if kind == 'bollinger':
+                    rows.append(param[0] - 1)
+                elif kind == 'returns':
+                    rows.append(param)
+                elif kind in ('rsi', 'atr'):
+                    rows.append(1)
+        return max(rows)
+
+    @timed('features.indicators')
+    def compute(
+        self,
+        close: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute every configured indicator
+
+        Args:
+            close: Price series
+            high, low: Period high/low for ATR; close-to-close range without them
+
+        Returns:
+            Feature name -> array aligned with ``close`` (NaN during warm-up)
+        """
+        close = forward_fill(np.asarray(close, dtype=np.float64))
+        n = len(close)
+        ema_cache: Dict[float, np.ndarray] = {}
+
+        def ema(alpha: float) -> np.ndarray:
+            if alpha not in ema_cache:
+                ema_cache[alpha] = _ewm(close, alpha)
+            return ema_cache[alpha]
+
+        # Shared cumulative sums for every rolling window (centered to keep precision)
+        if self.spec.get('bollinger'):
+            valid = ~np.isnan(close)
+            center = close[valid].mean() if valid.any() else 0.0
+            centered = np.where(valid, close - center, 0.0)
+            cumsum = np.concatenate(([0.0], np.cumsum(centered)))
+            cumsum_sq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+            cumcount = np.concatenate(([0], np.cumsum(valid)))
+
+        def rolling_mean_std(window: int):
+            mean = np.full(n, np.nan)
+            std = np.full(n, np.nan)
+            if n >= window:
+                total = cumsum[window:] - cumsum[:-window]
+                total_sq = cumsum_sq[window:] - cumsum_sq[:-window]
+                mean[window - 1:] = total / window + center
+                variance = (total_sq - total * total / window) / (window - 1)
+                std[window - 1:] = np.sqrt(np.maximum(variance, 0.0))
+                # Windows reaching into leading NaNs (zeros in the sums) have no value
+                partial = np.flatnonzero(cumcount[window:] - cumcount[:-window] < window) + window - 1
+                mean[partial] = np.nan
+                std[partial] = np.nan
+            return mean, std
+
+        # Close-to-close differences, shared by RSI and ATR
+        delta = np.empty(n)
+        delta[:1] = np.nan
+        np.subtract(close[1:], close[:-1], out=delta[1:])
+
+        features = {}
+        for kind, params in self.spec.items():
+            for param in params:
+                if kind == 'ema':
+                    features[f'ema_{param}'] = ema(2.0 / (param + 1))
+
+                elif kind == 'rsi':
+                    alpha = 1.0 / param  # Wilder smoothing
+                    gain = _ewm(np.clip(delta, 0.0, None), alpha)
+                    loss = _ewm(np.clip(-delta, 0.0, None), alpha)
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+                    rsi[(loss == 0) & (gain > 0)] = 100.0
+                    rsi[(loss == 0) & (gain == 0)] = 50.0
+                    features[f'rsi_{param}'] = rsi
+
+                elif kind == 'macd':
+                    fast, slow, signal = param
+                    macd = ema(2.0 / (fast + 1)) - ema(2.0 / (slow + 1))
+                    macd_signal = _ewm(macd, 2.0 / (signal + 1))
+                    features[f'macd_{fast}_{slow}'] = macd
+                    features[f'macd_signal_{fast}_{slow}_{signal}'] = macd_signal
+                    features[f'macd_hist_{fast}_{slow}_{signal}'] = macd - macd_signal
+
+                elif kind == 'bollinger':
+                    window, num_std = param
+                    mean, std = rolling_mean_std(window)
+                    band = 2.0 * num_std * std
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        width = band / mean
+                        pctb = (close - mean) / band + 0.5
+                    pctb[band == 0] = 0.5
+                    features[f'bb_width_{window}'] = width
+                    features[f'bb_pctb_{window}'] = pctb
+
+                elif kind == 'atr':
+                    if high is not None and low is not None:
+                        high_arr = np.asarray(high, dtype=np.float64)
+                        low_arr = np.asarray(low, dtype=np.float64)
+                        true_range = high_arr - low_arr
+                        prev_close = close[:-1]
+                        np.fmax(true_range[1:], np.abs(high_arr[1:] - prev_close), out=true_range[1:])
+                        np.fmax(true_range[1:], np.abs(low_arr[1:] - prev_close), out=true_range[1:])
+                        true_range = np.where(np.isnan(true_range), np.abs(delta), true_range)
+                    else:
+                        true_range = np.abs(delta)
+                    features[f'atr_{param}'] = _ewm(true_range, 1.0 / param)
+
+                elif kind == 'returns':
+                    returns = np.full(n, np.nan)
+                    if n > param:
+                        np.divide(close[param:], close[:-param], out=returns[param:])
+                        returns[param:] -= 1.0
+                        returns[param:] *= 100
+                    features[f'return_{param}'] = returns
+
+        return features
+
+    def add_to_frame(self, df: pd.DataFrame, price_col: str = 'price') -> pd.DataFrame:
+        """Append indicator columns to a frame, using High/Low columns for ATR when present"""
+        high_col = next((col for col in ['High', 'high', 'HIGH'] if col in df.columns), None)
+        low_col = next((col for col in ['Low', 'low', 'LOW'] if col in df.columns), None)
+        features = self.compute(
+            df[price_col].to_numpy(dtype=np.float64),
+            high=pd.to_numeric(df[high_col], errors='coerce').to_numpy(dtype=np.float64) if high_col and low_col else None,
+            low=pd.to_numeric(df[low_col], errors='coerce').to_numpy(dtype=np.float64) if high_col and low_col else None
+        )
+        return pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
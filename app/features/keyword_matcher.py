@@ -0,0 +1,110 @@
+"""
+Weighted multi-keyword matching with one precompiled regex
+"""
+
+import re
+import numpy as np
+from typing import Dict, Sequence
+
+
+def _trie_pattern(terms: Sequence[str]) -> str:
+    """
+    Regex matching any of the terms, factored as a character trie
+
+    ``gold rally|gold rush|gains`` becomes ``(?:g(?:old\\s+r(?:ally|ush)|ains))``,
+    so the engine follows one path per text position instead of trying every
+    term in turn. Optional suffixes are greedy, so the longest term wins.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        is_end = '' in node
+        branches = [
+            (r'\s+' if char == ' ' else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char != ''
+        ]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if is_end else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Matches a weighted lexicon against many texts in one regex pass
+
+    The lexicon maps terms or phrases to weights (positive bullish, negative
+    bearish). Terms are lowercased and whitespace-normalized, then compiled
+    once into a single trie-shaped regex anchored on word boundaries, so
+    matching cost grows with text length rather than with lexicon size.
+    Overlapping terms resolve to the longest match ("record high" is one
+    hit, not "record high" plus "high"). Batches are matched as one joined
+    string and hits are mapped back to their article.
+    """
+
+    SEPARATOR = '\n\x00\n'
+
+    def __init__(self, lexicon: Dict[str, float]):
+        self.weights: Dict[str, float] = {}
+        for term, weight in lexicon.items():
+            key = ' '.join(str(term).lower().split())
+            if key:
+                self.weights[key] = self.weights.get(key, 0.0) + float(weight)
+        if not self.weights:
+            raise ValueError("Keyword lexicon is empty")
+
+        terms = sorted(self.weights, key=len, reverse=True)
+        self.pattern = re.compile(r'(?<!\w)' + _trie_pattern(terms) + r'(?!\w)')
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def hits(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Weighted hit totals per text
+
+        Returns:
+            (n, 2) array of summed positive (bullish) and negative (bearish,
+            as a positive number) weights
+        """
+        totals = np.zeros((len(texts), 2))
+        if not texts:
+            return totals
+
+        lowered = [text.lower() if text else '' for text in texts]
+        joined = self.SEPARATOR.join(lowered)
+        starts = np.cumsum([0] + [len(text) + len(self.SEPARATOR) for text in lowered[:-1]])
+
+        positions = []
+        weights = []
+        weight_of = self.weights
+        for match in self.pattern.finditer(joined):
+            term = match.group()
+            weight = weight_of.get(term)
+            if weight is None:  # matched across other whitespace than a single space
+                weight = weight_of[' '.join(term.split())]
+            positions.append(match.start())
+            weights.append(weight)
+
+        if positions:
+            article = np.searchsorted(starts, positions, side='right') - 1
+            weights = np.asarray(weights)
+            np.add.at(totals[:, 0], article, np.clip(weights, 0.0, None))
+            np.add.at(totals[:, 1], article, np.clip(-weights, 0.0, None))
+        return totals
+
+    def indicators(self, texts: Sequence[str]) -> np.ndarray:
+        """Net bullish share of the weighted hits per text, in [-1, 1] (0 without hits)"""
+        totals = self.hits(texts)
+        bullish, bearish = totals[:, 0], totals[:, 1]
+        total = bullish + bearish
+        return np.divide(bullish - bearish, total, out=np.zeros(len(texts)), where=total > 0)
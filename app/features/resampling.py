@@ -0,0 +1,323 @@
+"""
+Calendar-aware resampling: price points of any frequency to regular OHLC bars
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Dict, Sequence, Tuple, Union
+
+from app.config import Config
+
+
+_DAY_NS = 86_400 * 10**9
+_NAT = np.iinfo(np.int64).min
+_EPOCH = np.datetime64('1970-01-01', 'D')
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'ticks')
+
+
+def _runs(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start positions of the runs of equal values in a sorted array, and the run values"""
+    starts = np.flatnonzero(np.diff(values)) + 1
+    starts = np.concatenate([[0], starts]) if len(values) else starts
+    return starts, values[starts]
+
+
+def _per_day(day: np.ndarray, func) -> Tuple[np.ndarray, ...]:
+    """The arrays ``func`` returns for day numbers, evaluated once per distinct day"""
+    if np.all(day[1:] >= day[:-1]):
+        starts, days = _runs(day)
+        counts = np.diff(np.append(starts, len(day)))
+        return tuple(np.repeat(result, counts) for result in func(days))
+    days, inverse = np.unique(day, return_inverse=True)
+    return tuple(result[inverse] for result in func(days))
+
+
+def to_nanoseconds(times: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """int64 nanoseconds since the epoch of dates, datetimes or unix seconds (NaT -> min int64)"""
+    times = pd.Series(times) if not isinstance(times, pd.Series) else times
+    if pd.api.types.is_numeric_dtype(times):
+        seconds = times.to_numpy(dtype=np.float64)
+        ns = np.full(len(seconds), _NAT)
+        valid = np.isfinite(seconds)
+        ns[valid] = np.round(seconds[valid] * 1e9).astype(np.int64)
+        return ns
+    times = pd.to_datetime(times)
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert(None)
+    return times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+class PriceCalendar:
+    """
+    Bar calendar: business days, or fixed-length intraday bars on business days
+
+    ``frequency`` is ``'B'`` for one bar per business day, or any fixed
+    pandas frequency that divides a day (``'4h'``, ``'15min'``) for intraday
+    bars. Business days follow ``weekmask`` and ``holidays``; points on
+    other days belong to the last bar of the previous business day, so a
+    weekend quote extends Friday's bar instead of opening a new one.
+
+    Bars are numbered consecutively (numbers are contiguous across weekends
+    and holidays), which is what makes window lengths in bars equal to
+    lengths in calendar time.
+    """
+
+    def __init__(
+        self,
+        frequency: Optional[str] = None,
+        weekmask: Optional[str] = None,
+        holidays: Optional[Sequence] = None
+    ):
+        self.frequency = frequency or Config.PRICE_CALENDAR or 'B'
+        self.weekmask = weekmask or Config.PRICE_CALENDAR_WEEKMASK
+        holidays = Config.PRICE_CALENDAR_HOLIDAYS if holidays is None else holidays
+        self.holidays = np.array(list(holidays), dtype='datetime64[D]')
+        self._busdays = np.busdaycalendar(weekmask=self.weekmask, holidays=self.holidays)
+
+        if self.frequency.upper() == 'B':
+            self.bar_ns = _DAY_NS
+        else:
+            try:
+                self.bar_ns = int(pd.tseries.frequencies.to_offset(self.frequency).nanos)
+            except ValueError:
+                raise ValueError(f"Calendar frequency must be 'B' or a fixed length, got '{self.frequency}'")
+            if self.bar_ns <= 0 or _DAY_NS % self.bar_ns:
+                raise ValueError(f"Calendar frequency '{self.frequency}' does not divide a day")
+        self.bars_per_day = _DAY_NS // self.bar_ns
+
+    def _busday_numbers(self, days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(business day number, is a business day) of day numbers since the epoch"""
+        dates = days.astype('datetime64[D]')
+        rolled = np.busday_offset(dates, 0, roll='backward', busdaycal=self._busdays)
+        return np.busday_count(_EPOCH, rolled, busdaycal=self._busdays), rolled == dates
+
+    def bars(self, times_ns: np.ndarray) -> np.ndarray:
+        """Bar number of each timestamp (int64 nanoseconds since the epoch)"""
+        times_ns = np.asarray(times_ns, dtype=np.int64)
+        if not len(times_ns):
+            return np.empty(0, dtype=np.int64)
+        first, last = times_ns[0] // _DAY_NS, times_ns[-1] // _DAY_NS
+        if last < first or last - first > len(times_ns) or np.any(times_ns[1:] < times_ns[:-1]):
+            # Unsorted, or sparse (e.g. daily rows): one lookup per distinct day
+            day = times_ns // _DAY_NS
+            number, busday = _per_day(day, self._busday_numbers)
+            if self.bars_per_day == 1:
+                return number
+            within = np.where(busday, (times_ns - day * _DAY_NS) // self.bar_ns, self.bars_per_day - 1)
+            return number * self.bars_per_day + within
+
+        # Sorted: one lookup per calendar day in range, day boundaries by binary search
+        days = np.arange(first, last + 1)
+        counts = np.diff(np.concatenate([[0], np.searchsorted(times_ns, days[1:] * _DAY_NS), [len(times_ns)]]))
+        number, busday = self._busday_numbers(days)
+        if self.bars_per_day == 1:
+            return np.repeat(number, counts)
+        # On a business day the bar is the time's bar since the epoch, shifted by the days skipped so far
+        bars = times_ns // self.bar_ns
+        bars += np.repeat((number - days) * self.bars_per_day, counts)
+        starts = np.cumsum(counts) - counts
+        for i in np.flatnonzero(~busday & (counts > 0)):
+            bars[starts[i]:starts[i] + counts[i]] = (number[i] + 1) * self.bars_per_day - 1
+        return bars
+
+    def labels(self, bars: np.ndarray) -> np.ndarray:
+        """Start time (datetime64[ns]) of each bar number"""
+        number, within = np.divmod(np.asarray(bars, dtype=np.int64), self.bars_per_day)
+        start, = _per_day(number, lambda numbers: (np.busday_offset(
+            _EPOCH, numbers, roll='forward', busdaycal=self._busdays).astype(np.int64),))
+        return (start * _DAY_NS + within * self.bar_ns).astype('datetime64[ns]')
+
+
+class BarResampler:
+    """
+    OHLC bars on a calendar from time-ordered chunks of price points
+
+    Points can be ticks (a price) or bars of any coarser or finer source
+    (open/high/low/close, volume). ``update`` returns the bars the chunk
+    completed; the last bar stays open for the next chunk and ``flush``
+    returns it. Memory is bounded by the chunk size, so arbitrarily long
+    series can be resampled chunk by chunk. With ``fill``, calendar bars
+    without a point are emitted flat at the previous close (zero volume and
+    ticks), so consecutive bars are always one calendar step apart.
+    """
+
+    def __init__(self, calendar: Optional[PriceCalendar] = None, fill: bool = True):
+        self.calendar = calendar or PriceCalendar()
+        self.fill = fill
+        self._partial: Optional[Dict[str, np.ndarray]] = None
+        self._last_bar: Optional[int] = None
+        self._last_close = np.nan
+
+    def start_after(self, time_ns: int, close: float):
+        """Continue a series whose last bar contains ``time_ns`` and closed at ``close``"""
+        self._last_bar = int(self.calendar.bars(np.array([time_ns]))[0])
+        self._last_close = float(close)
+
+    def update(
+        self,
+        times_ns: np.ndarray,
+        close: np.ndarray,
+        open: Optional[np.ndarray] = None,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None,
+        ticks: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Bars completed by this chunk: ``bar`` numbers and the BAR_FIELDS arrays
+
+        ``ticks`` is the number of ticks each point stands for (1 by default),
+        so already resampled bars can be resampled again.
+        """
+        times_ns = np.asarray(times_ns, dtype=np.int64)
+        points = {'close': close, 'open': open, 'high': high, 'low': low, 'volume': volume, 'ticks': ticks}
+        points = {name: np.asarray(values, dtype=np.float64) for name, values in points.items() if values is not None}
+        valid = ~np.isnan(points['close']) & (times_ns != _NAT)
+        if not valid.all():
+            times_ns = times_ns[valid]
+            points = {name: values[valid] for name, values in points.items()}
+        if np.any(times_ns[1:] < times_ns[:-1]):
+            order = np.argsort(times_ns, kind='stable')
+            times_ns = times_ns[order]
+            points = {name: values[order] for name, values in points.items()}
+        close = points['close']
+        for name in ('open', 'high', 'low'):
+            if name in points:
+                points[name] = np.where(np.isnan(points[name]), close, points[name])
+
+        bars = self.calendar.bars(times_ns)
+        first_open = self._partial['bar'][0] if self._partial is not None else self._last_bar
+        if len(bars) and first_open is not None and (
+                bars[0] < first_open or (self._partial is None and bars[0] == first_open)):
+            raise ValueError("Price points must come after the bars already resampled")
+        if not len(bars):
+            return self._empty()
+
+        starts, bar = _runs(bars)
+        ends = np.append(starts[1:], len(bars))
+        grouped = {
+            'bar': bar,
+            'open': points.get('open', close)[starts],
+            'high': np.maximum.reduceat(points.get('high', close), starts),
+            'low': np.minimum.reduceat(points.get('low', close), starts),
+            'close': close[ends - 1],
+            'volume': np.add.reduceat(np.nan_to_num(points['volume']), starts) if 'volume' in points
+            else np.zeros(len(starts)),
+            'ticks': np.add.reduceat(np.nan_to_num(points['ticks']), starts) if 'ticks' in points
+            else (ends - starts).astype(np.float64)
+        }
+        # The bar left open by the previous chunk continues, or completes before this chunk's first
+        partial = self._partial
+        if partial is not None and partial['bar'][0] == bar[0]:
+            grouped['open'][0] = partial['open'][0]
+            grouped['high'][0] = max(grouped['high'][0], partial['high'][0])
+            grouped['low'][0] = min(grouped['low'][0], partial['low'][0])
+            grouped['volume'][0] += partial['volume'][0]
+            grouped['ticks'][0] += partial['ticks'][0]
+        elif partial is not None:
+            grouped = {name: np.concatenate([partial[name], values]) for name, values in grouped.items()}
+
+        self._partial = {name: values[-1:] for name, values in grouped.items()}
+        complete = {name: values[:-1] for name, values in grouped.items()}
+        return self._emit(complete, end=int(bar[-1]))
+
+    def flush(self) -> Dict[str, np.ndarray]:
+        """The bar still open (empty when there is none)"""
+        if self._partial is None:
+            return self._empty()
+        partial, self._partial = self._partial, None
+        return self._emit(partial, end=int(partial['bar'][0]) + 1)
+
+    def _emit(self, grouped: Dict[str, np.ndarray], end: int) -> Dict[str, np.ndarray]:
+        """Bars before ``end``: the grouped ones, plus flat ones in the gaps with ``fill``"""
+        if not self.fill or (self._last_bar is None and not len(grouped['bar'])):
+            if len(grouped['bar']):
+                self._last_bar, self._last_close = int(grouped['bar'][-1]), float(grouped['close'][-1])
+            return grouped
+
+        first = self._last_bar + 1 if self._last_bar is not None else int(grouped['bar'][0])
+        bars = np.arange(first, end, dtype=np.int64)
+        if not len(bars):
+            return self._empty()
+        position = grouped['bar'] - first
+        close = np.full(len(bars), np.nan)
+        close[position] = grouped['close']
+        index = np.zeros(len(bars), dtype=np.int64)
+        index[position] = position
+        np.maximum.accumulate(index, out=index)
+        carried = close[index]
+        carried[:position[0] if len(position) else len(bars)] = self._last_close
+
+        filled = {'bar': bars, 'close': carried}
+        for name in ('open', 'high', 'low'):
+            filled[name] = carried.copy()
+            filled[name][position] = grouped[name]
+        for name in ('volume', 'ticks'):
+            filled[name] = np.zeros(len(bars))
+            filled[name][position] = grouped[name]
+        self._last_bar, self._last_close = int(bars[-1]), float(carried[-1])
+        return filled
+
+    @staticmethod
+    def _empty() -> Dict[str, np.ndarray]:
+        empty = {name: np.empty(0) for name in BAR_FIELDS}
+        empty['bar'] = np.empty(0, dtype=np.int64)
+        return empty
+
+
+def bars_to_frame(bars: Dict[str, np.ndarray], calendar: PriceCalendar) -> pd.DataFrame:
+    """Bars as a Kaggle-shaped frame: Date, Open, High, Low, Close, Volume, Ticks"""
+    return pd.DataFrame({
+        'Date': calendar.labels(bars['bar']),
+        'Open': bars['open'],
+        'High': bars['high'],
+        'Low': bars['low'],
+        'Close': bars['close'],
+        'Volume': bars['volume'],
+        'Ticks': bars['ticks'].astype(np.int64)
+    })
+
+
+def resample_points(
+    points: Sequence[Dict[str, np.ndarray]],
+    calendar: Optional[PriceCalendar] = None,
+    after: Optional[Tuple[int, float]] = None,
+    chunk_rows: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Resample price point sets (e.g. daily history and intraday ticks) into one bar frame
+
+    Each set is a dict with ``times`` (int64 ns), ``close`` and optionally
+    ``open``/``high``/``low``/``volume``/``ticks``. Sets are merged in time order; on
+    equal times the earlier set comes first, so where sources overlap the
+    latest point sets a bar's close. ``after`` is the (time, close) of the
+    bar a previously resampled series ended with.
+    """
+    calendar = calendar or PriceCalendar()
+    chunk_rows = chunk_rows or Config.RESAMPLE_CHUNK_ROWS
+    defaults = {'open': None, 'high': None, 'low': None, 'volume': 0.0, 'ticks': 1.0}
+    merged = {}
+    for field in ('times', 'close') + tuple(defaults):
+        if field in ('times', 'close') or any(field in point_set for point_set in points):
+            merged[field] = np.concatenate([
+                point_set[field] if field in point_set
+                else point_set['close'] if defaults[field] is None
+                else np.full(len(point_set['close']), defaults[field])
+                for point_set in points
+            ]) if points else np.empty(0)
+    if len(points) > 1:
+        order = np.argsort(merged['times'], kind='stable')
+        merged = {field: values[order] for field, values in merged.items()}
+
+    resampler = BarResampler(calendar)
+    if after is not None:
+        resampler.start_after(*after)
+    parts = []
+    for i in range(0, len(merged['times']), chunk_rows):
+        parts.append(resampler.update(
+            merged['times'][i:i + chunk_rows],
+            **{field: values[i:i + chunk_rows] for field, values in merged.items() if field != 'times'}
+        ))
+    parts.append(resampler.flush())
+    bars = {name: np.concatenate([part[name] for part in parts]) for name in ('bar',) + BAR_FIELDS}
+    return bars_to_frame(bars, calendar)
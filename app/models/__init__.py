@@ -1,6 +1,10 @@
 """ML models for gold price prediction"""
 
-from .price_predictor import PricePredictor, DirectionModel, RangeModel
-
-__all__ = ['PricePredictor', 'DirectionModel', 'RangeModel']
+from .price_predictor import PricePredictor, DirectionModel, RangeModel, ModelBackend, MODEL_BACKENDS, get_backend
+from .model_registry import ModelRegistry, fingerprint_training_data
+from .training import TrainingOrchestrator, CoreBudget, core_budget
+from .prediction_memo import PredictionMemo
+from .compact import CompactForest, compact_predictor
 
+__all__ = ['PricePredictor', 'DirectionModel', 'RangeModel', 'ModelBackend', 'MODEL_BACKENDS', 'get_backend', 'ModelRegistry', 'fingerprint_training_data',
+           'TrainingOrchestrator', 'CoreBudget', 'core_budget', 'PredictionMemo', 'CompactForest', 'compact_predictor']
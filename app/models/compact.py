@@ -0,0 +1,277 @@
+"""
+Compact deployment format for the forest models: pruned, float32, flat arrays
+"""
+
+import copy
+import numpy as np
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from app.config import Config
+
+
+def _float32_below(threshold: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 <= each float64 threshold
+
+    Trees compare float32 inputs, so ``x <= t`` and ``x <= _float32_below(t)``
+    agree for every float32 ``x``: the cast loses no decisions.
+    """
+    rounded = threshold.astype(np.float32)
+    too_high = rounded.astype(np.float64) > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _prune_tree(tree, classifier: bool) -> Tuple[np.ndarray, ...]:
+    """
+    One fitted sklearn tree as (feature, threshold, children, value) arrays
+
+    Splits whose two leaves predict the same float32 value are collapsed
+    into a leaf, bottom-up, so whole subtrees with one outcome disappear.
+    Predictions are unchanged. Nodes are renumbered breadth-first with
+    siblings side by side: a split's right child is ``children + 1``.
+    """
+    left = tree.children_left.copy()
+    right = tree.children_right.copy()
+    value = tree.value[:, 0, :].astype(np.float64)
+    if classifier:
+        totals = value.sum(axis=1, keepdims=True)
+        value = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+    value = value.astype(np.float32)
+
+    # Children always come after their parent, so a reverse scan sees them first
+    for node in range(len(left) - 1, -1, -1):
+        l, r = left[node], right[node]
+        if l == -1 or left[l] != -1 or left[r] != -1:
+            continue
+        if np.array_equal(value[l], value[r]):
+            left[node] = right[node] = -1
+            value[node] = value[l]
+
+    # Renumber the reachable nodes breadth-first, each split's children as a pair
+    order = [0]
+    for node in order:
+        if left[node] != -1:
+            order.extend((left[node], right[node]))
+    order = np.array(order)
+    new_id = np.full(len(left), -1, dtype=np.int64)
+    new_id[order] = np.arange(len(order))
+
+    leaf = left[order] == -1
+    feature = np.where(leaf, -1, tree.feature[order]).astype(np.int16)
+    threshold = np.where(leaf, 0.0, _float32_below(tree.threshold[order])).astype(np.float32)
+    children = np.where(leaf, -1, new_id[np.where(leaf, 0, left[order])]).astype(np.int32)
+    return feature, threshold, children, value[order]
+
+
+class CompactForest:
+    """
+    A random forest flattened into a few numpy arrays
+
+    Every tree's nodes sit in one set of arrays (int16 features, float32
+    thresholds and leaf values, int32 child offsets), and prediction walks
+    all trees and rows together, one vectorized step per tree level over
+    the (tree, row) pairs not yet at a leaf. Offers
+    the ``predict``/``predict_proba``/``classes_`` surface DirectionModel and
+    RangeModel use, so it drops in for the sklearn forest.
+    """
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth, classes=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, forest, n_trees: Optional[int] = None) -> "CompactForest":
+        """Prune and flatten the first ``n_trees`` trees of a fitted RandomForest*"""
+        classifier = hasattr(forest, 'classes_')
+        estimators = forest.estimators_[:n_trees]
+        parts = [_prune_tree(estimator.tree_, classifier) for estimator in estimators]
+
+        sizes = np.array([len(part[0]) for part in parts])
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int32)
+        feature, threshold, children, value = (np.concatenate(column) for column in zip(*parts))
+        children = np.where(children == -1, -1, children + np.repeat(roots, sizes)).astype(np.int32)
+        max_depth = max(estimator.tree_.max_depth for estimator in estimators)
+        classes = np.asarray(forest.classes_) if classifier else None
+        return cls(feature, threshold, children, value, roots, max_depth, classes)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.children, self.value, self.roots))
+
+    def leaves(self, X: np.ndarray, n_trees: Optional[int] = None) -> np.ndarray:
+        """Leaf node of every (tree, row), shape (n_trees, n_rows)"""
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        node = np.repeat(self.roots[:n_trees, None], n_rows, axis=1).ravel()
+        X_flat = X.ravel()
+        row_start = np.tile(np.arange(n_rows) * n_features, len(node) // max(n_rows, 1))
+
+        # Walk only the (tree, row) pairs that have not reached a leaf yet
+        feature = self.feature[node]
+        active = np.flatnonzero(feature >= 0)
+        feature = feature[active]
+        while len(active):
+            current = node[active]
+            go_right = X_flat[row_start[active] + feature] > self.threshold[current]
+            current = self.children[current] + go_right
+            node[active] = current
+            feature = self.feature[current]
+            split = feature >= 0
+            active, feature = active[split], feature[split]
+        return node.reshape(-1, n_rows)
+
+    def tree_values(self, X: np.ndarray, n_trees: Optional[int] = None) -> np.ndarray:
+        """Per-tree outputs, shape (n_trees, n_rows, n_outputs)"""
+        return self.value[self.leaves(X, n_trees)]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.tree_values(X).mean(axis=0, dtype=np.float64)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        mean = self.tree_values(X).mean(axis=0, dtype=np.float64)
+        if self.classes_ is not None:
+            return self.classes_[mean.argmax(axis=1)]
+        return mean[:, 0]
+
+    def truncated(self, n_trees: int) -> "CompactForest":
+        """The first ``n_trees`` trees only"""
+        if n_trees >= self.n_trees:
+            return self
+        end = int(self.roots[n_trees])
+        return CompactForest(
+            self.feature[:end], self.threshold[:end], self.children[:end], self.value[:end],
+            self.roots[:n_trees], self.max_depth, self.classes_
+        )
+
+    def to_arrays(self, prefix: str = '') -> Dict[str, np.ndarray]:
+        arrays = {
+            'feature': self.feature, 'threshold': self.threshold, 'children': self.children,
+            'value': self.value, 'roots': self.roots, 'max_depth': np.array(self.max_depth)
+        }
+        if self.classes_ is not None:
+            arrays['classes'] = self.classes_
+        return {prefix + name: array for name, array in arrays.items()}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = '') -> "CompactForest":
+        classes = arrays[prefix + 'classes'] if prefix + 'classes' in arrays else None
+        return cls(*(arrays[prefix + name] for name in ('feature', 'threshold', 'children', 'value', 'roots')),
+                   int(arrays[prefix + 'max_depth']), classes)
+
+
+def save_compact(model, scaler: StandardScaler, filepath: Path):
+    """Write a compact model and its scaler to one ``.npz``"""
+    np.savez_compressed(
+        filepath,
+        scaler_mean=scaler.mean_.astype(np.float64),
+        scaler_scale=scaler.scale_.astype(np.float64),
+        **model.to_arrays('model_')
+    )
+
+
+def load_compact(filepath: Path) -> Tuple[CompactForest, StandardScaler]:
+    """Read a model written by ``save_compact``"""
+    with np.load(filepath, allow_pickle=False) as arrays:
+        model = CompactForest.from_arrays(arrays, 'model_')
+        scaler = StandardScaler()
+        scaler.mean_ = arrays['scaler_mean']
+        scaler.scale_ = arrays['scaler_scale']
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(scaler.mean_)
+    scaler.n_samples_seen_ = 0
+    return model, scaler
+
+
+def _prefix_length(forest: CompactForest, X: np.ndarray, y: np.ndarray, tolerance: float) -> Tuple[int, Dict]:
+    """Fewest leading trees within ``tolerance`` of the full forest on held-out rows"""
+    running = np.cumsum(forest.tree_values(X), axis=0, dtype=np.float64)
+    running /= np.arange(1, forest.n_trees + 1)[:, None, None]
+    if forest.classes_ is not None:
+        scores = (forest.classes_[running.argmax(axis=2)] == y).mean(axis=1)  # accuracy per prefix
+        acceptable = scores >= scores[-1] - tolerance
+        metric = 'accuracy'
+    else:
+        scores = np.abs(running[:, :, 0] - y).mean(axis=1)  # MAE per prefix
+        acceptable = scores <= scores[-1] * (1 + tolerance)
+        metric = 'mae'
+    acceptable[:max(Config.COMPACT_MIN_TREES, 1) - 1] = False
+    n_trees = int(np.argmax(acceptable)) + 1 if acceptable.any() else forest.n_trees
+    return n_trees, {f'full_{metric}': float(scores[-1]), metric: float(scores[n_trees - 1])}
+
+
+def compact_predictor(
+    predictor,
+    X: Optional[np.ndarray] = None,
+    y_direction: Optional[np.ndarray] = None,
+    y_range: Optional[np.ndarray] = None,
+    tolerance: Optional[float] = None
+):
+    """
+    Compact copy of a trained random-forest PricePredictor for deployment
+
+    Trees are pruned and stored as float32 (predictions unchanged). Given
+    the training matrix and targets, each forest is also cut to the fewest
+    leading trees whose accuracy (direction) stays within ``tolerance`` of
+    the full forest, or whose MAE (range) stays within ``tolerance``
+    relative, on the held-out split the models were evaluated on.
+
+    Returns:
+        (compact PricePredictor, report dict per model)
+    """
+    tolerance = Config.COMPACT_TOLERANCE if tolerance is None else tolerance
+    compact = copy.copy(predictor)
+    compact.version = None
+    report = {}
+
+    for name, y in (('direction', y_direction), ('range', y_range)):
+        model = getattr(predictor, f'{name}_model')
+        if model.backend not in (None, 'random_forest') or not hasattr(model.model, 'estimators_'):
+            raise ValueError(f"Compact export needs random_forest models, {name} model is {model.backend}")
+
+        forest = CompactForest.from_sklearn(model.model)
+        entry = {
+            'trees_total': forest.n_trees,
+            'nodes_total': sum(estimator.tree_.node_count for estimator in model.model.estimators_),
+            'nodes_pruned': forest.n_nodes
+        }
+        if X is not None and y is not None and tolerance >= 0:
+            X_test, y_test = _held_out(predictor.select_columns(X), y)
+            n_trees, scores = _prefix_length(forest, model.scaler.transform(X_test), y_test, tolerance)
+            forest = forest.truncated(n_trees)
+            entry.update(scores)
+        entry.update({'trees': forest.n_trees, 'nodes': forest.n_nodes, 'bytes': forest.nbytes})
+        report[name] = entry
+
+        compact_model = copy.copy(model)
+        compact_model.model = forest
+        setattr(compact, f'{name}_model', compact_model)
+
+    return compact, report
+
+
+def _held_out(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The test split DirectionModel/RangeModel.train scored on"""
+    valid = ~np.isnan(y)
+    _, X_test, _, y_test = train_test_split(
+        X[valid], y[valid],
+        test_size=Config.TEST_SIZE,
+        random_state=Config.MODEL_RANDOM_STATE
+    )
+    return X_test, y_test
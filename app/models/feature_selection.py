@@ -0,0 +1,140 @@
+"""
+Feature selection from permutation and impurity importances
+"""
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+from typing import Optional, Dict, List
+
+from app.config import Config
+from app.utils.instrumentation import timed
+
+
+class FeatureSelector:
+    """
+    Pick the features worth computing at serve time
+
+    Four importance vectors are combined: permutation importance of the
+    direction model (accuracy drop) and range model (MAE increase) on the
+    same held-out split the models were evaluated on, plus both forests'
+    impurity importances. Each is clipped at 0 and normalized, and a feature
+    is kept when its mean share reaches ``min_score``. Constant columns
+    (news/API features are all zero in historical training) are dropped
+    without being permuted.
+
+    All permutations are stacked into one batch per model, so the forests
+    score them in a single parallel ``predict`` call instead of one call per
+    feature and repeat.
+    """
+
+    def __init__(
+        self,
+        min_score: Optional[float] = None,
+        min_features: Optional[int] = None,
+        n_repeats: Optional[int] = None,
+        max_rows: Optional[int] = None
+    ):
+        self.min_score = Config.FEATURE_SELECTION_MIN_SCORE if min_score is None else min_score
+        self.min_features = min_features or Config.FEATURE_SELECTION_MIN_FEATURES
+        self.n_repeats = n_repeats or Config.FEATURE_SELECTION_REPEATS
+        self.max_rows = max_rows or Config.FEATURE_SELECTION_MAX_ROWS
+
+    @timed('models.feature_selection')
+    def select(
+        self,
+        predictor,
+        X: np.ndarray,
+        y_direction: np.ndarray,
+        y_range: np.ndarray,
+        feature_names: List[str]
+    ) -> Dict:
+        """
+        Score every feature of a PricePredictor trained on all columns of X
+
+        Returns:
+            Dict with the selected feature names (in original order), combined
+            scores and the individual importance vectors
+        """
+        rng = np.random.default_rng(Config.MODEL_RANDOM_STATE)
+        varying = np.flatnonzero(np.nanstd(X, axis=0) > 0)
+
+        direction = predictor.direction_model
+        X_test, y_test = self._held_out(X, y_direction, rng)
+        X_test = direction.scaler.transform(X_test)
+        baseline = np.mean(direction.model.predict(X_test) == y_test)
+        predictions = direction.model.predict(self._permuted(X_test, varying, rng))
+        accuracy = (predictions.reshape(len(varying), self.n_repeats, -1) == y_test).mean(axis=2)
+        direction_permutation = self._scatter(baseline - accuracy.mean(axis=1), varying, X.shape[1])
+
+        range_model = predictor.range_model
+        X_test, y_test = self._held_out(X, y_range, rng)
+        X_test = range_model.scaler.transform(X_test)
+        baseline = np.mean(np.abs(range_model.model.predict(X_test) - y_test))
+        predictions = range_model.model.predict(self._permuted(X_test, varying, rng))
+        mae = np.abs(predictions.reshape(len(varying), self.n_repeats, -1) - y_test).mean(axis=2)
+        range_permutation = self._scatter(mae.mean(axis=1) - baseline, varying, X.shape[1])
+
+        # Impurity importances where the backend has them (forests do, boosting does not)
+        impurity = {
+            'direction': getattr(direction.model, 'feature_importances_', None),
+            'range': getattr(range_model.model, 'feature_importances_', None)
+        }
+        importances = [direction_permutation, range_permutation] + [
+            values for values in impurity.values() if values is not None
+        ]
+        shares = []
+        for values in importances:
+            values = np.clip(values, 0.0, None)
+            total = values.sum()
+            shares.append(values / total if total > 0 else values)
+        scores = np.mean(shares, axis=0)
+
+        constant = np.ones(X.shape[1], dtype=bool)
+        constant[varying] = False
+        scores[constant] = 0.0
+        keep = (scores >= self.min_score) & ~constant
+        if keep.sum() < self.min_features:
+            ranked = [i for i in np.argsort(-scores, kind='stable') if not constant[i]]
+            keep[ranked[:self.min_features]] = True
+
+        return {
+            'selected': [name for name, kept in zip(feature_names, keep) if kept],
+            'scores': dict(zip(feature_names, scores.round(6).tolist())),
+            'permutation': {
+                'direction': dict(zip(feature_names, direction_permutation.round(6).tolist())),
+                'range': dict(zip(feature_names, range_permutation.round(6).tolist()))
+            },
+            'impurity': {
+                name: dict(zip(feature_names, values.round(6).tolist()))
+                for name, values in impurity.items() if values is not None
+            }
+        }
+
+    def _held_out(self, X: np.ndarray, y: np.ndarray, rng: np.random.Generator):
+        """The test split the model was evaluated on (same filtering and split), subsampled"""
+        valid = ~np.isnan(y)
+        _, X_test, _, y_test = train_test_split(
+            X[valid], y[valid],
+            test_size=Config.TEST_SIZE,
+            random_state=Config.MODEL_RANDOM_STATE
+        )
+        if len(X_test) > self.max_rows:
+            rows = rng.choice(len(X_test), self.max_rows, replace=False)
+            X_test, y_test = X_test[rows], y_test[rows]
+        return X_test, y_test
+
+    def _permuted(self, X: np.ndarray, columns: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Stack n_repeats copies of X per column, each with that column shuffled"""
+        n = len(X)
+        stacked = np.tile(X, (len(columns) * self.n_repeats, 1))
+        for i, column in enumerate(columns):
+            for repeat in range(self.n_repeats):
+                start = (i * self.n_repeats + repeat) * n
+                stacked[start:start + n, column] = X[rng.permutation(n), column]
+        return stacked
+
+    @staticmethod
+    def _scatter(values: np.ndarray, columns: np.ndarray, width: int) -> np.ndarray:
+        full = np.zeros(width)
+        full[columns] = values
+        return full
@@ -0,0 +1,363 @@
+"""
+Versioned model storage with atomic promotion, rollback and hot-swap
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import threading
+import uuid
+import weakref
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Callable
+
+from app.config import Config
+from app.models.price_predictor import PricePredictor
+from app.utils.instrumentation import timed
+
+
+MODEL_FILES = ("direction_model.pkl", "range_model.pkl", "features.json")
+COMPACT_MODEL_FILES = ("direction_model.npz", "range_model.npz", "features.json")
+
+
+def fingerprint_training_data(X: np.ndarray, *targets: np.ndarray) -> Dict:
+    """Hash and shape of the training matrix and targets a version was fitted on"""
+    digest = hashlib.sha256()
+    for array in (X,) + targets:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype.str, array.shape)).encode())
+        digest.update(array.tobytes())
+    return {
+        'sha256': digest.hexdigest(),
+        'rows': int(X.shape[0]),
+        'columns': int(X.shape[1]) if X.ndim > 1 else 1
+    }
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fsync_dir(path: Path):
+    """Persist a rename in a directory (no-op where directories cannot be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ModelRegistry:
+    """
+    Immutable model versions under ``<models_dir>/versions/<version>/``
+
+    A version is written to a staging directory, fsynced and renamed into
+    place, so readers never see a partial directory. The ``CURRENT`` pointer
+    file (``{"version": ..., "previous": ...}``) is replaced with
+    ``os.replace``, making promotion and rollback atomic. Each version has a
+    ``manifest.json`` with file hashes, the training data fingerprint and
+    metrics. The ``MODEL_CACHE_SIZE`` most recently used versions are cached
+    per process (production and shadow versions alike), and one watcher
+    thread per directory serves every app, so any number of apps watching the
+    same directory load a new version once.
+    """
+
+    _loaded: "OrderedDict[Tuple[Path, str], Tuple[PricePredictor, Dict]]" = OrderedDict()
+    _load_locks: Dict[Tuple[Path, str], threading.Lock] = {}
+    _watchers: Dict[Path, "_RegistryWatcher"] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, models_dir: Optional[Path] = None):
+        self.models_dir = Path(models_dir or Config.MODELS_DIR)
+        self.versions_dir = self.models_dir / "versions"
+        self.pointer_path = self.models_dir / "CURRENT"
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @timed('models.registry.publish')
+    def publish(
+        self,
+        predictor: PricePredictor,
+        metrics: Optional[Dict] = None,
+        data_fingerprint: Optional[Dict] = None,
+        promote: bool = True
+    ) -> str:
+        """
+        Save a trained predictor as a new immutable version
+
+        Returns:
+            The version id (``YYYYmmdd-HHMMSS-<hash>``)
+        """
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.versions_dir / f".staging-{uuid.uuid4().hex}"
+        try:
+            predictor.save_models(staging)
+            names = COMPACT_MODEL_FILES if predictor.is_compact else MODEL_FILES
+            files = {name: _file_sha256(staging / name) for name in names}
+            model_hash = hashlib.sha256(''.join(files[name] for name in names).encode()).hexdigest()
+            created = datetime.now()
+            version = f"{created:%Y%m%d-%H%M%S}-{model_hash[:8]}"
+
+            manifest = {
+                'version': version,
+                'created_at': created.isoformat(),
+                'model_hash': model_hash,
+                'files': files,
+                'data_fingerprint': data_fingerprint,
+                'metrics': _summarize_metrics(metrics or {}),
+                'feature_names': predictor.feature_names,
+                'selected_features': predictor.selected_features,
+                'backend': predictor.direction_model.backend,
+                'compact': predictor.is_compact
+            }
+            (staging / "manifest.json").write_text(json.dumps(manifest, indent=2, default=float))
+
+            for path in staging.iterdir():
+                with open(path, 'rb') as f:
+                    os.fsync(f.fileno())
+            _fsync_dir(staging)
+
+            target = self.versions_dir / version
+            if target.exists():
+                # Same second and same model bytes: the version already exists
+                shutil.rmtree(staging)
+            else:
+                os.rename(staging, target)
+                _fsync_dir(self.versions_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # The publishing process already holds this version: watchers must not load it again
+        predictor.version = version
+        self._remember(version, predictor, manifest)
+        if promote:
+            self.promote(version)
+        self.prune()
+        return version
+
+    def promote(self, version: str):
+        """Atomically make a version current"""
+        if not (self.versions_dir / version / "manifest.json").exists():
+            raise FileNotFoundError(f"Model version '{version}' not found in {self.versions_dir}")
+
+        current = self.current_version()
+        pointer = {
+            'version': version,
+            'previous': current if current != version else self._read_pointer().get('previous'),
+            'promoted_at': datetime.now().isoformat()
+        }
+        tmp = self.pointer_path.with_name(f".CURRENT-{uuid.uuid4().hex}")
+        with open(tmp, 'w') as f:
+            json.dump(pointer, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.pointer_path)
+        _fsync_dir(self.models_dir)
+
+    def rollback(self) -> str:
+        """Make the previously current version current again"""
+        previous = self._read_pointer().get('previous')
+        if not previous:
+            raise ValueError("No previous model version to roll back to")
+        self.promote(previous)
+        return previous
+
+    def prune(self, keep: Optional[int] = None):
+        """Delete the oldest versions beyond ``keep``, never the current, previous or shadow ones"""
+        keep = keep or Config.MODEL_VERSIONS_KEEP
+        pointer = self._read_pointer()
+        protected = {pointer.get('version'), pointer.get('previous'), *Config.SHADOW_MODEL_VERSIONS}
+        versions = self.list_versions()
+        for version in versions[:max(0, len(versions) - keep)]:
+            if version not in protected:
+                shutil.rmtree(self.versions_dir / version, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def current_version(self) -> Optional[str]:
+        """Version the CURRENT pointer names (None before the first publish)"""
+        return self._read_pointer().get('version')
+
+    def list_versions(self) -> List[str]:
+        """Published versions, oldest first"""
+        if not self.versions_dir.exists():
+            return []
+        return sorted(
+            path.name for path in self.versions_dir.iterdir()
+            if not path.name.startswith('.') and (path / "manifest.json").exists()
+        )
+
+    def manifest(self, version: Optional[str] = None) -> Dict:
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No current model version in {self.models_dir}")
+        return json.loads((self.versions_dir / version / "manifest.json").read_text())
+
+    def has_models(self) -> bool:
+        """Whether a current version (or legacy unversioned models) exists"""
+        if self.current_version():
+            return True
+        return any(
+            all((self.models_dir / name).exists() for name in names[:2])
+            for names in (MODEL_FILES, COMPACT_MODEL_FILES)
+        )
+
+    @timed('models.registry.load')
+    def load(self, version: Optional[str] = None) -> PricePredictor:
+        """
+        Load a version (the current one by default), verifying file hashes
+
+        Models saved before versioning (flat files in models_dir) load as
+        version None. Each version is loaded at most once per process.
+        """
+        version = version or self.current_version()
+        if version is None:
+            predictor = PricePredictor()
+            predictor.load_models(self.models_dir)
+            return predictor
+
+        key = (self.models_dir.resolve(), version)
+        with self._cache_lock:
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+                return self._loaded[key][0]
+            lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._cache_lock:
+                if key in self._loaded:
+                    return self._loaded[key][0]
+
+            manifest = self.manifest(version)
+            version_dir = self.versions_dir / version
+            for name, expected in manifest['files'].items():
+                if _file_sha256(version_dir / name) != expected:
+                    raise ValueError(f"Model version '{version}' is corrupt: {name} hash mismatch")
+
+            predictor = PricePredictor()
+            predictor.load_models(version_dir)
+            predictor.version = version
+
+            self._remember(version, predictor, manifest)
+            return predictor
+
+    def watch(
+        self,
+        on_change: Callable[[PricePredictor], None],
+        current: Optional[str] = None,
+        interval: Optional[float] = None
+    ) -> threading.Event:
+        """
+        Hand newly promoted versions (already loaded) to ``on_change``
+
+        One daemon thread per models directory polls the CURRENT pointer for
+        every subscriber and exits when none are left. Bound methods are held
+        weakly, so an app that is garbage collected (e.g. a closed dashboard
+        session) unsubscribes itself.
+
+        Returns:
+            Event that unsubscribes ``on_change`` when set
+        """
+        stop = threading.Event()
+        callback = weakref.WeakMethod(on_change) if inspect.ismethod(on_change) else (lambda: on_change)
+        directory = self.models_dir.resolve()
+        with self._cache_lock:
+            watcher = self._watchers.get(directory)
+            if watcher is None:
+                watcher = _RegistryWatcher(ModelRegistry(directory), interval or Config.MODEL_RELOAD_INTERVAL)
+                self._watchers[directory] = watcher
+                watcher.start()
+            watcher.subscribers.append([callback, stop, current])
+        return stop
+
+    def _remember(self, version: str, predictor: PricePredictor, manifest: Dict):
+        """Cache a loaded version, evicting the least recently used beyond ``MODEL_CACHE_SIZE``"""
+        key = (self.models_dir.resolve(), version)
+        with self._cache_lock:
+            self._loaded[key] = (predictor, manifest)
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > max(1, Config.MODEL_CACHE_SIZE):
+                evicted, _ = self._loaded.popitem(last=False)
+                self._load_locks.pop(evicted, None)
+
+    def _read_pointer(self) -> Dict:
+        try:
+            return json.loads(self.pointer_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+
+class _RegistryWatcher:
+    """Polling thread shared by every subscriber watching one models directory"""
+
+    def __init__(self, registry: ModelRegistry, interval: float):
+        self.registry = registry
+        self.interval = interval
+        self.subscribers: List[list] = []  # [callback reference, stop event, version handed over]
+
+    def start(self):
+        threading.Thread(target=self._run, name='model-watcher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with ModelRegistry._cache_lock:
+                self.subscribers = [
+                    entry for entry in self.subscribers
+                    if not entry[1].is_set() and entry[0]() is not None
+                ]
+                if not self.subscribers:
+                    del ModelRegistry._watchers[self.registry.models_dir]
+                    return
+                subscribers = list(self.subscribers)
+
+            try:
+                self._notify(subscribers)
+            except Exception as e:
+                print(f"Model reload failed: {e}")
+
+    def _notify(self, subscribers: List[list]):
+        """Hand the current version to subscribers that have not seen it (no reference outlives the call)"""
+        version = self.registry.current_version()
+        if version is None:
+            return
+        for entry in subscribers:
+            on_change = entry[0]()
+            if entry[2] == version or on_change is None:
+                continue
+            on_change(self.registry.load(version))
+            entry[2] = version
+
+
+def _summarize_metrics(metrics: Dict) -> Dict:
+    """Headline metrics for the manifest (metrics that were not measured are left out)"""
+    summary = {}
+    for section, metric, key in (
+        ('direction', 'accuracy', 'direction_accuracy'),
+        ('range', 'mae', 'range_mae'),
+        ('range', 'rmse', 'range_rmse')
+    ):
+        value = metrics.get(section, {}).get(metric)
+        if value is not None:
+            summary[key] = float(value)
+    return summary
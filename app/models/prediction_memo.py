@@ -0,0 +1,91 @@
+"""
+LRU memo of single-row predictions, keyed by the quantized feature vector and model version
+"""
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Dict, Hashable
+
+from app.config import Config
+from app.utils.instrumentation import timed
+
+
+class PredictionMemo:
+    """
+    Returns the previous result when the same model sees the same features again
+
+    Dashboard refreshes between price ticks and news updates feed identical
+    inputs to the forests. Features are rounded to ``PREDICTION_MEMO_DECIMALS``
+    (so float noise from recomputing them does not defeat the memo) and their
+    bytes, together with the model version, form the key. Passing a different
+    predictor than the last call clears the memo, so a hot-swapped or
+    retrained model never serves its predecessor's results.
+    """
+
+    def __init__(self, size: Optional[int] = None, decimals: Optional[int] = None):
+        self.size = Config.PREDICTION_MEMO_SIZE if size is None else size
+        self.decimals = Config.PREDICTION_MEMO_DECIMALS if decimals is None else decimals
+        self._cache: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._predictor = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key(self, predictor, X: np.ndarray) -> Hashable:
+        """Model version plus the quantized feature bytes"""
+        quantized = np.round(np.asarray(X, dtype=np.float64), self.decimals) + 0.0  # -0.0 and 0.0 alike
+        return (predictor.version or id(predictor), quantized.shape, quantized.tobytes())
+
+    def invalidate(self):
+        """Forget every memoized prediction"""
+        with self._lock:
+            self._cache.clear()
+            self._predictor = None
+            self.invalidations += 1
+
+    @timed('models.memo.predict')
+    def predict(self, predictor, X: np.ndarray) -> Dict:
+        """``predictor.predict(X)``, from the memo when this model already scored these features"""
+        if self.size <= 0:
+            return predictor.predict(X)
+
+        key = self.key(predictor, X)
+        with self._lock:
+            if predictor is not self._predictor:
+                if self._predictor is not None:
+                    self.invalidations += 1
+                self._cache.clear()
+                self._predictor = predictor
+            elif key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return dict(self._cache[key])
+            self.misses += 1
+
+        prediction = predictor.predict(X)
+
+        with self._lock:
+            if predictor is self._predictor:
+                self._cache[key] = dict(prediction)
+                while len(self._cache) > self.size:
+                    self._cache.popitem(last=False)
+        return prediction
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hit_rate,
+                'invalidations': self.invalidations,
+                'entries': len(self._cache),
+                'size': self.size
+            }
@@ -6,25 +6,127 @@ import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.ensemble import (
+    RandomForestClassifier, RandomForestRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
 from sklearn.metrics import accuracy_score, classification_report, mean_absolute_error, mean_squared_error
+import json
 import joblib
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 
 from app.config import Config
+from app.models.feature_selection import FeatureSelector
+from app.models.compact import CompactForest, save_compact, load_compact
+from app.models.training import TrainingOrchestrator, CoreBudget
+from app.utils.instrumentation import timed
+
+
+class ModelBackend(ABC):
+    """Estimator family behind DirectionModel and RangeModel"""
+    
+    name: str = ''
+    
+    @abstractmethod
+    def classifier(self, n_jobs: int):
+        """Unfitted direction classifier"""
+    
+    @abstractmethod
+    def regressor(self, n_jobs: int):
+        """Unfitted price change regressor"""
+    
+    def fit(self, model, X: np.ndarray, y: np.ndarray, n_jobs: int):
+        """Fit on ``n_jobs`` cores (estimators that take n_jobs were built with it)"""
+        return model.fit(X, y)
+
+
+class RandomForestBackend(ModelBackend):
+    """Random forests of deep trees (RF_* settings)"""
+    
+    name = 'random_forest'
+    
+    def classifier(self, n_jobs: int):
+        return RandomForestClassifier(
+            n_estimators=Config.RF_CLASSIFIER_N_ESTIMATORS,
+            max_depth=Config.RF_CLASSIFIER_MAX_DEPTH,
+            random_state=Config.MODEL_RANDOM_STATE,
+            n_jobs=n_jobs
+        )
+    
+    def regressor(self, n_jobs: int):
+        return RandomForestRegressor(
+            n_estimators=Config.RF_REGRESSOR_N_ESTIMATORS,
+            max_depth=Config.RF_REGRESSOR_MAX_DEPTH,
+            random_state=Config.MODEL_RANDOM_STATE,
+            n_jobs=n_jobs
+        )
+
+
+class HistGradientBoostingBackend(ModelBackend):
+    """
+    Histogram-based gradient boosting (HGB_* settings)
+    
+    Features are binned once into at most 255 buckets and shallow trees are
+    grown sequentially on the bins, so fitting scales with rows rather than
+    with sorted feature values and the models are a fraction of the forests'
+    size. Its OpenMP threads are capped at ``n_jobs`` while fitting.
+    """
+    
+    name = 'hist_gradient_boosting'
+    
+    def classifier(self, n_jobs: int):
+        return HistGradientBoostingClassifier(
+            max_iter=Config.HGB_MAX_ITER,
+            learning_rate=Config.HGB_LEARNING_RATE,
+            max_leaf_nodes=Config.HGB_MAX_LEAF_NODES,
+            max_depth=Config.HGB_MAX_DEPTH,
+            random_state=Config.MODEL_RANDOM_STATE
+        )
+    
+    def regressor(self, n_jobs: int):
+        return HistGradientBoostingRegressor(
+            max_iter=Config.HGB_MAX_ITER,
+            learning_rate=Config.HGB_LEARNING_RATE,
+            max_leaf_nodes=Config.HGB_MAX_LEAF_NODES,
+            max_depth=Config.HGB_MAX_DEPTH,
+            random_state=Config.MODEL_RANDOM_STATE
+        )
+    
+    def fit(self, model, X: np.ndarray, y: np.ndarray, n_jobs: int):
+        from threadpoolctl import threadpool_limits
+        
+        with threadpool_limits(limits=n_jobs if n_jobs and n_jobs > 0 else None, user_api='openmp'):
+            return model.fit(X, y)
+
+
+MODEL_BACKENDS: Dict[str, ModelBackend] = {
+    backend.name: backend for backend in (RandomForestBackend(), HistGradientBoostingBackend())
+}
+
+
+def get_backend(name: Optional[str] = None) -> ModelBackend:
+    """The named model backend (Config.MODEL_BACKEND by default)"""
+    name = name or Config.MODEL_BACKEND
+    if name not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown model backend '{name}'. Choose from {list(MODEL_BACKENDS)}")
+    return MODEL_BACKENDS[name]
 
 
 class DirectionModel:
     """Model to predict gold price direction (UP/DOWN)"""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend  # None: Config.MODEL_BACKEND at training time
         self.model = None
         self.scaler = None
         self.feature_names = None
     
-    def train(self, X: np.ndarray, y: np.ndarray, feature_names: Optional[list] = None) -> Dict:
-        """Train the direction prediction model"""
+    @timed('models.direction.train')
+    def train(self, X: np.ndarray, y: np.ndarray, feature_names: Optional[list] = None,
+              n_jobs: Optional[int] = None) -> Dict:
+        """Train the direction prediction model (on ``n_jobs`` cores, Config.RF_N_JOBS by default)"""
         # Remove NaN values
         valid_mask = ~np.isnan(y)
         X_clean = X[valid_mask]
@@ -46,14 +148,10 @@ class DirectionModel:
         X_test_scaled = self.scaler.transform(X_test)
         
         # Train model
-        self.model = RandomForestClassifier(
-            n_estimators=Config.RF_CLASSIFIER_N_ESTIMATORS,
-            max_depth=Config.RF_CLASSIFIER_MAX_DEPTH,
-            random_state=Config.MODEL_RANDOM_STATE,
-            n_jobs=-1
-        )
-        
-        self.model.fit(X_train_scaled, y_train)
+        backend = get_backend(self.backend)
+        n_jobs = n_jobs or Config.RF_N_JOBS
+        self.model = backend.fit(backend.classifier(n_jobs), X_train_scaled, y_train, n_jobs)
+        self.backend = backend.name
         self.feature_names = feature_names
         
         # Evaluate
@@ -67,6 +165,7 @@ class DirectionModel:
         
         return metrics
     
+    @timed('models.direction.predict')
     def predict(self, X: np.ndarray) -> Tuple[str, float]:
         """
         Predict price direction
@@ -84,35 +183,64 @@ class DirectionModel:
         
         return direction, confidence
     
+    @timed('models.direction.predict_batch')
+    def predict_batch(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict price direction for every row of X
+        Returns: (up_probability, confidence) arrays; direction is UP where up_probability > 0.5
+        """
+        if self.model is None or self.scaler is None:
+            raise ValueError("Model not trained. Call train() first.")
+        
+        proba = self.model.predict_proba(self.scaler.transform(X))
+        classes = list(self.model.classes_)
+        up_probability = proba[:, classes.index(1)] if 1 in classes else np.zeros(len(X))
+        confidence = proba.max(axis=1) * 100
+        
+        return up_probability, confidence
+    
+    @timed('models.direction.save')
     def save(self, filepath: Path):
-        """Save model to file"""
+        """Save model to file (a compact model to ``.npz``)"""
         if self.model is None:
             raise ValueError("Model not trained")
+        if isinstance(self.model, CompactForest):
+            save_compact(self.model, self.scaler, filepath)
+            return
         
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
-            'feature_names': self.feature_names
+            'feature_names': self.feature_names,
+            'backend': self.backend
         }
         joblib.dump(model_data, filepath)
     
+    @timed('models.direction.load')
     def load(self, filepath: Path):
-        """Load model from file"""
+        """Load model from file (joblib ``.pkl`` or compact ``.npz``)"""
+        if filepath.suffix == '.npz':
+            self.model, self.scaler = load_compact(filepath)
+            self.backend = RandomForestBackend.name
+            return
         model_data = joblib.load(filepath)
         self.model = model_data['model']
         self.scaler = model_data['scaler']
         self.feature_names = model_data.get('feature_names')
+        self.backend = model_data.get('backend', RandomForestBackend.name)
 
 
 class RangeModel:
     """Model to predict gold price range (amount of change)"""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend  # None: Config.MODEL_BACKEND at training time
         self.model = None
         self.scaler = None
     
-    def train(self, X: np.ndarray, y: np.ndarray) -> Dict:
-        """Train the price range prediction model"""
+    @timed('models.range.train')
+    def train(self, X: np.ndarray, y: np.ndarray, n_jobs: Optional[int] = None) -> Dict:
+        """Train the price range prediction model (on ``n_jobs`` cores, Config.RF_N_JOBS by default)"""
         # Remove NaN values
         valid_mask = ~np.isnan(y)
         X_clean = X[valid_mask]
@@ -134,14 +262,10 @@ class RangeModel:
         X_test_scaled = self.scaler.transform(X_test)
         
         # Train model
-        self.model = RandomForestRegressor(
-            n_estimators=Config.RF_REGRESSOR_N_ESTIMATORS,
-            max_depth=Config.RF_REGRESSOR_MAX_DEPTH,
-            random_state=Config.MODEL_RANDOM_STATE,
-            n_jobs=-1
-        )
-        
-        self.model.fit(X_train_scaled, y_train)
+        backend = get_backend(self.backend)
+        n_jobs = n_jobs or Config.RF_N_JOBS
+        self.model = backend.fit(backend.regressor(n_jobs), X_train_scaled, y_train, n_jobs)
+        self.backend = backend.name
         
         # Evaluate
         y_pred = self.model.predict(X_test_scaled)
@@ -157,6 +281,7 @@ class RangeModel:
         
         return metrics
     
+    @timed('models.range.predict')
     def predict(self, X: np.ndarray) -> float:
         """Predict price change amount"""
         if self.model is None or self.scaler is None:
@@ -166,47 +291,123 @@ class RangeModel:
         prediction = self.model.predict(X_scaled)[0]
         return float(prediction)
     
+    @timed('models.range.predict_batch')
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predict price change amount for every row of X"""
+        if self.model is None or self.scaler is None:
+            raise ValueError("Model not trained. Call train() first.")
+        
+        return self.model.predict(self.scaler.transform(X))
+    
+    @timed('models.range.save')
     def save(self, filepath: Path):
-        """Save model to file"""
+        """Save model to file (a compact model to ``.npz``)"""
         if self.model is None:
             raise ValueError("Model not trained")
+        if isinstance(self.model, CompactForest):
+            save_compact(self.model, self.scaler, filepath)
+            return
         
         model_data = {
             'model': self.model,
-            'scaler': self.scaler
+            'scaler': self.scaler,
+            'backend': self.backend
         }
         joblib.dump(model_data, filepath)
     
+    @timed('models.range.load')
     def load(self, filepath: Path):
-        """Load model from file"""
+        """Load model from file (joblib ``.pkl`` or compact ``.npz``)"""
+        if filepath.suffix == '.npz':
+            self.model, self.scaler = load_compact(filepath)
+            self.backend = RandomForestBackend.name
+            return
         model_data = joblib.load(filepath)
         self.model = model_data['model']
         self.scaler = model_data['scaler']
+        self.backend = model_data.get('backend', RandomForestBackend.name)
 
 
 class PricePredictor:
     """Main predictor class combining direction and range models"""
     
-    def __init__(self):
-        self.direction_model = DirectionModel()
-        self.range_model = RangeModel()
+    def __init__(self, backend: Optional[str] = None):
+        self.direction_model = DirectionModel(backend)
+        self.range_model = RangeModel(backend)
+        self.feature_names: Optional[List[str]] = None  # every feature the models were offered
+        self.selected_features: Optional[List[str]] = None  # the subset they use
+        self.feature_selection: Optional[Dict] = None
+        self.version: Optional[str] = None  # set by ModelRegistry
     
+    @timed('models.train')
     def train(self, X: np.ndarray, y_direction: np.ndarray, y_range: np.ndarray,
-              feature_names: Optional[list] = None) -> Dict:
-        """Train both models"""
-        print("Training direction model...")
-        direction_metrics = self.direction_model.train(X, y_direction, feature_names)
+              feature_names: Optional[list] = None, n_jobs: Optional[int] = None) -> Dict:
+        """
+        Train both models, then retrain on the selected features if selection is enabled
         
-        print("Training range model...")
-        range_metrics = self.range_model.train(X, y_range)
+        The direction and range models train concurrently on a share of the
+        core budget each (``n_jobs`` cores in total, the shared
+        Config.TRAINING_CORES budget by default).
+        """
+        self.feature_names = list(feature_names) if feature_names else None
+        self.selected_features = self.feature_names
+        self.feature_selection = None
+        budget = CoreBudget(n_jobs) if n_jobs else None
         
-        return {
+        print("Training direction and range models...")
+        direction_metrics, range_metrics = self._fit(X, y_direction, y_range, feature_names, budget)
+        
+        metrics = {
             'direction': direction_metrics,
             'range': range_metrics
         }
+        
+        if Config.FEATURE_SELECTION_ENABLED and self.feature_names:
+            print("Selecting features...")
+            self.feature_selection = FeatureSelector().select(self, X, y_direction, y_range, self.feature_names)
+            selected = self.feature_selection['selected']
+            
+            if len(selected) < len(self.feature_names):
+                print(f"Retraining on {len(selected)} of {len(self.feature_names)} features...")
+                columns = [self.feature_names.index(name) for name in selected]
+                metrics['direction'], metrics['range'] = self._fit(X[:, columns], y_direction, y_range, selected, budget)
+                self.selected_features = selected
+            
+            metrics['feature_selection'] = {
+                'selected': selected,
+                'dropped': [name for name in self.feature_names if name not in selected],
+                'full_accuracy': direction_metrics['accuracy'],
+                'full_mae': range_metrics['mae']
+            }
+        
+        return metrics
+    
+    def _fit(self, X: np.ndarray, y_direction: np.ndarray, y_range: np.ndarray,
+             feature_names: Optional[list], budget: Optional[CoreBudget]) -> Tuple[Dict, Dict]:
+        """Fit the direction and range models side by side"""
+        results = TrainingOrchestrator(budget).run({
+            'direction': lambda n_jobs: self.direction_model.train(X, y_direction, feature_names, n_jobs=n_jobs),
+            'range': lambda n_jobs: self.range_model.train(X, y_range, n_jobs=n_jobs)
+        })
+        return results['direction'], results['range']
     
+    def select_columns(self, X: np.ndarray) -> np.ndarray:
+        """Reduce a full feature matrix to the selected features (pruned input passes through)"""
+        if self.selected_features is None or self.selected_features == self.feature_names:
+            return X
+        if X.shape[1] == len(self.selected_features):
+            return X
+        if X.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"Expected {len(self.selected_features)} selected or {len(self.feature_names)} features, "
+                f"got {X.shape[1]}"
+            )
+        return X[:, [self.feature_names.index(name) for name in self.selected_features]]
+    
+    @timed('models.predict')
     def predict(self, X: np.ndarray) -> Dict:
         """Make predictions with both models"""
+        X = self.select_columns(X)
         direction, confidence = self.direction_model.predict(X)
         price_change = self.range_model.predict(X)
         
@@ -216,14 +417,49 @@ class PricePredictor:
             'price_change': price_change
         }
     
+    @timed('models.predict_batch')
+    def predict_batch(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Make predictions with both models for every row of X"""
+        X = self.select_columns(X)
+        up_probability, confidence = self.direction_model.predict_batch(X)
+        price_change = self.range_model.predict_batch(X)
+        
+        return {
+            'direction': (up_probability > 0.5).astype(np.int8),  # 1 = UP, 0 = DOWN
+            'up_probability': up_probability,
+            'confidence': confidence,
+            'price_change': price_change
+        }
+    
+    @property
+    def is_compact(self) -> bool:
+        """Whether the models are compact exports (see app.models.compact)"""
+        return isinstance(self.direction_model.model, CompactForest)
+    
+    @timed('models.save_models')
     def save_models(self, models_dir: Path):
-        """Save both models"""
-        models_dir.mkdir(exist_ok=True)
-        self.direction_model.save(models_dir / "direction_model.pkl")
-        self.range_model.save(models_dir / "range_model.pkl")
+        """Save both models (joblib pickles, or ``.npz`` files for compact models)"""
+        models_dir.mkdir(parents=True, exist_ok=True)
+        suffix = '.npz' if self.is_compact else '.pkl'
+        self.direction_model.save(models_dir / f"direction_model{suffix}")
+        self.range_model.save(models_dir / f"range_model{suffix}")
+        (models_dir / "features.json").write_text(json.dumps({
+            'feature_names': self.feature_names,
+            'selected_features': self.selected_features,
+            'feature_selection': self.feature_selection
+        }, indent=2))
     
+    @timed('models.load_models')
     def load_models(self, models_dir: Path):
-        """Load both models"""
-        self.direction_model.load(models_dir / "direction_model.pkl")
-        self.range_model.load(models_dir / "range_model.pkl")
+        """Load both models (compact ``.npz`` exports are picked up transparently)"""
+        suffix = '.npz' if (models_dir / "direction_model.npz").exists() else '.pkl'
+        self.direction_model.load(models_dir / f"direction_model{suffix}")
+        self.range_model.load(models_dir / f"range_model{suffix}")
+        
+        # Models saved without feature selection use every feature
+        features_path = models_dir / "features.json"
+        features = json.loads(features_path.read_text()) if features_path.exists() else {}
+        self.feature_names = features.get('feature_names') or self.direction_model.feature_names
+        self.selected_features = features.get('selected_features') or self.feature_names
+        self.feature_selection = features.get('feature_selection')
 
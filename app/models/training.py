@@ -0,0 +1,98 @@
+"""
+Concurrent model training under a shared, bounded core budget
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Callable, Any
+
+from app.config import Config
+
+
+class CoreBudget:
+    """Pool of CPU cores that concurrently training jobs draw their ``n_jobs`` from"""
+
+    def __init__(self, total: int):
+        self.total = max(1, int(total))
+        self.available = self.total
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def cores(self, requested: int):
+        """Hold up to ``requested`` cores (blocking until free) and yield how many were granted"""
+        granted = max(1, min(requested, self.total))
+        with self._condition:
+            self._condition.wait_for(lambda: self.available >= granted)
+            self.available -= granted
+        try:
+            yield granted
+        finally:
+            with self._condition:
+                self.available += granted
+                self._condition.notify_all()
+
+
+_budget: Optional[CoreBudget] = None
+_budget_lock = threading.Lock()
+_held = threading.local()
+
+
+def core_budget() -> CoreBudget:
+    """Process-wide budget of ``Config.TRAINING_CORES`` (all cores when 0)"""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = CoreBudget(Config.TRAINING_CORES or os.cpu_count() or 1)
+        return _budget
+
+
+class TrainingOrchestrator:
+    """
+    Fit several models at once without oversubscribing the CPU
+
+    Jobs run on threads (forest fitting releases the GIL) and each holds a
+    share of the core budget for its whole fit, passed to it as ``n_jobs``.
+    All orchestrators share the process-wide budget, so a tuning sweep and a
+    regular retrain together never use more than ``Config.TRAINING_CORES``.
+    A job that starts its own orchestrator (e.g. ``PricePredictor.train``
+    inside a backtest) splits the cores it already holds instead of
+    drawing more, which also rules out nested-wait deadlocks.
+    """
+
+    def __init__(self, budget: Optional[CoreBudget] = None):
+        held = getattr(_held, 'cores', None)
+        self.budget = budget or (CoreBudget(held) if held else core_budget())
+
+    def run(self, jobs: Dict[str, Callable[[int], Any]], cores_per_job: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run jobs concurrently
+
+        Args:
+            jobs: Name -> callable taking the number of cores (``n_jobs``) it may use
+            cores_per_job: Cores per job (defaults to an even split of the budget)
+
+        Returns:
+            Name -> job result, in the order of ``jobs``
+        """
+        if not jobs:
+            return {}
+
+        concurrency = min(len(jobs), self.budget.total)
+        per_job = cores_per_job or max(1, self.budget.total // concurrency)
+
+        def run_job(job: Callable[[int], Any]) -> Any:
+            with self.budget.cores(per_job) as n_jobs:
+                _held.cores = n_jobs
+                try:
+                    return job(n_jobs)
+                finally:
+                    _held.cores = None
+
+        if concurrency == 1:
+            return {name: run_job(job) for name, job in jobs.items()}
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='train') as pool:
+            futures = {name: pool.submit(run_job, job) for name, job in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
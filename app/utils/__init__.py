@@ -1,2 +1,8 @@
 """Utility modules"""
 
+from .instrumentation import INSTRUMENTATION, timed, start_metrics_server
+from .profiling import Profiler
+from .downsampling import ChartDownsampler, downsample_indices, lttb_indices, minmax_indices
+
+__all__ = ['INSTRUMENTATION', 'timed', 'start_metrics_server', 'Profiler', 'ChartDownsampler', 'downsample_indices',
+           'lttb_indices', 'minmax_indices']
@@ -0,0 +1,149 @@
+"""
+Downsampling of long time series for charts
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Optional, Hashable
+
+from app.config import Config
+
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """Numeric x positions (datetimes as nanoseconds)"""
+    x = np.asarray(x)
+    if x.dtype.kind == 'M':
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of ``n_out`` points that keep the visual shape
+
+    The first and last points are always kept; from each of the ``n_out - 2``
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket is chosen.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Mean of each bucket (the last "bucket" is the final point), for the lookahead term
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Twice the triangle area, expanded so only the bucket's points are arrays
+        x_a, y_a = x[a], y[a]
+        area = np.abs(y[lo:hi] * (x_a - avg_x[i + 1]) + x[lo:hi] * (avg_y[i + 1] - y_a)
+                      + (avg_x[i + 1] * y_a - x_a * avg_y[i + 1]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of each of ``n_out // 2`` equal buckets, in order
+
+    Every local extreme at bucket resolution survives, so peaks are exact.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    starts = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)[:-1]
+    starts = np.unique(starts)
+    counts = np.diff(np.append(starts, n))
+    bucket = np.repeat(np.arange(len(starts)), counts)
+
+    picked = []
+    for values in (np.fmax.reduceat(y, starts), np.fmin.reduceat(y, starts)):
+        hits = np.flatnonzero(y == np.repeat(values, counts))
+        _, first = np.unique(bucket[hits], return_index=True)
+        picked.append(hits[first])
+    return np.unique(np.concatenate(picked + [np.array([0, n - 1])]))
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, n_out: int, method: str = 'lttb') -> np.ndarray:
+    """Row indices (ascending) of at most ``n_out`` points representing the series"""
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsampling method '{method}'. Choose from {list(DOWNSAMPLE_METHODS)}")
+
+
+class ChartDownsampler:
+    """
+    Reduces a window of a time-indexed frame to a chart-sized one, with an LRU cache
+
+    Results are cached per (series version, window, point budget, method),
+    so re-rendering the same window costs a dict lookup. The version is the
+    caller's ``key`` (e.g. the history length and last timestamp), or the
+    frame's length and first/last x value when no key is given; appending
+    data therefore invalidates only windows of that series.
+    """
+
+    def __init__(self, max_points: Optional[int] = None, method: Optional[str] = None, cache_size: Optional[int] = None):
+        self.max_points = max_points or Config.DASHBOARD_CHART_POINTS
+        self.method = method or Config.DASHBOARD_DOWNSAMPLE_METHOD
+        if self.method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Unknown downsampling method '{self.method}'. Choose from {list(DOWNSAMPLE_METHODS)}")
+        self.cache_size = cache_size or Config.DASHBOARD_DOWNSAMPLE_CACHE_SIZE
+        self._cache: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def window(
+        self,
+        df: pd.DataFrame,
+        x: str,
+        y: str,
+        start=None,
+        end=None,
+        key: Optional[Hashable] = None
+    ) -> pd.DataFrame:
+        """
+        Rows of ``df`` (sorted by ``x``) between ``start`` and ``end``, downsampled on ``y``
+
+        Returns:
+            At most ``max_points`` rows (``2 * (max_points // 2)`` plus endpoints for minmax)
+        """
+        if df.empty:
+            return df
+        if key is None:
+            key = (len(df), df[x].iloc[0], df[x].iloc[-1])
+        cache_key = (key, x, y, start, end, self.max_points, self.method)
+
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+
+        x_values = df[x].to_numpy()
+        lo = 0 if start is None else int(np.searchsorted(x_values, np.asarray(start, dtype=x_values.dtype), 'left'))
+        hi = len(df) if end is None else int(np.searchsorted(x_values, np.asarray(end, dtype=x_values.dtype), 'right'))
+        indices = downsample_indices(x_values[lo:hi], df[y].to_numpy()[lo:hi], self.max_points, self.method)
+        result = df.iloc[lo + indices]
+
+        with self._lock:
+            self._cache[cache_key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
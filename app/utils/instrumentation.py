@@ -0,0 +1,273 @@
+"""
+Lightweight stage timing for the prediction pipeline
+
+Usage::
+
+    from app.utils.instrumentation import timed
+
+    @timed('models.direction.predict')
+    def predict(self, X): ...
+
+    with timed('core.predict.goldapi'):
+        price = self.gold_api.get_current_price()
+
+When instrumentation is disabled ``timed`` hands back a shared no-op context
+manager and decorated functions only pay for one flag check.
+"""
+
+import json
+import time
+import threading
+import functools
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Callable
+
+from app.config import Config
+
+
+# Upper bounds of the latency histogram buckets (seconds), Prometheus style
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf')
+)
+
+
+class StageHistogram:
+    """Latency histogram for one pipeline stage"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets', '_lock')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one duration"""
+        index = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.buckets[index] += 1
+            if seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, n in zip(BUCKETS, self.buckets):
+            if n and seen + n >= rank:
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return self.max
+
+    def summary(self) -> Dict:
+        """Summarize the histogram as plain values (seconds)"""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in BUCKETS], self.buckets))
+        }
+
+
+class _StageTimer:
+    """Context manager that records the time spent in its block"""
+
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, histogram: StageHistogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _NullTimer:
+    """Shared no-op stand-in used while instrumentation is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Instrumentation:
+    """Registry of stage histograms"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.profiler = None  # app.utils.profiling.Profiler attributing resources to stages, while one runs
+        self._stages: Dict[str, StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> StageHistogram:
+        """Get (or create) the histogram for a stage"""
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(stage, StageHistogram())
+        return histogram
+
+    def timer(self, stage: str):
+        """Context manager timing one execution of a stage"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.histogram(stage))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Summaries of every stage seen so far, keyed by stage name"""
+        with self._lock:
+            stages = dict(self._stages)
+        return {stage: histogram.summary() for stage, histogram in sorted(stages.items())}
+
+    def reset(self):
+        """Drop all recorded timings"""
+        with self._lock:
+            self._stages = {}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Dump all stage summaries as JSON"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Render all stage histograms in the Prometheus text exposition format"""
+        name = 'gold_pipeline_stage_duration_seconds'
+        lines = [
+            f'# HELP {name} Time spent in each prediction pipeline stage.',
+            f'# TYPE {name} histogram'
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+        for stage, histogram in stages:
+            cumulative = 0
+            for upper, n in zip(BUCKETS, histogram.buckets):
+                cumulative += n
+                le = '+Inf' if upper == float('inf') else repr(upper)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry used by the pipeline
+INSTRUMENTATION = Instrumentation(enabled=Config.INSTRUMENTATION_ENABLED)
+
+
+def timed(stage: str):
+    """
+    Time a stage, as a context manager (``with timed('x'):``) or decorator
+
+    Returns a no-op context manager when instrumentation is disabled.
+    """
+    return _TimedStage(stage)
+
+
+class _TimedStage:
+    """Return value of ``timed``: works both as context manager and decorator"""
+
+    __slots__ = ('stage', '_timer')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        if INSTRUMENTATION.profiler is not None:
+            INSTRUMENTATION.profiler.stage_enter(self.stage)
+        self._timer = INSTRUMENTATION.timer(self.stage)
+        return self._timer.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        result = self._timer.__exit__(exc_type, exc, tb)
+        if INSTRUMENTATION.profiler is not None:
+            INSTRUMENTATION.profiler.stage_exit(self.stage)
+        return result
+
+    def __call__(self, func: Callable) -> Callable:
+        stage = self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTATION.enabled:
+                return func(*args, **kwargs)
+            histogram = INSTRUMENTATION.histogram(stage)
+            profiler = INSTRUMENTATION.profiler
+            if profiler is not None:
+                profiler.stage_enter(stage)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+                if profiler is not None:
+                    profiler.stage_exit(stage)
+
+        return wrapper
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves ``/metrics`` (Prometheus text) and ``/metrics.json``"""
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = INSTRUMENTATION.to_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path == '/metrics.json':
+            body = INSTRUMENTATION.to_json().encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> ThreadingHTTPServer:
+    """Start the metrics endpoint in a background thread (once per process, on localhost by default)"""
+    global _metrics_server
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer(
+                (host or Config.METRICS_HOST, port or Config.METRICS_PORT), _MetricsHandler
+            )
+            thread = threading.Thread(target=_metrics_server.serve_forever, name='metrics-server', daemon=True)
+            thread.start()
+        return _metrics_server
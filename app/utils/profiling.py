@@ -0,0 +1,304 @@
+"""
+CPU and memory profiling of a whole run, attributed to pipeline stages
+
+Usage::
+
+    from app.utils.profiling import Profiler
+
+    with Profiler(name='train') as profiler:
+        app.train_models()
+    print(profiler.report_path)
+
+Three profilers can run together (``kinds``):
+
+- ``cpu``: cProfile of the calling thread, saved as ``cpu.prof`` (pstats,
+  e.g. ``snakeviz cpu.prof``) with the slowest app functions in the report
+- ``sample``: a background thread samples every thread's Python stack each
+  ``PROFILE_SAMPLE_INTERVAL`` seconds and writes ``stacks.folded`` in the
+  collapsed-stack format read by flamegraph.pl, speedscope and inferno
+- ``memory``: tracemalloc; the report lists the largest allocation sites
+
+Whatever the kinds, every ``timed`` stage (GoldPriceApp, FeatureEngineer,
+PricePredictor, ...) is attributed its calls, wall time, CPU time of its
+thread and, with ``memory``, the peak traced memory allocated while it was
+open, in ``report.txt`` and ``stages.json``. Open stages are tracked per
+thread and per asyncio task (a context variable), so coroutines interleaving
+on one event loop do not close each other's stages.
+"""
+
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import contextvars
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+from collections import Counter
+from typing import Optional, Dict, List, Sequence
+
+from app.config import Config
+from app.utils.instrumentation import INSTRUMENTATION
+
+
+PROFILE_KINDS = ('cpu', 'sample', 'memory')
+
+# Stacks whose innermost Python frame is in one of these files are idle threads, not work
+_IDLE_FILES = ('threading.py', 'queue.py', 'selectors.py', 'socketserver.py')
+
+
+class _OpenStage:
+    __slots__ = ('stage', 'wall', 'cpu', 'memory', 'peak')
+
+    def __init__(self, stage: str, memory: int):
+        self.stage = stage
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        self.memory = memory
+        self.peak = memory
+
+
+class _StackSampler:
+    """Collapsed Python stacks of every thread, sampled on a timer"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        labels = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue  # the sampler itself, or a thread waiting on a lock, queue or socket
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = (f"{getattr(code, 'co_qualname', code.co_name)} "
+                                                f"({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(ident, f'thread-{ident}'))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path: Path):
+        path.write_text(''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+    def top_functions(self, n: int) -> List[tuple]:
+        """(frame, self samples) of the frames most often on top of a stack"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return leaves.most_common(n)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the repo (or the last two components elsewhere)"""
+    path = Path(filename)
+    try:
+        return str(path.relative_to(Config.BASE_DIR))
+    except ValueError:
+        return '/'.join(path.parts[-2:])
+
+
+class Profiler:
+    """
+    Profiles everything run between ``start`` and ``stop`` (or inside ``with``)
+
+    Reports go to ``<output_dir>/<name>-<timestamp>/``. Stage attribution
+    hooks into ``timed``, so instrumentation is switched on for the
+    duration of the profile. Stages run on several threads (e.g. the two
+    forests training side by side) each get the process-wide peak memory
+    while they were open.
+    """
+
+    def __init__(
+        self,
+        kinds: Sequence[str] = PROFILE_KINDS,
+        output_dir: Optional[Path] = None,
+        name: str = 'run',
+        sample_interval: Optional[float] = None,
+        top: Optional[int] = None
+    ):
+        unknown = [kind for kind in kinds if kind not in PROFILE_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown profile kinds {unknown}. Choose from {list(PROFILE_KINDS)}")
+        self.kinds = tuple(kinds)
+        self.output_dir = Path(output_dir or Config.PROFILE_DIR)
+        self.name = name
+        self.sample_interval = sample_interval or Config.PROFILE_SAMPLE_INTERVAL
+        self.top = top or Config.PROFILE_TOP
+        self.report_path: Optional[Path] = None
+        self.run_dir: Optional[Path] = None
+
+        self._stages: Dict[str, Dict] = {}
+        self._open: List[_OpenStage] = []
+        self._stack: contextvars.ContextVar = contextvars.ContextVar(f'profiler_stages_{id(self)}', default=())
+        self._lock = threading.Lock()
+        self._cpu: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._memory = 'memory' in self.kinds
+        self._instrumentation_was_enabled = INSTRUMENTATION.enabled
+        self._wall = 0.0
+        self._peak = 0
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def start(self):
+        self._instrumentation_was_enabled = INSTRUMENTATION.enabled
+        INSTRUMENTATION.enabled = True
+        INSTRUMENTATION.profiler = self
+        if self._memory:
+            tracemalloc.start()
+        if 'sample' in self.kinds:
+            self._sampler = _StackSampler(self.sample_interval)
+            self._sampler.start()
+        if 'cpu' in self.kinds:
+            self._cpu = cProfile.Profile()
+            self._cpu.enable()
+        self._peak = 0
+        self._wall = time.perf_counter()
+
+    def stop(self) -> Path:
+        """Stop profiling and write the reports; returns the report path"""
+        self._wall = time.perf_counter() - self._wall
+        if self._cpu is not None:
+            self._cpu.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        INSTRUMENTATION.profiler = None
+        INSTRUMENTATION.enabled = self._instrumentation_was_enabled
+        snapshot = None
+        if self._memory:
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__)
+            ])
+            tracemalloc.stop()
+        return self._write(snapshot)
+
+    # ------------------------------------------------------------------
+    # Stage hooks (called by ``timed``)
+    # ------------------------------------------------------------------
+
+    def _traced_memory(self) -> int:
+        """Current traced memory; folds the peak since the last call into every open stage"""
+        current, peak = tracemalloc.get_traced_memory()
+        self._peak = max(self._peak, peak)
+        for open_stage in self._open:
+            if peak > open_stage.peak:
+                open_stage.peak = peak
+        tracemalloc.reset_peak()
+        return current
+
+    def stage_enter(self, stage: str):
+        with self._lock:
+            memory = self._traced_memory() if self._memory else 0
+            open_stage = _OpenStage(stage, memory)
+            self._open.append(open_stage)
+        # Immutable, so a task copying the context at creation never shares the parent's stack
+        self._stack.set(self._stack.get() + (open_stage,))
+
+    def stage_exit(self, stage: str):
+        stack = self._stack.get()
+        # Innermost open entry of this stage; none when it opened before the profiler started
+        index = next((i for i in range(len(stack) - 1, -1, -1) if stack[i].stage == stage), None)
+        if index is None:
+            return
+        open_stage = stack[index]
+        self._stack.set(stack[:index] + stack[index + 1:])
+        wall = time.perf_counter() - open_stage.wall
+        cpu = time.thread_time() - open_stage.cpu
+        with self._lock:
+            memory = self._traced_memory() if self._memory else 0
+            self._open.remove(open_stage)
+            stats = self._stages.setdefault(open_stage.stage, {
+                'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_alloc': 0, 'net_alloc': 0
+            })
+            stats['calls'] += 1
+            stats['wall'] += wall
+            stats['cpu'] += cpu
+            stats['peak_alloc'] = max(stats['peak_alloc'], open_stage.peak - open_stage.memory)
+            stats['net_alloc'] += memory - open_stage.memory
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def _write(self, snapshot) -> Path:
+        self.run_dir = self.output_dir / f"{self.name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        lines = [
+            f"Profile: {self.name} ({', '.join(self.kinds)})",
+            f"Wall time: {self._wall:.3f}s",
+        ]
+        if self._memory:
+            lines.append(f"Peak traced memory: {self._peak / 1e6:.1f}MB")
+
+        lines += ["", "Stages (wall and CPU seconds are inclusive of nested stages)",
+                  f"{'Stage':<44}{'Calls':>7}{'Wall':>10}{'CPU':>10}{'Peak alloc':>13}{'Net alloc':>12}"]
+        for stage, stats in sorted(self._stages.items(), key=lambda item: -item[1]['wall']):
+            lines.append(f"{stage:<44}{stats['calls']:>7}{stats['wall']:>9.3f}s{stats['cpu']:>9.3f}s"
+                         f"{stats['peak_alloc'] / 1e6:>11.1f}MB{stats['net_alloc'] / 1e6:>10.1f}MB")
+        (self.run_dir / 'stages.json').write_text(json.dumps({
+            'name': self.name,
+            'kinds': list(self.kinds),
+            'wall': self._wall,
+            'peak_traced_memory': self._peak if self._memory else None,
+            'stages': self._stages
+        }, indent=2))
+
+        if self._sampler is not None:
+            self._sampler.write(self.run_dir / 'stacks.folded')
+            total = max(self._sampler.samples, 1)
+            lines += ["", f"Sampled hot spots ({self._sampler.samples:,} samples every "
+                          f"{self.sample_interval * 1000:g}ms; share of samples with the frame running, "
+                          f"per thread, idle threads left out)"]
+            for frame, count in self._sampler.top_functions(self.top):
+                lines.append(f"{count / total:>7.1%}  {frame}")
+
+        if self._cpu is not None:
+            self._cpu.dump_stats(str(self.run_dir / 'cpu.prof'))
+            buffer = io.StringIO()
+            stats = pstats.Stats(self._cpu, stream=buffer)
+            stats.sort_stats('cumulative').print_stats(r'[/\\]app[/\\]', self.top)
+            lines += ["", "cProfile, app functions by cumulative time (calling thread only)",
+                      buffer.getvalue().split('\n\n', 1)[-1].rstrip()]
+
+        if snapshot is not None:
+            lines += ["", "Largest allocation sites still alive at the end of the run"]
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"{stat.size / 1e6:>9.2f}MB {stat.count:>9,} blocks  "
+                             f"{_short_path(frame.filename)}:{frame.lineno}")
+
+        self.report_path = self.run_dir / 'report.txt'
+        self.report_path.write_text('\n'.join(lines) + '\n')
+        return self.report_path
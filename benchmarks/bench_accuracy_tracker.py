@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark realized-accuracy updates over millions of stored predictions
+"""
+
+import sys
+import time
+import numpy as np
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.accuracy_tracker import AccuracyTracker
+
+# Budget for one incremental update (seconds)
+BUDGET_S = 1.0
+
+
+def make_columns(n: int, start: datetime, step_seconds: float, rng: np.random.Generator) -> dict:
+    """Build journal-style columns for n predictions spaced step_seconds apart"""
+    timestamps = np.datetime64(start, 'us') + (np.arange(n) * step_seconds * 1e6).astype('timedelta64[us]')
+    prices = 2000 + np.cumsum(rng.normal(0, 0.5, n))
+    return {
+        'timestamp': timestamps,
+        'current_price': prices,
+        'direction': (rng.random(n) > 0.5).astype(np.int8),
+        'confidence': rng.uniform(50, 100, n),
+        'price_change': rng.normal(0, 5, n)
+    }
+
+
+def run(n_predictions: int = 2_000_000, n_new: int = 10_000) -> dict:
+    rng = np.random.default_rng(42)
+    start = datetime(2024, 1, 1)
+    step = 10.0  # one prediction every 10 seconds
+
+    tracker = AccuracyTracker()
+    t0 = time.perf_counter()
+    tracker.add_predictions(make_columns(n_predictions, start, step, rng))
+    load_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    first_scored = tracker.update()
+    first_update = time.perf_counter() - t0
+
+    # Stream new predictions in one by one, as GoldPriceApp.predict does
+    new_start = start + timedelta(seconds=n_predictions * step)
+    new = make_columns(n_new, new_start, step, rng)
+    for i in range(n_new):
+        tracker.add_prediction({
+            'timestamp': str(new['timestamp'][i]),
+            'current_price': float(new['current_price'][i]),
+            'direction': 'UP' if new['direction'][i] else 'DOWN',
+            'confidence': float(new['confidence'][i]),
+            'price_change': float(new['price_change'][i])
+        })
+
+    t0 = time.perf_counter()
+    incremental_scored = tracker.update()
+    incremental_update = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    metrics = tracker.get_metrics()
+    metrics_time = time.perf_counter() - t0
+
+    return {
+        'predictions': n_predictions + n_new,
+        'load_s': load_time,
+        'first_update_s': first_update,
+        'first_scored': first_scored,
+        'incremental_update_s': incremental_update,
+        'incremental_scored': incremental_scored,
+        'metrics_s': metrics_time,
+        'metrics': metrics
+    }
+
+
+def main():
+    stats = run()
+    metrics = stats['metrics']
+    print("=" * 70)
+    print("Accuracy Tracker Benchmark")
+    print("=" * 70)
+    print(f"Stored predictions: {stats['predictions']:,}")
+    print(f"Bulk load: {stats['load_s'] * 1000:.1f}ms")
+    print(f"First update: {stats['first_update_s'] * 1000:.1f}ms ({stats['first_scored']:,} scored)")
+    print(f"Incremental update: {stats['incremental_update_s'] * 1000:.1f}ms "
+          f"({stats['incremental_scored']:,} scored)")
+    print(f"Metrics report: {stats['metrics_s'] * 1000:.2f}ms")
+    print(f"Hit rate: {metrics['hit_rate']:.2%} | MAE: ${metrics['mae']:.2f} | "
+          f"Calibration error: {metrics['calibration_error']:.2f}pp")
+
+    worst = max(stats['first_update_s'], stats['incremental_update_s'])
+    if worst > BUDGET_S:
+        print(f"\n✗ Update exceeds budget of {BUDGET_S:.1f}s")
+        return 1
+    print(f"\n✓ Updates within budget of {BUDGET_S:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark appending rows to processed history against recomputing every feature
+
+History grows by ``--batch`` rows at a time (some with a missing close) through
+``FeatureEngineer.append_price_features``, and the result is checked against
+``create_price_features`` on the whole history.
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.features import FeatureEngineer, PriceCalendar
+from synthetic_data import make_gold_prices
+
+
+def run(engineer: FeatureEngineer, raw, start: int, batch: int):
+    """(append seconds, full recompute seconds, max difference, NaN mismatches)"""
+    processed = engineer.create_price_features(raw.iloc[:start])
+    appended = 0.0
+    for i in range(start, len(raw), batch):
+        began = time.perf_counter()
+        processed = engineer.append_price_features(processed, raw.iloc[i:i + batch])
+        appended += time.perf_counter() - began
+
+    began = time.perf_counter()
+    full = engineer.create_price_features(raw)
+    recomputed = time.perf_counter() - began
+
+    columns = engineer.get_filled_columns() + ['next_price', 'next_price_change', 'next_direction']
+    a = processed[columns].to_numpy(dtype=np.float64)
+    b = full[columns].to_numpy(dtype=np.float64)
+    mismatched = int((np.isnan(a) != np.isnan(b)).sum())
+    worst = float(np.nanmax(np.abs(a - b) / np.maximum(1.0, np.abs(b)))) if len(a) else 0.0
+    return appended, recomputed, worst, mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental feature appends vs full recompute')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows of history')
+    parser.add_argument('--appended', type=int, default=500, help='Rows appended after the initial history')
+    parser.add_argument('--batch', type=int, default=10, help='Rows per append')
+    parser.add_argument('--missing', type=float, default=0.02, help='Share of appended rows with no close')
+    args = parser.parse_args()
+
+    raw = make_gold_prices(args.rows)
+    start = args.rows - args.appended
+    rng = np.random.default_rng(0)
+    missing = start + np.flatnonzero(rng.random(args.appended) < args.missing)
+    raw.loc[missing, 'Close'] = np.nan
+
+    print("=" * 70)
+    print(f"Appending {args.appended:,} rows to {start:,} in batches of {args.batch} "
+          f"({len(missing)} without a close)")
+    print("=" * 70)
+
+    failed = False
+    for label, calendar in (('rows as given', None), ('business-day calendar', PriceCalendar('B'))):
+        engineer = FeatureEngineer(calendar=calendar)
+        engineer.calendar = calendar  # None keeps rows as given whatever PRICE_CALENDAR says
+        appended, recomputed, worst, mismatched = run(engineer, raw, start, args.batch)
+        appends = -(-args.appended // args.batch)
+        print(f"{label:<22} append {appended / appends * 1000:7.2f}ms per batch | "
+              f"full recompute {recomputed * 1000:7.2f}ms | max rel diff {worst:.1e} | "
+              f"NaN mismatches {mismatched}")
+        failed |= worst > 1e-8 or mismatched > 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
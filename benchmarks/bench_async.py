@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency of the synchronous and asynchronous GoldPriceApp APIs
+
+GoldAPI and news are replaced with stubs that sleep for a configurable
+network latency, so the numbers show how the I/O is scheduled rather than
+how fast the real services are. History and models come from the offline
+data sources, as in bench_offline_pipeline.
+"""
+
+import io
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.data.local_sources import ReplayGoldAPIServer, LocalRSSServer, make_synthetic_ticks
+from bench_offline_pipeline import configure_offline, latency_stats
+
+
+class StubGoldAPI:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def get_current_price(self) -> dict:
+        time.sleep(self.latency)
+        return {'current_price': 2000.0, 'price_change': 1.5, 'price_change_pct': 0.075,
+                'high_price': 2010.0, 'low_price': 1990.0}
+
+
+class StubNewsFetcher:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def get_all_relevant_gold_news(self, max_results_per_query: int = 20) -> pd.DataFrame:
+        time.sleep(self.latency)
+        rng = np.random.default_rng(0)
+        return pd.DataFrame({'sentiment': rng.uniform(-1, 1, max_results_per_query),
+                             'price_indicator': rng.uniform(-1, 1, max_results_per_query)})
+
+    def analyze_news_impact(self, news: pd.DataFrame) -> dict:
+        return {'avg_sentiment': float(news['sentiment'].mean()),
+                'avg_price_indicator': float(news['price_indicator'].mean()),
+                'net_signal': float(np.sign(news['sentiment']).sum()),
+                'total_news': len(news)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync vs async GoldPriceApp latency with stubbed sources')
+    parser.add_argument('--rows', type=int, default=3000, help='Rows of synthetic price history')
+    parser.add_argument('--price-latency', type=float, default=0.15, help='Stub GoldAPI latency (s)')
+    parser.add_argument('--news-latency', type=float, default=0.4, help='Stub news fetch latency (s)')
+    parser.add_argument('--cycles', type=int, default=10, help='run_full_cycle calls per API')
+    parser.add_argument('--requests', type=int, default=50, help='Concurrent predict requests')
+    args = parser.parse_args()
+
+    goldapi = ReplayGoldAPIServer(make_synthetic_ticks(10_000), port=0, tick_rate=0).start()
+    rss = LocalRSSServer(port=0).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_offline(Path(tmp), args.rows, goldapi, rss)
+        Config.MODEL_HOT_SWAP_ENABLED = False
+
+        from app.core import GoldPriceApp, AsyncGoldPriceApp
+        app = GoldPriceApp()
+        app.gold_api = StubGoldAPI(args.price_latency)
+        app.news_fetcher = StubNewsFetcher(args.news_latency)
+        Config.NEWS_SCORING_ENABLED = False  # the stub articles carry their scores
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.train_models()
+
+        print("=" * 70)
+        print(f"Sync vs Async: price {args.price_latency * 1000:.0f}ms, news {args.news_latency * 1000:.0f}ms stub latency")
+        print("=" * 70)
+
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.cycles):
+                start = time.perf_counter()
+                app.run_full_cycle()
+                timings.append(time.perf_counter() - start)
+        print(f"run_full_cycle, sync:    {latency_stats(timings)}")
+
+        async def async_cycles():
+            async with AsyncGoldPriceApp(app) as async_app:
+                cycle_timings = []
+                for _ in range(args.cycles):
+                    start = time.perf_counter()
+                    await async_app.run_full_cycle()
+                    cycle_timings.append(time.perf_counter() - start)
+                return cycle_timings
+
+        print(f"run_full_cycle, async:   {latency_stats(asyncio.run(async_cycles()))}")
+
+        news = app.get_latest_news()
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            app.predict(news_data=news)
+        sync_total = time.perf_counter() - start
+        print(f"{args.requests} predicts, sync:     {sync_total:6.2f}s total")
+
+        async def concurrent_predicts():
+            async with AsyncGoldPriceApp(app) as async_app:
+                start = time.perf_counter()
+                await asyncio.gather(*(async_app.predict(news_data=news) for _ in range(args.requests)))
+                return time.perf_counter() - start
+
+        async_total = asyncio.run(concurrent_predicts())
+        print(f"{args.requests} predicts, async:    {async_total:6.2f}s total | {sync_total / async_total:.1f}x")
+
+    goldapi.stop()
+    rss.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
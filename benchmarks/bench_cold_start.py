@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: a fresh interpreter running GoldPriceApp().predict()
+
+Each run is a new process against the offline data sources and a model
+trained once up front. Three cases are compared: history read straight
+from the dataset file (no mirror), the first start with the mirror enabled
+(reads upstream and writes the mirror), and later starts that load the
+mirrored binary copy.
+"""
+
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.config import Config
+from app.data.local_sources import ReplayGoldAPIServer, LocalRSSServer, make_synthetic_ticks
+from bench_offline_pipeline import configure_offline
+
+
+CHILD = """
+import sys, json, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+settings = json.loads(sys.argv[1])
+from pathlib import Path
+from app.config import Config
+for key, value in settings.items():
+    setattr(Config, key, Path(value) if key.endswith(('_PATH', '_DIR')) else value)
+from app.core import GoldPriceApp
+imported = time.perf_counter()
+app = GoldPriceApp()
+app.load_historical_data()
+loaded = time.perf_counter()
+app.predict()
+done = time.perf_counter()
+print(json.dumps({{'imports': imported - start, 'history': loaded - imported,
+                  'predict': done - loaded, 'total': done - start}}))
+"""
+
+
+def settings(mirror: bool) -> dict:
+    """The Config values configure_offline set, for the child processes"""
+    keys = ['KAGGLE_SOURCE', 'GOLDAPI_SOURCE', 'NEWS_SOURCE', 'LOCAL_SOURCES_AUTOSTART', 'REPLAY_GOLDAPI_URL',
+            'LOCAL_RSS_URL', 'LOCAL_KAGGLE_PATH', 'MODELS_DIR', 'JOURNAL_DIR', 'DATASET_MIRROR_DIR']
+    values = {key: getattr(Config, key) for key in keys}
+    values['DATASET_MIRROR_ENABLED'] = mirror
+    values['MODEL_HOT_SWAP_ENABLED'] = False
+    return {key: str(value) if isinstance(value, Path) else value for key, value in values.items()}
+
+
+def cold_start(mirror: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD.format(root=str(ROOT)), json.dumps(settings(mirror))],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(runs: list) -> str:
+    median = {key: np.median([run[key] for run in runs]) * 1000 for key in runs[0]}
+    return (f"history {median['history']:8.1f}ms | predict {median['predict']:7.1f}ms | "
+            f"imports {median['imports']:6.0f}ms | total {median['total']:7.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start GoldPriceApp().predict() with and without the dataset mirror')
+    parser.add_argument('--rows', type=int, default=50_000, help='Rows of synthetic price history')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per case')
+    args = parser.parse_args()
+
+    goldapi = ReplayGoldAPIServer(make_synthetic_ticks(10_000), port=0, tick_rate=0).start()
+    rss = LocalRSSServer(port=0).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_offline(Path(tmp), args.rows, goldapi, rss)
+        Config.MODEL_HOT_SWAP_ENABLED = False
+        Config.DATASET_MIRROR_ENABLED = False  # the first mirrored start below must find no mirror
+
+        from app.core import GoldPriceApp
+        GoldPriceApp().train_models()
+
+        print("=" * 70)
+        print(f"Cold Start: fresh process -> GoldPriceApp().predict() over {args.rows:,} rows (median of {args.runs})")
+        print("=" * 70)
+        print(f"No mirror (read dataset):  {summarize([cold_start(False) for _ in range(args.runs)])}")
+        print(f"Mirror, first start:       {summarize([cold_start(True)])}")
+        print(f"Mirror, later starts:      {summarize([cold_start(True) for _ in range(args.runs)])}")
+
+    goldapi.stop()
+    rss.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compact model export: trees kept, size on disk and in memory, latency and accuracy per tolerance
+
+A random forest PricePredictor is trained once and compacted at each
+tolerance (a negative tolerance keeps every tree, so only pruning and the
+float32 cast apply). The joblib models are the baseline.
+"""
+
+import io
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.features import FeatureEngineer
+from app.models import PricePredictor, compact_predictor
+from synthetic_data import make_gold_prices
+
+
+def latency(predictor: PricePredictor, X: np.ndarray, batch_size: int) -> tuple:
+    row = X[-1:]
+    predictor.predict(row)
+    single = []
+    for _ in range(50):
+        start = time.perf_counter()
+        predictor.predict(row)
+        single.append(time.perf_counter() - start)
+
+    batch = X[:batch_size]
+    predictor.predict_batch(batch[:100])
+    start = time.perf_counter()
+    predictor.predict_batch(batch)
+    return float(np.median(single)), time.perf_counter() - start
+
+
+def direction_proba(predictor: PricePredictor, X: np.ndarray) -> np.ndarray:
+    model = predictor.direction_model
+    return model.model.predict_proba(model.scaler.transform(predictor.select_columns(X)))[:, 1]
+
+
+def disk_size(predictor: PricePredictor, models_dir: Path) -> int:
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.save_models(models_dir)
+    return sum(path.stat().st_size for path in models_dir.iterdir() if path.suffix in ('.pkl', '.npz'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact (pruned, float32) forest export')
+    parser.add_argument('--rows', type=int, default=5_000, help='Synthetic history size')
+    parser.add_argument('--tolerances', type=float, nargs='+', default=[-1, 0.0, 0.002, 0.005, 0.01])
+    parser.add_argument('--batch-size', type=int, default=5_000, help='Rows per batch prediction')
+    args = parser.parse_args()
+
+    Config.FEATURE_SELECTION_ENABLED = False
+    engineer = FeatureEngineer()
+    X, y_direction, y_range = engineer.create_training_matrix(engineer.create_price_features(make_gold_prices(args.rows)))
+
+    predictor = PricePredictor('random_forest')
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.train(X, y_direction, y_range, engineer.get_feature_names())
+    full_proba = direction_proba(predictor, X[-1000:])
+
+    print("=" * 104)
+    print(f"Compact Export ({args.rows:,} synthetic rows)")
+    print("=" * 104)
+    print(f"{'Tolerance':<12}{'Trees':>9}{'Nodes':>11}{'Disk':>10}{'Memory':>10}{'Export':>9}"
+          f"{'Single':>10}{'Batch':>10}{'Accuracy':>10}{'MAE':>8}{'Flips':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single, batch = latency(predictor, X, args.batch_size)
+        memory = sum(len(pickle.dumps(model.model)) for model in (predictor.direction_model, predictor.range_model))
+        trees = predictor.direction_model.model.n_estimators
+        nodes = sum(e.tree_.node_count for e in predictor.direction_model.model.estimators_)
+        print(f"{'joblib':<12}{trees:>4}/{trees:<4}{nodes:>11,}{disk_size(predictor, Path(tmp) / 'full') / 1e6:>8.2f}MB"
+              f"{memory / 1e6:>8.2f}MB{'-':>9}{single * 1000:>8.2f}ms{batch * 1000:>8.1f}ms{'-':>10}{'-':>8}{'-':>7}")
+
+        for tolerance in args.tolerances:
+            start = time.perf_counter()
+            compact, report = compact_predictor(predictor, X, y_direction, y_range, tolerance)
+            export = time.perf_counter() - start
+            single, batch = latency(compact, X, args.batch_size)
+            size = disk_size(compact, Path(tmp) / f'compact_{tolerance}')
+            memory = report['direction']['bytes'] + report['range']['bytes']
+            proba = direction_proba(compact, X[-1000:])
+            flips = int(((proba > 0.5) != (full_proba > 0.5)).sum())
+            direction, range_ = report['direction'], report['range']
+            accuracy = f"{direction['accuracy']:.2%}" if 'accuracy' in direction else '-'
+            mae = f"{range_['mae']:.2f}" if 'mae' in range_ else '-'
+            label = 'all trees' if tolerance < 0 else f'{tolerance:g}'
+            print(f"{label:<12}{direction['trees']:>4}/{range_['trees']:<4}{direction['nodes']:>11,}"
+                  f"{size / 1e6:>8.2f}MB{memory / 1e6:>8.2f}MB{export:>8.2f}s{single * 1000:>8.2f}ms"
+                  f"{batch * 1000:>8.1f}ms{accuracy:>10}{mae:>8}{flips:>7}")
+
+    print("\nTrees are direction/range; flips count direction calls that differ from the joblib model on the last 1,000 rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled keyword matcher against per-keyword substring scans across lexicon sizes
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.features.keyword_matcher import KeywordMatcher
+from app.features.news_scoring import DEFAULT_LEXICON, article_texts
+from synthetic_data import make_news_frame
+
+
+def make_lexicon(size: int, seed: int = 42) -> dict:
+    """The built-in lexicon padded with synthetic one- to three-word terms"""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    lexicon = dict(DEFAULT_LEXICON)
+    while len(lexicon) < size:
+        words = [''.join(rng.choice(letters, rng.integers(4, 10))) for _ in range(rng.integers(1, 4))]
+        lexicon[' '.join(words)] = float(rng.choice([-1.0, 1.0]) * rng.uniform(0.5, 2.0))
+    return lexicon
+
+
+def naive_hits(texts, lexicon: dict) -> np.ndarray:
+    """One substring count per keyword per article"""
+    totals = np.zeros((len(texts), 2))
+    for i, text in enumerate(texts):
+        text = text.lower()
+        for term, weight in lexicon.items():
+            count = text.count(term)
+            if count:
+                totals[i, 0 if weight > 0 else 1] += count * abs(weight)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled keyword matcher vs substring scans')
+    parser.add_argument('--lexicon-sizes', type=int, nargs='+', default=[50, 500, 5000, 50000], help='Terms')
+    parser.add_argument('--articles', type=int, default=10_000, help='Articles to score')
+    parser.add_argument('--naive-articles', type=int, default=1_000, help='Articles for the naive scan (it is slow)')
+    args = parser.parse_args()
+
+    texts = article_texts(make_news_frame(args.articles))
+
+    print("=" * 70)
+    print(f"Keyword Matching: {args.articles:,} articles")
+    print("=" * 70)
+    print(f"{'Terms':>8}{'Compile':>11}{'Naive':>16}{'Compiled':>16}{'Speedup':>10}")
+    for size in args.lexicon_sizes:
+        lexicon = make_lexicon(size)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(lexicon)
+        compile_time = time.perf_counter() - start
+
+        sample = texts[:args.naive_articles]
+        start = time.perf_counter()
+        naive_hits(sample, lexicon)
+        naive_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        matcher.hits(texts)
+        compiled_rate = len(texts) / (time.perf_counter() - start)
+
+        print(f"{len(matcher):>8,}{compile_time * 1000:>9.0f}ms{naive_rate:>12,.0f}/s{compiled_rate:>12,.0f}/s"
+              f"{compiled_rate / naive_rate:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
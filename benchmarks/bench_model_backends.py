@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Compare the model backends: fit time, single-row and batch latency, model size and accuracy
+
+Each backend trains a PricePredictor on the same feature matrix (feature
+selection off, so both fit once on every feature). Synthetic price
+histories of the given sizes are always run; ``--csv`` adds a downloaded
+copy of the Kaggle dataset and ``--kaggle`` fetches it through
+KaggleDataFetcher.
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.features import FeatureEngineer
+from app.models import PricePredictor, MODEL_BACKENDS
+from synthetic_data import make_gold_prices
+
+
+def measure(backend: str, X: np.ndarray, y_direction: np.ndarray, y_range: np.ndarray,
+            names: list, batch_size: int, tmp: Path) -> dict:
+    predictor = PricePredictor(backend)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics = predictor.train(X, y_direction, y_range, names)
+    fit = time.perf_counter() - start
+
+    row = X[-1:]
+    predictor.predict(row)
+    single = []
+    for _ in range(50):
+        start = time.perf_counter()
+        predictor.predict(row)
+        single.append(time.perf_counter() - start)
+
+    batch = X[:batch_size]
+    predictor.predict_batch(batch[:100])  # thread pools start on first use
+    start = time.perf_counter()
+    predictor.predict_batch(batch)
+    batch_time = time.perf_counter() - start
+
+    models_dir = tmp / backend
+    predictor.save_models(models_dir)
+    size = sum(path.stat().st_size for path in models_dir.glob('*.pkl'))
+
+    return {
+        'fit': fit,
+        'single': float(np.median(single)),
+        'batch': batch_time,
+        'batch_rows': len(batch),
+        'size': size,
+        'accuracy': metrics['direction']['accuracy'],
+        'mae': metrics['range']['mae']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Random forest vs histogram gradient boosting backends')
+    parser.add_argument('--rows', type=int, nargs='+', default=[5_000, 50_000], help='Synthetic history sizes')
+    parser.add_argument('--csv', type=Path, default=None, help='Local copy of the Kaggle gold price CSV')
+    parser.add_argument('--kaggle', action='store_true', help='Fetch the Kaggle dataset with KaggleDataFetcher')
+    parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per batch prediction')
+    parser.add_argument('--backends', nargs='+', default=list(MODEL_BACKENDS), choices=list(MODEL_BACKENDS))
+    args = parser.parse_args()
+
+    Config.FEATURE_SELECTION_ENABLED = False
+
+    datasets = [(f"synthetic {rows:,}", lambda rows=rows: make_gold_prices(rows)) for rows in args.rows]
+    if args.csv:
+        datasets.append((args.csv.name, lambda: pd.read_csv(args.csv)))
+    if args.kaggle:
+        from app.data import KaggleDataFetcher
+        datasets.append(("kaggle", lambda: KaggleDataFetcher().get_data()))
+
+    engineer = FeatureEngineer()
+    names = engineer.get_feature_names()
+
+    print("=" * 98)
+    print("Model Backends")
+    print("=" * 98)
+    print(f"{'Dataset':<20}{'Backend':<24}{'Fit':>9}{'Single':>10}{'Batch':>16}{'Size':>10}{'Accuracy':>10}{'MAE':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, load in datasets:
+            X, y_direction, y_range = engineer.create_training_matrix(engineer.create_price_features(load()))
+            for backend in args.backends:
+                r = measure(backend, X, y_direction, y_range, names, args.batch_size, Path(tmp) / label.replace(' ', '_'))
+                print(f"{label:<20}{backend:<24}{r['fit']:>8.2f}s{r['single'] * 1000:>8.2f}ms"
+                      f"{r['batch'] * 1000:>8.1f}ms/{r['batch_rows'] // 1000}k{r['size'] / 1e6:>8.1f}MB"
+                      f"{r['accuracy']:>10.2%}{r['mae']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
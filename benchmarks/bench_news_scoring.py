@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+News scoring throughput: in-process vs the NewsScorer process pool
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.features.news_scoring import NewsScorer, article_texts, score_texts
+from synthetic_data import make_news_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='News scoring throughput per batch size')
+    parser.add_argument('--articles', type=int, nargs='+', default=[100, 10_000, 1_000_000], help='Batch sizes')
+    parser.add_argument('--workers', type=int, default=None, help='Scoring processes (default: one per core)')
+    args = parser.parse_args()
+
+    scorer = NewsScorer(workers=args.workers, parallel_min=0)
+
+    print("=" * 70)
+    print(f"News Scoring: {scorer.workers} worker process(es), chunks of {scorer.chunk_size:,}, "
+          f"{os.cpu_count()} core(s)")
+    print("=" * 70)
+
+    # Spawn the pool and load TextBlob before timing: both persist for the life of the app
+    warmup = article_texts(make_news_frame(scorer.workers * 2))
+    scorer.score(warmup)
+    score_texts(warmup)
+
+    print(f"{'Articles':>10}{'In-process':>16}{'Pool':>16}{'Speedup':>10}{'Auto':>14}")
+    for n_articles in args.articles:
+        texts = article_texts(make_news_frame(n_articles))
+
+        start = time.perf_counter()
+        baseline = score_texts(texts)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled = scorer.score(texts)
+        parallel = time.perf_counter() - start
+        assert (pooled == baseline).all(), "pool and in-process scores differ"
+
+        auto = 'in-process' if n_articles < Config.NEWS_SCORING_PARALLEL_MIN else 'pool'
+        print(f"{n_articles:>10,}{n_articles / serial:>12,.0f}/s{n_articles / parallel:>12,.0f}/s"
+              f"{serial / parallel:>9.2f}x{auto:>14}")
+
+    NewsScorer.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
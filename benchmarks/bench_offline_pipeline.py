@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Drive the full prediction pipeline against the offline data-source stand-ins
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.data.local_sources import (
+    ReplayGoldAPIServer, ReplayGoldAPIClient, LocalRSSServer, make_synthetic_prices, make_synthetic_ticks
+)
+
+
+def configure_offline(tmp: Path, rows: int, goldapi: ReplayGoldAPIServer, rss: LocalRSSServer):
+    """Point Config at the local servers and a temporary dataset, mirror, journal and models"""
+    Config.KAGGLE_SOURCE = 'local'
+    Config.GOLDAPI_SOURCE = 'replay'
+    Config.NEWS_SOURCE = 'local'
+    Config.LOCAL_SOURCES_AUTOSTART = False
+    Config.REPLAY_GOLDAPI_URL = goldapi.base_url
+    Config.LOCAL_RSS_URL = rss.base_url
+    Config.LOCAL_KAGGLE_PATH = tmp / "gold_prices.csv"
+    Config.MODELS_DIR = tmp / "models"
+    Config.JOURNAL_DIR = tmp / "journal"
+    Config.DATASET_MIRROR_DIR = tmp / "mirror"
+    make_synthetic_prices(rows).to_csv(Config.LOCAL_KAGGLE_PATH, index=False)
+
+
+def latency_stats(timings: list) -> str:
+    ms = np.array(timings) * 1000
+    return (f"mean {ms.mean():.2f}ms | p50 {np.percentile(ms, 50):.2f}ms | "
+            f"p99 {np.percentile(ms, 99):.2f}ms | {len(ms) / ms.sum() * 1000:,.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline full-pipeline load test')
+    parser.add_argument('--rows', type=int, default=3000, help='Rows of synthetic price history')
+    parser.add_argument('--requests', type=int, default=500, help='GoldAPI requests / predictions to issue')
+    args = parser.parse_args()
+
+    goldapi = ReplayGoldAPIServer(make_synthetic_ticks(10_000), port=0, tick_rate=0).start()
+    rss = LocalRSSServer(port=0).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_offline(Path(tmp), args.rows, goldapi, rss)
+
+        print("=" * 70)
+        print("Offline Pipeline Load Test")
+        print("=" * 70)
+
+        client = ReplayGoldAPIClient()
+        timings = []
+        prices = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            prices.append(client.get_current_price()['current_price'])
+            timings.append(time.perf_counter() - start)
+        print(f"Replay GoldAPI requests: {latency_stats(timings)}")
+
+        # Per-request replay makes the tick sequence identical on every run
+        replay = ReplayGoldAPIServer(make_synthetic_ticks(10_000), port=0, tick_rate=0).start()
+        again = ReplayGoldAPIClient(replay.base_url)
+        repeat = [again.get_current_price()['current_price'] for _ in range(len(prices))]
+        replay.stop()
+        print(f"Deterministic tick sequence: {'yes' if repeat == prices else 'NO'}")
+
+        from app.core import GoldPriceApp
+        app = GoldPriceApp()
+        start = time.perf_counter()
+        app.train_models()
+        print(f"Train on {args.rows:,} local rows: {time.perf_counter() - start:.2f}s")
+
+        news = app.get_latest_news(max_results=20)
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            app.predict(news_data=news)
+            timings.append(time.perf_counter() - start)
+        print(f"Full predict (replay price + features + forests): {latency_stats(timings)}")
+
+    goldapi.stop()
+    rss.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent model training against the sequential path at several core budgets
+
+Sequential is the old behaviour: each forest is fitted alone on every core
+of the budget. Concurrent runs the fits through ``TrainingOrchestrator`` on
+the same budget. Two workloads are timed: the direction + range pair that
+``PricePredictor.train`` fits, and a walk-forward backtest refitting both
+models on many windows.
+
+Budgets above the machine's core count oversubscribe it and only show the
+scheduling overhead; run on a box with at least as many cores as the
+largest budget for meaningful speedups.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models import DirectionModel, RangeModel, TrainingOrchestrator, CoreBudget
+
+
+def make_training_data(n_rows: int, n_features: int, seed: int = 42):
+    """Synthetic feature matrix with learnable direction and range targets"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 1, (n_rows, n_features))
+    signal = X[:, :4] @ np.array([0.8, -0.5, 0.3, 0.2])
+    y_range = signal * 10 + rng.normal(0, 5, n_rows)
+    y_direction = (y_range > 0).astype(float)
+    return X, y_direction, y_range
+
+
+def pair_jobs(X, y_direction, y_range):
+    """The two fits of PricePredictor.train"""
+    return {
+        'direction': lambda n_jobs: DirectionModel().train(X, y_direction, n_jobs=n_jobs),
+        'range': lambda n_jobs: RangeModel().train(X, y_range, n_jobs=n_jobs)
+    }
+
+
+def backtest_jobs(X, y_direction, y_range, n_windows: int):
+    """Walk-forward backtest: both models refitted on every expanding window"""
+    jobs = {}
+    for i in range(n_windows):
+        end = len(X) * (i + 1) // n_windows
+        jobs[f'direction_{i}'] = lambda n_jobs, end=end: DirectionModel().train(X[:end], y_direction[:end], n_jobs=n_jobs)
+        jobs[f'range_{i}'] = lambda n_jobs, end=end: RangeModel().train(X[:end], y_range[:end], n_jobs=n_jobs)
+    return jobs
+
+
+def time_sequential(jobs, cores: int) -> float:
+    start = time.perf_counter()
+    for job in jobs.values():
+        job(cores)
+    return time.perf_counter() - start
+
+
+def time_concurrent(jobs, cores: int) -> float:
+    start = time.perf_counter()
+    TrainingOrchestrator(CoreBudget(cores)).run(jobs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent vs sequential model training')
+    parser.add_argument('--cores', type=int, nargs='+', default=[4, 16, 64], help='Core budgets to compare')
+    parser.add_argument('--rows', type=int, default=10_000, help='Training rows')
+    parser.add_argument('--features', type=int, default=28, help='Feature columns')
+    parser.add_argument('--windows', type=int, default=8, help='Backtest windows (two forests each)')
+    args = parser.parse_args()
+
+    X, y_direction, y_range = make_training_data(args.rows, args.features)
+    machine = os.cpu_count() or 1
+
+    print("=" * 70)
+    print(f"Model Training: {args.rows:,} rows x {args.features} features on a {machine}-core machine")
+    print("=" * 70)
+    print(f"{'Workload':<24}{'Cores':>6}{'Sequential':>13}{'Concurrent':>13}{'Speedup':>10}")
+
+    for cores in args.cores:
+        note = "  (oversubscribed)" if cores > machine else ""
+        for name, jobs in [
+            ('direction + range', pair_jobs(X, y_direction, y_range)),
+            (f'backtest, {args.windows} windows', backtest_jobs(X, y_direction, y_range, args.windows))
+        ]:
+            sequential = time_sequential(jobs, cores)
+            concurrent = time_concurrent(jobs, cores)
+            print(f"{name:<24}{cores:>6}{sequential:>12.2f}s{concurrent:>12.2f}s"
+                  f"{sequential / concurrent:>9.2f}x{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost the prediction journal adds to the predict path
+"""
+
+import sys
+import time
+import tempfile
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.prediction_journal import PredictionJournal
+
+# Per-append budget on the predict path (microseconds)
+BUDGET_US = 300.0
+
+
+def make_result(rng: np.random.Generator) -> dict:
+    """Build a result dict shaped like GoldPriceApp.predict output"""
+    return {
+        'direction': 'UP' if rng.random() > 0.5 else 'DOWN',
+        'confidence': float(rng.uniform(50, 100)),
+        'price_change': float(rng.normal(0, 10)),
+        'timestamp': datetime.now().isoformat(),
+        'current_price': float(rng.uniform(1800, 2200)),
+        'news_impact': None,
+        'model_version': '1.0.0'
+    }
+
+
+def run(n_records: int = 50000, segment_size: int = 10000) -> dict:
+    """Append n_records predictions and report per-append latency"""
+    rng = np.random.default_rng(42)
+    results = [make_result(rng) for _ in range(n_records)]
+    features = rng.normal(size=(n_records, 16))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = PredictionJournal(Path(tmp), segment_size=segment_size)
+        timings = np.empty(n_records)
+        for i in range(n_records):
+            start = time.perf_counter()
+            journal.append(results[i], features[i:i + 1])
+            timings[i] = time.perf_counter() - start
+        journal.close()
+
+        start = time.perf_counter()
+        stored = PredictionJournal(Path(tmp)).load_columns()
+        load_time = time.perf_counter() - start
+
+    timings_us = timings * 1e6
+    return {
+        'records': n_records,
+        'stored': len(stored['timestamp']),
+        'mean_us': float(timings_us.mean()),
+        'p50_us': float(np.percentile(timings_us, 50)),
+        'p99_us': float(np.percentile(timings_us, 99)),
+        'max_us': float(timings_us.max()),
+        'load_ms': load_time * 1000
+    }
+
+
+def main():
+    stats = run()
+    print("=" * 70)
+    print("Prediction Journal Benchmark")
+    print("=" * 70)
+    print(f"Records appended: {stats['records']:,} (stored: {stats['stored']:,})")
+    print(f"Append latency: mean {stats['mean_us']:.1f}us | p50 {stats['p50_us']:.1f}us | "
+          f"p99 {stats['p99_us']:.1f}us | max {stats['max_us']:.1f}us")
+    print(f"Full journal load: {stats['load_ms']:.1f}ms")
+
+    if stats['p99_us'] > BUDGET_US:
+        print(f"\n✗ p99 append latency exceeds budget of {BUDGET_US:.0f}us")
+        return 1
+    print(f"\n✓ p99 append latency within budget of {BUDGET_US:.0f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
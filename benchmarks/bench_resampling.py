@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark calendar resampling on a long irregular tick series
+
+The series is generated and processed chunk by chunk (``RESAMPLE_CHUNK_ROWS``),
+so 100M rows run in bounded memory. A smaller prefix is also run through the
+equivalent pandas code (resample().ohlc()) for speed and values.
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.features.resampling import PriceCalendar, BarResampler
+
+
+class IrregularTicks:
+    """Ticks with exponential gaps (mean ``mean_gap`` seconds), outages and weekend trading, in chunks"""
+
+    def __init__(self, seed: int = 42, mean_gap: float = 0.5, start: str = "2020-01-01"):
+        self.rng = np.random.default_rng(seed)
+        self.mean_gap_ns = mean_gap * 1e9
+        self.time = pd.Timestamp(start).value
+        self.level = 0.0
+
+    def next(self, n_rows: int):
+        gaps = self.rng.exponential(self.mean_gap_ns, n_rows)
+        outages = self.rng.random(n_rows) < 1e-6  # a few multi-hour outages per million ticks
+        gaps[outages] += self.rng.uniform(3600e9, 12 * 3600e9, outages.sum())
+        times = self.time + np.cumsum(gaps).astype(np.int64)
+        steps = self.rng.normal(0, 0.05, n_rows)
+        level = self.level + np.cumsum(steps)
+        self.time, self.level = int(times[-1]), float(level[-1]) * 0.999
+        return times, 2000.0 + 50.0 * np.tanh(level / 50.0)
+
+
+def run_chunked(n_rows: int, chunk_rows: int, seed: int):
+    """Generate and process the series chunk by chunk; seconds per stage"""
+    ticks = IrregularTicks(seed)
+    daily = BarResampler(PriceCalendar('B'))
+    hourly = BarResampler(PriceCalendar('1h'))
+    seconds = {'generate': 0.0, 'resample B': 0.0, 'resample 1h': 0.0}
+    bars = {'resample B': 0, 'resample 1h': 0}
+
+    done = 0
+    while done < n_rows:
+        size = min(chunk_rows, n_rows - done)
+        start = time.perf_counter()
+        times, price = ticks.next(size)
+        seconds['generate'] += time.perf_counter() - start
+
+        for name, resampler in (('resample B', daily), ('resample 1h', hourly)):
+            start = time.perf_counter()
+            bars[name] += len(resampler.update(times, price)['bar'])
+            seconds[name] += time.perf_counter() - start
+        done += size
+    bars['resample B'] += len(daily.flush()['bar'])
+    bars['resample 1h'] += len(hourly.flush()['bar'])
+    return seconds, bars
+
+
+def check_against_pandas(n_rows: int, chunk_rows: int, seed: int) -> float:
+    """Compare with pandas on ``n_rows``; returns the max abs difference"""
+    times, price = IrregularTicks(seed).next(n_rows)
+    index = pd.to_datetime(times)
+    series = pd.Series(price, index=index)
+
+    start = time.perf_counter()
+    reference = series[index.dayofweek < 5].resample('1h').ohlc().dropna()
+    pandas_resample = time.perf_counter() - start
+    start = time.perf_counter()
+    calendar = PriceCalendar('1h')
+    resampler = BarResampler(calendar, fill=False)
+    parts = [resampler.update(times[i:i + chunk_rows], price[i:i + chunk_rows])
+             for i in range(0, n_rows, chunk_rows)] + [resampler.flush()]
+    ours_resample = time.perf_counter() - start
+    bars = {name: np.concatenate([part[name] for part in parts]) for name in ('bar', 'open', 'high', 'low', 'close')}
+    ours = pd.DataFrame(bars, index=pd.DatetimeIndex(calendar.labels(bars['bar'])))
+    # Weekend ticks join Friday's last bar here; pandas drops them above
+    reference = reference[~((reference.index.dayofweek == 4) & (reference.index.hour == 23))]
+    resample_diff = np.abs(ours.loc[reference.index, ['open', 'high', 'low', 'close']].to_numpy()
+                           - reference.to_numpy()).max()
+
+    print(f"pandas comparison on {n_rows:,} rows")
+    print(f"  resample 1h OHLC: pandas {pandas_resample:6.2f}s | BarResampler {ours_resample:6.2f}s | "
+          f"max abs diff {resample_diff:.2e}")
+    return resample_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calendar resampling of irregular ticks')
+    parser.add_argument('--rows', type=int, default=100_000_000, help='Ticks in the irregular series')
+    parser.add_argument('--chunk-rows', type=int, default=Config.RESAMPLE_CHUNK_ROWS, help='Ticks per chunk')
+    parser.add_argument('--reference-rows', type=int, default=5_000_000,
+                        help='Ticks also run through pandas (0 to skip)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Resampling: {args.rows:,} irregular ticks in chunks of {args.chunk_rows:,}")
+    print("=" * 70)
+
+    worst = 0.0
+    if args.reference_rows:
+        worst = check_against_pandas(min(args.reference_rows, args.rows), args.chunk_rows, args.seed)
+        print()
+
+    tracemalloc.start()
+    seconds, bars = run_chunked(args.rows, args.chunk_rows, args.seed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for stage, elapsed in seconds.items():
+        extra = f" -> {bars[stage]:,} bars" if stage in bars else ""
+        print(f"  {stage:<16} {elapsed:7.2f}s | {args.rows / elapsed / 1e6:6.1f}M ticks/s{extra}")
+    print(f"  Peak traced memory: {peak / 2**20:.1f} MiB")
+    return 0 if worst < 1e-6 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
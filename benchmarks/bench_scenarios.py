@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark scenario-grid scoring: throughput and peak memory against chunk size
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from app.core.scenarios import ScenarioAnalyzer
+from app.features import FeatureEngineer
+from app.models import PricePredictor
+from synthetic_data import make_gold_prices, make_api_price
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scenario-grid scoring benchmark')
+    parser.add_argument('--rows', type=int, default=3000, help='Rows of synthetic price history')
+    parser.add_argument('--grid', type=int, nargs=3, default=[100, 100, 50],
+                        help='Grid size along each of the three swept features')
+    parser.add_argument('--chunk-sizes', type=int, nargs='*', default=[10_000, 50_000, 200_000])
+    args = parser.parse_args()
+
+    engineer = FeatureEngineer()
+    processed = engineer.create_price_features(make_gold_prices(args.rows))
+    X, y_direction, y_range = engineer.create_training_matrix(processed)
+    predictor = PricePredictor()
+    predictor.train(X, y_direction, y_range, engineer.get_feature_names())
+
+    news_sentiment = {'avg_sentiment': 0.1, 'avg_price_indicator': 0.2, 'net_signal': 3.0, 'total_news': 40}
+    base_row = engineer.create_feature_matrix(processed, news_sentiment, make_api_price())
+
+    # Sweep features the pruned models still use, over their 1st-99th percentile range
+    names = engineer.get_feature_names()
+    swept = predictor.selected_features[:3]
+    grid = {
+        name: np.linspace(*np.percentile(X[:, names.index(name)], [1, 99]), size)
+        for name, size in zip(swept, args.grid)
+    }
+    total = int(np.prod([len(values) for values in grid.values()]))
+
+    print("=" * 70)
+    print(f"Scenario Grid: {' x '.join(f'{name} ({len(values)})' for name, values in grid.items())} "
+          f"= {total:,} scenarios")
+    print("=" * 70)
+
+    for chunk_size in args.chunk_sizes:
+        analyzer = ScenarioAnalyzer(predictor, engineer.get_feature_names(), chunk_size)
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = analyzer.run(base_row, grid)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"chunk {chunk_size:>8,}: {elapsed:6.2f}s | {total / elapsed:>10,.0f} scenarios/s | "
+              f"peak {peak / 2**20:7.1f} MiB")
+
+    heatmap = result.heatmap(swept[0], swept[-1], value='up_probability')
+    print(f"\nHeat map ({swept[-1]} x {swept[0]}): {heatmap.shape}, "
+          f"P(UP) {heatmap.values.min():.3f}-{heatmap.values.max():.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
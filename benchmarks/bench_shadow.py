@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Production predict latency with and without shadow models, and shadow drop rate
+
+Two model versions are trained on the offline data sources; the older one
+shadows the newer one. GoldAPI and news are passed in, so the timings are
+feature building, inference, journaling and the shadow hand-off.
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.data.local_sources import ReplayGoldAPIServer, LocalRSSServer, make_synthetic_ticks
+from bench_offline_pipeline import configure_offline, latency_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shadow model overhead on the predict path')
+    parser.add_argument('--rows', type=int, default=3000, help='Rows of synthetic price history')
+    parser.add_argument('--requests', type=int, default=300, help='Predictions per run')
+    parser.add_argument('--shadows', type=int, default=2, help='Shadow models (copies of the older version)')
+    parser.add_argument('--queue-size', type=int, default=None, help='Shadow queue size (default: Config)')
+    parser.add_argument('--nice', type=int, default=None, help='Shadow worker niceness (default: Config)')
+    args = parser.parse_args()
+
+    goldapi = ReplayGoldAPIServer(make_synthetic_ticks(10_000), port=0, tick_rate=0).start()
+    rss = LocalRSSServer(port=0).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_offline(Path(tmp), args.rows, goldapi, rss)
+        Config.MODEL_HOT_SWAP_ENABLED = False
+        Config.PREDICTION_MEMO_SIZE = 0  # every request runs the forests
+        if args.queue_size:
+            Config.SHADOW_QUEUE_SIZE = args.queue_size
+        if args.nice is not None:
+            Config.SHADOW_WORKER_NICE = args.nice
+
+        from app.core import GoldPriceApp
+        app = GoldPriceApp()
+        with contextlib.redirect_stdout(io.StringIO()):
+            # The candidate: smaller forests, published first and then superseded
+            estimators = Config.RF_CLASSIFIER_N_ESTIMATORS, Config.RF_REGRESSOR_N_ESTIMATORS
+            Config.RF_CLASSIFIER_N_ESTIMATORS = Config.RF_REGRESSOR_N_ESTIMATORS = 30
+            app.train_models()
+            candidate = app.registry.current_version()
+            Config.RF_CLASSIFIER_N_ESTIMATORS, Config.RF_REGRESSOR_N_ESTIMATORS = estimators
+            app.train_models()
+
+        price = app.get_current_price()
+        news_sentiment = {'avg_sentiment': 0.1, 'avg_price_indicator': 0.2, 'net_signal': 2.0, 'total_news': 20}
+
+        def run() -> list:
+            timings = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                app.predict(current_price=price, news_sentiment=news_sentiment)
+                timings.append(time.perf_counter() - start)
+            return timings
+
+        print("=" * 70)
+        print(f"Shadow Models: {args.shadows} shadow(s), queue {Config.SHADOW_QUEUE_SIZE}, "
+              f"nice {Config.SHADOW_WORKER_NICE}, {args.requests} requests")
+        print("=" * 70)
+        run()  # warm up
+        print(f"predict, no shadows:  {latency_stats(run())}")
+
+        for i in range(args.shadows):
+            app.add_shadow_model(f"{candidate}-{i}", app.registry.load(candidate))
+        timings = run()
+        app.shadow.drain()
+        print(f"predict, shadowed:    {latency_stats(timings)}")
+
+        stats = app.shadow.stats()
+        print(f"shadow work: {stats['submitted']:,} queued, {stats['dropped']:,} dropped "
+              f"({stats['dropped'] / args.requests:.0%})")
+        for name, report in app.get_shadow_report().items():
+            print(f"  {name}: {report['scored']:,} scored, {report['agreement']:.0%} agreement, "
+                  f"mean |change diff| ${report['mean_abs_change_diff']:.2f}")
+        app.shadow.close()
+
+    goldapi.stop()
+    rss.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
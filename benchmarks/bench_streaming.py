@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Streaming predictions: sustained ticks per second and end-to-end lag
+
+Replays a synthetic tick tape through ``StreamingPredictor`` with the
+joblib forests and their compact export, unpaced (maximum throughput) and
+at fixed tick rates (lag under a steady load). The baseline is the
+request path: ``create_feature_matrix`` plus ``predict`` once per tick.
+"""
+
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.core import StreamingPredictor
+from app.data.local_sources import make_synthetic_ticks
+from app.data.ticks import ReplayTickSource
+from app.features import FeatureEngineer
+from app.models import PricePredictor, compact_predictor
+from synthetic_data import make_gold_prices
+
+
+def request_path(predictor: PricePredictor, engineer: FeatureEngineer, processed, ticks: int) -> float:
+    """Ticks per second when every tick is a GoldPriceApp.predict style call"""
+    source = iter(ReplayTickSource(make_synthetic_ticks(ticks), rate=0))
+    start = time.perf_counter()
+    for tick in source:
+        X = engineer.create_feature_matrix(processed, current_api_price=tick, feature_names=predictor.selected_features)
+        predictor.predict(X)
+    return ticks / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming prediction throughput and lag')
+    parser.add_argument('--rows', type=int, default=5_000, help='Synthetic history size')
+    parser.add_argument('--ticks', type=int, default=50_000, help='Ticks per unpaced run')
+    parser.add_argument('--rates', type=float, nargs='+', default=[100, 1_000, 5_000], help='Paced tick rates')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Length of each paced run')
+    args = parser.parse_args()
+
+    Config.FEATURE_SELECTION_ENABLED = False
+    engineer = FeatureEngineer()
+    processed = engineer.create_price_features(make_gold_prices(args.rows))
+    X, y_direction, y_range = engineer.create_training_matrix(processed)
+    predictor = PricePredictor('random_forest')
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.train(X, y_direction, y_range, engineer.get_feature_names())
+    compact, _ = compact_predictor(predictor, X, y_direction, y_range)
+    predictor.predict_batch(X[:100])  # thread pools start on first use
+
+    print("=" * 86)
+    print(f"Streaming Predictions ({args.rows:,} history rows)")
+    print("=" * 86)
+    print(f"{'Models':<10}{'Tick rate':>12}{'Ticks':>10}{'Ticks/s':>12}{'Batch':>9}"
+          f"{'Lag p50':>11}{'Lag p99':>11}{'Lag max':>11}")
+
+    for label, model in (('joblib', predictor), ('compact', compact)):
+        rate = request_path(model, engineer, processed, 200)
+        print(f"{label:<10}{'per request':>12}{200:>10,}{rate:>12,.0f}{1:>9}{'-':>11}{'-':>11}{'-':>11}")
+
+        runs = [(0.0, args.ticks)] + [(rate, int(rate * args.seconds)) for rate in args.rates]
+        for rate, ticks in runs:
+            stream = StreamingPredictor(
+                lambda: model, processed, ReplayTickSource(make_synthetic_ticks(ticks), rate=rate),
+                feature_engineer=engineer
+            )
+            stats = stream.run()
+            print(f"{label:<10}{'unpaced' if rate == 0 else f'{rate:,.0f}/s':>12}{stats['ticks']:>10,}"
+                  f"{stats['ticks_per_second']:>12,.0f}{stats['mean_batch']:>9.1f}"
+                  f"{stats['lag_p50_ms']:>9.2f}ms{stats['lag_p99_ms']:>9.2f}ms{stats['lag_max_ms']:>9.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
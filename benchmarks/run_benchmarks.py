@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for every pipeline stage, on synthetic data and fully offline
+
+Results are stored per commit under benchmarks/results/ and compared against
+the previous run so regressions between commits are flagged:
+
+    python benchmarks/run_benchmarks.py --rows 5000
+    python benchmarks/run_benchmarks.py --compare <commit> --fail-on-regression
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+import numpy as np
+import pandas as pd
+
+from app.config import Config
+from app.core.scenarios import ScenarioAnalyzer
+from app.features import FeatureEngineer, NewsScorer
+from app.models import PricePredictor, PredictionMemo
+from app.utils import downsample_indices
+from synthetic_data import make_gold_prices, make_api_price, make_news_frame, stub_news_feeds
+
+RESULTS_DIR = BENCH_DIR / "results"
+
+# Registered benchmarks: name -> setup(context) returning the callable to time
+BENCHMARKS: Dict[str, Callable[[Dict], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark; the decorated setup function returns the timed callable"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ----------------------------------------------------------------------
+# Shared fixtures (built lazily, once per run)
+# ----------------------------------------------------------------------
+
+def fixture(context: Dict, key: str):
+    """Build and cache the fixtures the benchmarks share"""
+    if key in context:
+        return context[key]
+
+    engineer = context.setdefault('engineer', FeatureEngineer())
+    if key == 'raw':
+        value = make_gold_prices(context['rows'], seed=context['seed'])
+    elif key == 'processed':
+        value = engineer.create_price_features(fixture(context, 'raw'))
+    elif key == 'training':
+        value = engineer.create_training_matrix(fixture(context, 'processed'))
+    elif key == 'predictor':
+        X, y_direction, y_range = fixture(context, 'training')
+        value = PricePredictor()
+        value.train(X, y_direction, y_range, engineer.get_feature_names())
+    elif key == 'models_dir':
+        value = Path(context['tmp']) / "models"
+        fixture(context, 'predictor').save_models(value)
+    else:
+        raise KeyError(key)
+
+    context[key] = value
+    return value
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+@benchmark('features.create_price_features')
+def bench_create_price_features(context):
+    raw = fixture(context, 'raw')
+    return lambda: context['engineer'].create_price_features(raw)
+
+
+@benchmark('features.append_price_features')
+def bench_append_price_features(context):
+    raw = fixture(context, 'raw')
+    split = len(raw) - 30
+    processed = context['engineer'].create_price_features(raw.iloc[:split])
+    new_rows = raw.iloc[split:]
+    return lambda: context['engineer'].append_price_features(processed, new_rows)
+
+
+@benchmark('features.indicators')
+def bench_indicators(context):
+    raw = fixture(context, 'raw')
+    close, high, low = (raw[col].to_numpy() for col in ('Close', 'High', 'Low'))
+    indicators = context['engineer'].indicators
+    return lambda: indicators.compute(close, high, low)
+
+
+@benchmark('dashboard.downsample')
+def bench_downsample(context):
+    raw = fixture(context, 'raw')
+    x = pd.to_datetime(raw['Date']).to_numpy()
+    y = raw['Close'].to_numpy()
+    return lambda: downsample_indices(x, y, Config.DASHBOARD_CHART_POINTS, Config.DASHBOARD_DOWNSAMPLE_METHOD)
+
+
+@benchmark('features.create_training_matrix')
+def bench_create_training_matrix(context):
+    processed = fixture(context, 'processed')
+    return lambda: context['engineer'].create_training_matrix(processed)
+
+
+@benchmark('features.create_feature_matrix')
+def bench_create_feature_matrix(context):
+    processed = fixture(context, 'processed')
+    news_sentiment = {'avg_sentiment': 0.1, 'avg_price_indicator': 0.2, 'net_signal': 3.0, 'total_news': 40}
+    api_price = make_api_price(context['seed'])
+    return lambda: context['engineer'].create_feature_matrix(processed, news_sentiment, api_price)
+
+
+@benchmark('features.create_feature_matrix.history')
+def bench_create_feature_matrix_history(context):
+    processed = fixture(context, 'processed')
+    dates = pd.to_datetime(processed['Date'])
+    rng = np.random.default_rng(context['seed'])
+    daily_news = pd.DataFrame({
+        'avg_sentiment': rng.uniform(-1, 1, len(dates)),
+        'avg_price_indicator': rng.uniform(-1, 1, len(dates)),
+        'net_signal': rng.integers(-5, 6, len(dates)).astype(float),
+        'total_news': rng.integers(0, 40, len(dates)).astype(float)
+    }, index=dates)
+    return lambda: context['engineer'].create_feature_matrix(processed, daily_news, start=dates.iloc[0], end=dates.iloc[-1])
+
+
+@benchmark('models.train')
+def bench_train(context):
+    X, y_direction, y_range = fixture(context, 'training')
+    names = context['engineer'].get_feature_names()
+    return lambda: PricePredictor().train(X, y_direction, y_range, names)
+
+
+@benchmark('models.predict.single')
+def bench_predict_single(context):
+    predictor = fixture(context, 'predictor')
+    X = fixture(context, 'training')[0][-1:]
+    return lambda: predictor.predict(X)
+
+
+@benchmark('models.predict.memo_hit')
+def bench_predict_memo_hit(context):
+    predictor = fixture(context, 'predictor')
+    X = fixture(context, 'training')[0][-1:]
+    memo = PredictionMemo()
+    memo.predict(predictor, X)
+    return lambda: memo.predict(predictor, X)
+
+
+@benchmark('models.predict.batch')
+def bench_predict_batch(context):
+    predictor = fixture(context, 'predictor')
+    X = fixture(context, 'training')[0][:context['batch_size']]
+    return lambda: predictor.predict_batch(X)
+
+
+@benchmark('scenarios.grid')
+def bench_scenario_grid(context):
+    predictor = fixture(context, 'predictor')
+    X = fixture(context, 'training')[0]
+    base_row = X[-1:]
+    side = max(2, int(round(context['batch_size'] ** 0.5)))
+    # Two of the features the models use, over their 1st-99th percentile range
+    names = context['engineer'].get_feature_names()
+    grid = {
+        name: np.linspace(*np.percentile(X[:, names.index(name)], [1, 99]), side)
+        for name in predictor.selected_features[:2]
+    }
+    analyzer = ScenarioAnalyzer(predictor, context['engineer'].get_feature_names())
+    return lambda: analyzer.run(base_row, grid)
+
+
+@benchmark('models.save_models')
+def bench_save_models(context):
+    predictor = fixture(context, 'predictor')
+    target = Path(context['tmp']) / "save"
+    return lambda: predictor.save_models(target)
+
+
+@benchmark('models.load_models')
+def bench_load_models(context):
+    models_dir = fixture(context, 'models_dir')
+    return lambda: PricePredictor().load_models(models_dir)
+
+
+@benchmark('news.analyze_news_impact')
+def bench_news_scoring(context):
+    try:
+        from app.data import NewsFetcher
+    except ImportError:
+        return None
+
+    with stub_news_feeds(context['articles'], seed=context['seed']):
+        fetcher = NewsFetcher()
+    news = make_news_frame(context['articles'], seed=context['seed'])
+
+    return lambda: fetcher.analyze_news_impact(news.copy())
+
+
+@benchmark('news.score')
+def bench_news_scorer(context):
+    news = make_news_frame(context['articles'], seed=context['seed'])
+    scorer = NewsScorer()
+    return lambda: scorer.analyze_news_impact(news)
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def measure(func: Callable[[], object], repeats: int, min_time: float) -> Dict:
+    """Time func: calibrate calls per sample to min_time, then take repeats samples"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        'number': number,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def git_commit() -> str:
+    """Current commit hash (with a -dirty suffix for uncommitted changes)"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            cwd=BENCH_DIR, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def results_path(commit: str, params: Dict) -> Path:
+    """Results file for a commit and dataset size"""
+    return RESULTS_DIR / f"{commit}-rows{params['rows']}.json"
+
+
+def load_baseline(compare: Optional[str], current: Path, params: Dict) -> Optional[Dict]:
+    """Load results to compare against: a commit/file if given, else the latest other run"""
+    if compare:
+        path = Path(compare)
+        if not path.exists():
+            path = results_path(compare, params)
+        if not path.exists():
+            raise FileNotFoundError(f"No stored benchmark results for '{compare}'")
+        return json.loads(path.read_text())
+
+    candidates = sorted(
+        (p for p in RESULTS_DIR.glob("*.json") if p != current),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+    for path in candidates:
+        stored = json.loads(path.read_text())
+        if stored.get('params') == params:
+            return stored
+    return None
+
+
+def run(args) -> int:
+    params = {
+        'rows': args.rows,
+        'batch_size': args.batch_size,
+        'articles': args.articles,
+        'seed': args.seed
+    }
+    selected = [name for name in BENCHMARKS if not args.filter or any(f in name for f in args.filter)]
+
+    print("=" * 70)
+    print("Gold Price Prediction - Benchmarks")
+    print("=" * 70)
+    print(f"Rows: {args.rows:,} | Batch: {args.batch_size:,} | Articles: {args.articles:,} | "
+          f"Repeats: {args.repeats}")
+    print("")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        context = {**params, 'tmp': tmp}
+        for name in selected:
+            func = BENCHMARKS[name](context)
+            if func is None:
+                print(f"  {name:<36} skipped (dependency unavailable)")
+                continue
+            stats = measure(func, args.repeats, args.min_time)
+            results[name] = stats
+            print(f"  {name:<36} {format_seconds(stats['median']):>10}  "
+                  f"(min {format_seconds(stats['min'])}, x{stats['number']})")
+
+    commit = git_commit()
+    record = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'params': params,
+        'results': results
+    }
+
+    path = results_path(commit, params)
+    baseline = load_baseline(args.compare, path, params)
+    regressions = report_comparison(results, baseline, args.threshold) if baseline else []
+
+    if not args.no_save:
+        # Filtered runs update the stored results instead of replacing them
+        if path.exists():
+            stored = json.loads(path.read_text())
+            if stored.get('params') == params:
+                record['results'] = {**stored['results'], **results}
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path.write_text(json.dumps(record, indent=2))
+        print(f"\nResults saved to {path}")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+def report_comparison(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print median ratios against a baseline and return the regressed benchmarks"""
+    print(f"\nComparison against {baseline['commit']} ({baseline['timestamp'][:19]}):")
+    regressions = []
+    for name, stats in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        ratio = stats['median'] / before['median']
+        if ratio > 1 + threshold:
+            flag = "✗ REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = "✓ faster"
+        else:
+            flag = ""
+        print(f"  {name:<36} {format_seconds(before['median']):>10} -> "
+              f"{format_seconds(stats['median']):>10}  {ratio:5.2f}x  {flag}")
+
+    if regressions:
+        print(f"\n✗ {len(regressions)} benchmark(s) regressed by more than {threshold:.0%}")
+    else:
+        print(f"\n✓ No regressions beyond {threshold:.0%}")
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the offline pipeline benchmark suite')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows of synthetic price history')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per batch prediction')
+    parser.add_argument('--articles', type=int, default=200, help='Synthetic news articles to score')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic data')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed samples per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds per sample')
+    parser.add_argument('--filter', nargs='*', help='Only run benchmarks whose name contains one of these')
+    parser.add_argument('--compare', help='Commit id or results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Slowdown ratio flagged as regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 when a regression is found')
+    parser.add_argument('--no-save', action='store_true', help='Do not store results')
+    return run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
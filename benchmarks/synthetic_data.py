@@ -0,0 +1,94 @@
+"""
+Synthetic, offline stand-ins for the Kaggle dataset, GoldAPI responses and news feeds
+"""
+
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import List, Dict
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+
+NEWS_PHRASES = [
+    "Gold prices surge as inflation fears rise",
+    "Gold falls as the dollar strengthens after rate hike",
+    "Central bank buying lifts gold demand",
+    "Gold slides as stock market rally reduces safe haven demand",
+    "Geopolitical conflict drives investors to gold",
+    "Gold retreats from record high on profit taking",
+    "Recession worries boost precious metals",
+    "Gold steady ahead of Federal Reserve decision",
+]
+
+
+def make_gold_prices(n_rows: int, seed: int = 42, start: str = "2000-01-03") -> pd.DataFrame:
+    """Business-day OHLCV frame shaped like the Kaggle gold price dataset"""
+    rng = np.random.default_rng(seed)
+    close = 1500.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n_rows)))
+    spread = np.abs(rng.normal(0, 0.005, n_rows)) * close
+    open_ = close * (1 + rng.normal(0, 0.003, n_rows))
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=n_rows),
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Adj Close': close,
+        'Volume': rng.integers(1_000, 100_000, n_rows)
+    })
+
+
+def make_api_price(seed: int = 42) -> Dict:
+    """GoldAPI-style current price dict"""
+    rng = np.random.default_rng(seed)
+    price = float(rng.uniform(1800, 2200))
+    change = float(rng.normal(0, 10))
+    return {
+        'current_price': price,
+        'source': 'synthetic',
+        'bid': price - 0.5,
+        'ask': price + 0.5,
+        'high_price': price + abs(change) + 5,
+        'low_price': price - abs(change) - 5,
+        'price_change': change,
+        'price_change_pct': change / price * 100,
+        'timestamp': pd.Timestamp.now().isoformat()
+    }
+
+
+def make_feed_entries(n_articles: int, seed: int = 42) -> List[Dict]:
+    """RSS entries as returned by feedparser for a Google News search"""
+    rng = np.random.default_rng(seed)
+    phrases = rng.choice(NEWS_PHRASES, size=(n_articles, 2))
+    published = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 86400 * 30, n_articles), unit='s')
+    return [
+        {
+            'title': f"{a} ({i})",
+            'summary': f"{a}. {b}. Analysts expect volatility to continue.",
+            'published': published[i].strftime('%a, %d %b %Y %H:%M:%S GMT'),
+            'link': f"https://news.example.com/article/{i}"
+        }
+        for i, (a, b) in enumerate(phrases)
+    ]
+
+
+def make_news_frame(n_articles: int, seed: int = 42) -> pd.DataFrame:
+    """News DataFrame with the columns produced by the news fetcher"""
+    df = pd.DataFrame(make_feed_entries(n_articles, seed))
+    df['full_text'] = df['title'] + ' ' + df['summary']
+    return df
+
+
+@contextmanager
+def stub_news_feeds(n_articles: int = 50, seed: int = 42):
+    """Serve synthetic entries for every RSS request and skip rate-limit sleeps"""
+    entries = make_feed_entries(n_articles, seed)
+
+    def parse(url, *args, **kwargs):
+        return SimpleNamespace(entries=entries, feed={}, bozo=False)
+
+    with mock.patch('feedparser.parse', side_effect=parse), mock.patch.object(time, 'sleep'):
+        yield
@@ -21,6 +21,7 @@ sys.path.insert(0, str(current_dir))
 try:
     from app.core import GoldPriceApp
     from app.config import Config
+    from app.utils import INSTRUMENTATION, start_metrics_server, ChartDownsampler
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.error(f"Current directory: {current_dir}")
@@ -77,12 +78,36 @@ if 'app' not in st.session_state:
     except FileNotFoundError:
         st.session_state.models_loaded = False
 
+    # Expose stage timings for Prometheus (one endpoint per process)
+    try:
+        start_metrics_server()
+    except OSError:
+        pass
+
 if 'gold_price_history' not in st.session_state:
     st.session_state.gold_price_history = []
 if 'predictions_history' not in st.session_state:
     st.session_state.predictions_history = []
 if 'last_update' not in st.session_state:
     st.session_state.last_update = None
+if 'chart_downsampler' not in st.session_state:
+    st.session_state.chart_downsampler = ChartDownsampler()
+
+# Chart windows ("zoom levels"); None shows everything
+LIVE_CHART_WINDOWS = {
+    '15m': pd.Timedelta(minutes=15),
+    '1h': pd.Timedelta(hours=1),
+    '6h': pd.Timedelta(hours=6),
+    '24h': pd.Timedelta(hours=24),
+    'All': None
+}
+HISTORY_CHART_WINDOWS = {
+    '1M': pd.DateOffset(months=1),
+    '6M': pd.DateOffset(months=6),
+    '1Y': pd.DateOffset(years=1),
+    '5Y': pd.DateOffset(years=5),
+    'All': None
+}
 
 def update_dashboard():
     """Update dashboard data"""
@@ -116,6 +141,22 @@ def update_dashboard():
     
     st.session_state.last_update = datetime.now()
 
+def price_history_frame() -> pd.DataFrame:
+    """Live price history as a frame, rebuilt only when new prices arrived"""
+    history = st.session_state.gold_price_history
+    key = (len(history), history[-1]['timestamp'] if history else None)
+    if st.session_state.get('price_history_key') != key:
+        st.session_state.price_history_df = pd.DataFrame(history)
+        st.session_state.price_history_key = key
+    return st.session_state.price_history_df
+
+
+def chart_window(df: pd.DataFrame, x: str, y: str, span, key) -> pd.DataFrame:
+    """The last ``span`` of a series, downsampled to Config.DASHBOARD_CHART_POINTS (cached per window)"""
+    start = None if span is None else df[x].iloc[-1] - span
+    return st.session_state.chart_downsampler.window(df, x, y, start=start, key=key)
+
+
 # Main Dashboard
 def main():
     # Header
@@ -198,13 +239,17 @@ def main():
         
         # Price chart
         if st.session_state.gold_price_history:
-            price_df = pd.DataFrame(st.session_state.gold_price_history)
+            price_df = price_history_frame()
+            window = st.radio("Window", list(LIVE_CHART_WINDOWS), index=len(LIVE_CHART_WINDOWS) - 1,
+                              horizontal=True, key='live_chart_window')
+            chart_df = chart_window(price_df, 'timestamp', 'price', LIVE_CHART_WINDOWS[window],
+                                    key=('live', st.session_state.price_history_key))
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
-                x=price_df['timestamp'],
-                y=price_df['price'],
-                mode='lines+markers',
+                x=chart_df['timestamp'],
+                y=chart_df['price'],
+                mode='lines+markers' if len(chart_df) <= 200 else 'lines',
                 name='Gold Price',
                 line=dict(color='#FFD700', width=3),
                 marker=dict(size=6)
@@ -220,6 +265,50 @@ def main():
             )
             
             st.plotly_chart(fig, use_container_width=True)
+            if len(chart_df) < len(price_df):
+                st.caption(f"Showing {len(chart_df):,} of {len(price_df):,} prices "
+                           f"({Config.DASHBOARD_DOWNSAMPLE_METHOD} downsampling)")
+    
+    # Historical chart
+    st.header("📜 Price History")
+    
+    app = st.session_state.app
+    if app.processed_data is None:
+        with st.spinner("Loading price history..."):
+            try:
+                app.process_data()
+            except Exception as e:
+                st.error(f"Could not load price history: {e}")
+    
+    date_col = None
+    if app.processed_data is not None:
+        date_col = next((col for col in ['Date', 'date', 'DATE', 'Date/Time'] if col in app.processed_data.columns), None)
+    
+    if date_col:
+        history_df = app.processed_data
+        window = st.radio("Window", list(HISTORY_CHART_WINDOWS), index=len(HISTORY_CHART_WINDOWS) - 1,
+                          horizontal=True, key='history_chart_window')
+        chart_df = chart_window(history_df, date_col, 'price', HISTORY_CHART_WINDOWS[window],
+                                key=('history', id(history_df), len(history_df)))
+        
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=chart_df[date_col],
+            y=chart_df['price'],
+            mode='lines',
+            name='Close',
+            line=dict(color='#FFD700', width=2)
+        ))
+        fig.update_layout(
+            title=f"{app.symbol} Historical Price",
+            xaxis_title="Date",
+            yaxis_title="Price",
+            height=400,
+            template="plotly_dark",
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Showing {len(chart_df):,} of {len(history_df):,} rows")
     
     # News Section
     st.header("📰 Latest Impactful News & Analysis")
@@ -282,6 +371,112 @@ def main():
             """, unsafe_allow_html=True)
     else:
         st.warning("Models not loaded. Train models in sidebar to see predictions.")
+
+    # Performance Tracking
+    st.header("📈 Performance Tracking")
+
+    if st.session_state.app.journal is not None:
+        metrics = st.session_state.app.get_accuracy_metrics()
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("🧾 Predictions", metrics['total_predictions'], delta=f"{metrics['pending']} pending", delta_color="off")
+        if metrics['scored']:
+            with col2:
+                st.metric("🎯 Hit Rate", f"{metrics['hit_rate']:.1%}",
+                          delta=f"{metrics['rolling_hit_rate'] - metrics['hit_rate']:+.1%} last {metrics['rolling_window']}")
+            with col3:
+                st.metric("📏 MAE", f"${metrics['mae']:.2f}",
+                          delta=f"{metrics['rolling_mae'] - metrics['mae']:+.2f} last {metrics['rolling_window']}",
+                          delta_color="inverse")
+            with col4:
+                st.metric("⚖️ Calibration Error", f"{metrics['calibration_error']:.1f}pp")
+
+            calibration_df = pd.DataFrame(metrics['calibration'])
+            calibration_df = calibration_df[calibration_df['count'] > 0]
+
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                x=calibration_df['mean_confidence'],
+                y=calibration_df['hit_rate'],
+                name='Realized Hit Rate',
+                marker_color='#FFD700',
+                customdata=calibration_df['count'],
+                hovertemplate='Confidence %{x:.1f}%<br>Hit rate %{y:.1f}%<br>%{customdata} predictions'
+            ))
+            fig.add_trace(go.Scatter(
+                x=[50, 100], y=[50, 100],
+                mode='lines',
+                name='Perfect Calibration',
+                line=dict(color='#888888', dash='dash')
+            ))
+            fig.update_layout(
+                title=f"Calibration ({metrics['horizon_hours']:.0f}h horizon)",
+                xaxis_title="Predicted Confidence (%)",
+                yaxis_title="Realized Hit Rate (%)",
+                height=350,
+                template="plotly_dark"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            with col2:
+                st.info(f"No predictions have reached their {metrics['horizon_hours']:.0f}h horizon yet.")
+    else:
+        st.info("Prediction journal is disabled. Enable PREDICTION_JOURNAL_ENABLED to track accuracy.")
+
+    # Shadow Models
+    if st.session_state.app.shadow is not None:
+        with st.expander("🕶️ Shadow Models", expanded=False):
+            shadow_df = pd.DataFrame([
+                {
+                    'Shadow': name,
+                    'Scored': report['scored'],
+                    'Agreement': report['agreement'],
+                    'Mean |Δ Change| ($)': report['mean_abs_change_diff'],
+                    'Hit Rate': report['hit_rate'],
+                    'MAE ($)': report['mae']
+                }
+                for name, report in st.session_state.app.get_shadow_report().items()
+            ])
+            st.dataframe(shadow_df, use_container_width=True, hide_index=True)
+            shadow_stats = st.session_state.app.shadow.stats()
+            st.caption(f"{shadow_stats['dropped']:,} of {shadow_stats['submitted'] + shadow_stats['dropped']:,} "
+                       f"requests dropped under load")
+
+    # Pipeline Timings
+    with st.expander("⏱️ Pipeline Timings", expanded=False):
+        timings = INSTRUMENTATION.snapshot()
+        if timings:
+            timings_df = pd.DataFrame([
+                {
+                    'Stage': stage,
+                    'Calls': stats['count'],
+                    'Mean (ms)': stats['mean'] * 1000,
+                    'p50 (ms)': stats['p50'] * 1000,
+                    'p95 (ms)': stats['p95'] * 1000,
+                    'Max (ms)': stats['max'] * 1000
+                }
+                for stage, stats in timings.items()
+            ])
+
+            fig = px.bar(
+                timings_df.sort_values('Mean (ms)'),
+                x='Mean (ms)', y='Stage',
+                orientation='h',
+                template="plotly_dark",
+                color_discrete_sequence=['#FFD700']
+            )
+            fig.update_layout(height=max(300, 24 * len(timings_df)), title="Mean Time per Stage")
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(timings_df.round(2), use_container_width=True, hide_index=True)
+            memo = st.session_state.app.prediction_memo.stats()
+            st.caption(f"Prediction memo: {memo['hits']:,} hits, {memo['misses']:,} misses "
+                       f"({memo['hit_rate']:.0%} hit rate) | "
+                       f"Prometheus metrics: http://localhost:{Config.METRICS_PORT}/metrics")
+        elif not INSTRUMENTATION.enabled:
+            st.info("Instrumentation is disabled. Set INSTRUMENTATION_ENABLED=1 to collect stage timings.")
+        else:
+            st.info("No timings recorded yet. Click 'Update Now' to run the pipeline.")
     
     # Footer
     st.markdown("---")
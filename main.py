@@ -16,8 +16,10 @@ from pathlib import Path
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.core import GoldPriceApp
+from app.core import GoldPriceApp, MultiAssetApp
 from app.config import Config
+from app.utils import INSTRUMENTATION, Profiler, start_metrics_server
+from app.utils.profiling import PROFILE_KINDS
 
 
 def main():
@@ -25,18 +27,99 @@ def main():
     parser = argparse.ArgumentParser(description='Gold Price Prediction Application')
     parser.add_argument(
         '--mode',
-        choices=['train', 'predict', 'dashboard', 'full'],
+        choices=['train', 'predict', 'dashboard', 'full', 'accuracy', 'versions', 'rollback', 'refresh-data', 'compact',
+                 'stream'],
         default='full',
-        help='Operation mode: train models, make prediction, run dashboard, or full cycle'
+        help='Operation mode: train models, make prediction, run dashboard, full cycle, realized accuracy report, '
+             'list model versions, roll back to the previous model version, refresh the local dataset mirror, '
+             'publish a compact (pruned, float32) copy of the current models, '
+             'or predict on every price tick of the replay tape (GOLDAPI_SOURCE=replay) or GoldAPI'
     )
     parser.add_argument(
         '--load-models',
         action='store_true',
         help='Load existing trained models instead of training new ones'
     )
+    parser.add_argument(
+        '--symbols',
+        nargs='+',
+        default=None,
+        help='Run several METAL/CURRENCY symbols in one process, e.g. XAU/USD XAG/USD XPT/USD XPD/USD'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=None,
+        help='Compact mode: accuracy drop allowed when cutting trees (default Config.COMPACT_TOLERANCE; < 0 keeps all)'
+    )
+    parser.add_argument(
+        '--ticks',
+        type=int,
+        default=None,
+        help='Stream mode: stop after this many ticks (default: until the source ends)'
+    )
+    parser.add_argument(
+        '--stream-output',
+        type=Path,
+        default=None,
+        help='Stream mode: append one JSON line per prediction to this file'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        help='Serve stage timings on http://localhost:PORT/metrics (Prometheus) while running'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='*',
+        choices=PROFILE_KINDS,
+        default=None,
+        help='Profile the run: cpu (cProfile), sample (stack sampling, flamegraph output) and/or memory '
+             '(tracemalloc); all three when given without kinds. Time, CPU and peak memory are attributed '
+             'to pipeline stages in the report'
+    )
+    parser.add_argument(
+        '--profile-dir',
+        type=Path,
+        default=None,
+        help='Directory for profile reports (default Config.PROFILE_DIR)'
+    )
+    parser.add_argument(
+        '--timings-json',
+        type=Path,
+        default=None,
+        help='Write stage timing histograms to this JSON file when done'
+    )
     
     args = parser.parse_args()
     
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+        print(f"Metrics available at http://localhost:{args.metrics_port}/metrics")
+    
+    profiler = None
+    if args.profile is not None:
+        profiler = Profiler(args.profile or PROFILE_KINDS, args.profile_dir, name=args.mode)
+        profiler.start()
+    
+    try:
+        return run_mode(args)
+    finally:
+        if profiler is not None:
+            report = profiler.stop()
+            print(f"\nProfile written to {profiler.run_dir} (report: {report.name}"
+                  f"{', flamegraph stacks: stacks.folded' if 'sample' in profiler.kinds else ''})")
+        if args.timings_json:
+            args.timings_json.write_text(INSTRUMENTATION.to_json())
+            print(f"Stage timings written to {args.timings_json}")
+
+
+def run_mode(args):
+    """Run the selected operation mode"""
+    if args.symbols and args.mode in ('train', 'predict', 'full'):
+        return run_multi_asset(args)
+    
     # Initialize app
     app = GoldPriceApp()
     
@@ -84,6 +167,100 @@ def main():
         # Full cycle: train, predict, and show results
         prediction = app.run_full_cycle()
         return prediction
+    
+    elif args.mode == 'accuracy':
+        # Score journaled predictions against realized prices
+        metrics = app.get_accuracy_metrics()
+        print(f"Predictions journaled: {metrics['total_predictions']}")
+        print(f"Scored: {metrics['scored']} | Pending: {metrics['pending']} | Unmatched: {metrics['unmatched']} | Late: {metrics['late']}")
+        print(f"Horizon: {metrics['horizon_hours']:.1f}h")
+        if metrics['scored']:
+            print(f"\nHit Rate: {metrics['hit_rate']:.2%} (last {metrics['rolling_window']}: {metrics['rolling_hit_rate']:.2%})")
+            print(f"MAE: ${metrics['mae']:.2f} (last {metrics['rolling_window']}: ${metrics['rolling_mae']:.2f})")
+            print(f"Calibration Error: {metrics['calibration_error']:.1f}pp")
+            print("\nConfidence      Count   Hit Rate")
+            for bin_stats in metrics['calibration']:
+                if bin_stats['count']:
+                    print(f"{bin_stats['bin_low']:5.1f}-{bin_stats['bin_high']:5.1f}%  {bin_stats['count']:7d}   {bin_stats['hit_rate']:6.1f}%")
+        return metrics
+    
+    elif args.mode in ('versions', 'rollback'):
+        # Running apps pick up a rollback through the CURRENT pointer
+        registry = app.registry
+        if args.mode == 'rollback':
+            version = registry.rollback()
+            print(f"Rolled back to model version {version}")
+        
+        current = registry.current_version()
+        print(f"{'':2}{'Version':<28}{'Backend':<24}{'Accuracy':>10}{'MAE':>10}  Rows")
+        for version in registry.list_versions():
+            manifest = registry.manifest(version)
+            metrics = manifest.get('metrics', {})
+            fingerprint = manifest.get('data_fingerprint') or {}
+            backend = manifest.get('backend', 'random_forest') + (' (compact)' if manifest.get('compact') else '')
+            print(f"{'*' if version == current else ' ':2}{version:<28}{backend:<24}"
+                  f"{metrics.get('direction_accuracy', float('nan')):>10.2%}"
+                  f"{metrics.get('range_mae', float('nan')):>10.2f}  {fingerprint.get('rows', '-')}")
+        return current
+    
+    elif args.mode == 'refresh-data':
+        # Re-read upstream now instead of waiting for DATASET_REFRESH_INTERVAL
+        if not hasattr(app.data_fetcher, 'refresh'):
+            print("Dataset mirror is disabled. Set DATASET_MIRROR_ENABLED.")
+            return None
+        data = app.data_fetcher.refresh()
+        print(f"Dataset version {app.data_fetcher.current_version()}: {len(data):,} rows")
+        return app.data_fetcher.current_version()
+    
+    elif args.mode == 'stream':
+        # One prediction per tick until the source ends (Ctrl+C stops)
+        stats = app.stream_predictions(output_path=args.stream_output, max_ticks=args.ticks)
+        print(f"\nPredicted {stats['ticks']:,} ticks in {stats['batches']:,} batches "
+              f"({stats['ticks_per_second']:,.0f} ticks/s, {stats['mean_batch']:.1f} ticks per batch)")
+        print(f"End-to-end lag: p50 {stats['lag_p50_ms']:.2f}ms | p99 {stats['lag_p99_ms']:.2f}ms | "
+              f"max {stats['lag_max_ms']:.2f}ms")
+        return stats
+    
+    elif args.mode == 'compact':
+        # Publish a smaller, faster copy of the current models; running apps hot-swap to it
+        report = app.export_compact_models(tolerance=args.tolerance)
+        print(f"\nCompacted version {report['source_version']} into {report['version']}")
+        for name in ('direction', 'range'):
+            entry = report[name]
+            metric = 'accuracy' if name == 'direction' else 'mae'
+            line = (f"{name.title():<10} trees {entry['trees']:>3}/{entry['trees_total']:<3} "
+                    f"nodes {entry['nodes']:>7,}/{entry['nodes_total']:<7,} {entry['bytes'] / 1e6:6.2f}MB")
+            if metric in entry:
+                line += f" | {metric} {entry[metric]:.4f} (full {entry[f'full_{metric}']:.4f})"
+            print(line)
+        return report['version']
+
+
+def run_multi_asset(args):
+    """Train and/or predict several symbols side by side"""
+    app = MultiAssetApp(args.symbols)
+    
+    print("=" * 70)
+    print("Gold Price Prediction Application - Multi-Asset")
+    print("=" * 70)
+    print(f"Mode: {args.mode} | Symbols: {', '.join(app.symbols)}")
+    print("")
+    
+    if args.mode == 'train':
+        metrics = app.train_models()
+        print(f"\nTraining complete!")
+        for symbol, symbol_metrics in metrics.items():
+            print(f"{symbol}: Direction Accuracy {symbol_metrics['direction']['accuracy']:.2%} | "
+                  f"Range MAE ${symbol_metrics['range']['mae']:.2f}")
+        return metrics
+    
+    if args.mode == 'predict':
+        if args.load_models:
+            app.load_trained_models()
+        else:
+            app.train_models()
+    
+    return app.run_full_cycle()
 
 
 if __name__ == "__main__":
@@ -13,7 +13,9 @@ setup(
     install_requires=[
         "pandas>=2.0.0",
         "numpy>=1.24.0",
+        "scipy>=1.10.0",
         "scikit-learn>=1.3.0",
+        "threadpoolctl>=3.1.0",
         "streamlit>=1.28.0",
         "plotly>=5.17.0",
         "feedparser>=6.0.10",